@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""Benchmark filtered search and dedup scroll latency with and without payload indexes.
+
+Creates a throwaway collection per corpus size with synthetic chunks spread
+over the real insurance providers, measures the two filters the application
+uses (provider-filtered search and document_id scroll), then adds the keyword
+payload indexes and measures again.
+
+Requires a running Qdrant instance (QDRANT_HOST).
+
+Usage:
+    uv run python scripts/benchmark_payload_indexes.py
+    uv run python scripts/benchmark_payload_indexes.py --sizes 2000,10000 --dim 3072
+    uv run python scripts/benchmark_payload_indexes.py --output bench_payload_indexes.json
+"""
+
+import json
+import sys
+import time
+import uuid
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import click
+import numpy as np
+from qdrant_client import QdrantClient
+from qdrant_client.http.models import (
+    Distance,
+    VectorParams,
+    PointStruct,
+    Filter,
+    FieldCondition,
+    MatchValue,
+    PayloadSchemaType,
+)
+
+from src.config import QDRANT_HOST
+from src.ingestion.loaders.metadata_extractor import MetadataExtractor
+
+PROVIDERS = list(MetadataExtractor.COMPANY_DISPLAY_NAMES.keys())
+DOCUMENTS_PER_PROVIDER = 4
+INDEX_FIELDS = ["metadata.insurance_provider", "metadata.document_id"]
+
+
+def build_collection(client: QdrantClient, name: str, size: int, dim: int, rng) -> list[str]:
+    """Create a collection with `size` synthetic chunks and return its document ids."""
+    client.create_collection(
+        collection_name=name,
+        vectors_config={"dense": VectorParams(size=dim, distance=Distance.COSINE)},
+    )
+
+    document_ids = [
+        f"{provider}-{i}" for provider in PROVIDERS for i in range(DOCUMENTS_PER_PROVIDER)
+    ]
+
+    batch_size = 256
+    for start in range(0, size, batch_size):
+        count = min(batch_size, size - start)
+        vectors = rng.standard_normal((count, dim), dtype=np.float32)
+        points = []
+        for offset in range(count):
+            document_id = document_ids[(start + offset) % len(document_ids)]
+            points.append(
+                PointStruct(
+                    id=str(uuid.uuid4()),
+                    vector={"dense": vectors[offset].tolist()},
+                    payload={
+                        "page_content": f"synthetic chunk {start + offset}",
+                        "metadata": {
+                            "insurance_provider": document_id.rsplit("-", 1)[0],
+                            "document_id": document_id,
+                        },
+                    },
+                )
+            )
+        client.upsert(collection_name=name, points=points, wait=True)
+
+    return document_ids
+
+
+def measure(client: QdrantClient, name: str, dim: int, document_ids: list[str], queries: int, rng) -> dict:
+    """Time provider-filtered searches and document_id scrolls."""
+    search_times, scroll_times = [], []
+
+    for i in range(queries):
+        provider = PROVIDERS[i % len(PROVIDERS)]
+        vector = rng.standard_normal(dim, dtype=np.float32).tolist()
+        start = time.perf_counter()
+        client.query_points(
+            collection_name=name,
+            query=vector,
+            using="dense",
+            query_filter=Filter(must=[
+                FieldCondition(key="metadata.insurance_provider", match=MatchValue(value=provider))
+            ]),
+            limit=25,
+            with_payload=True,
+        )
+        search_times.append((time.perf_counter() - start) * 1000)
+
+        document_id = document_ids[i % len(document_ids)]
+        start = time.perf_counter()
+        client.scroll(
+            collection_name=name,
+            scroll_filter=Filter(must=[
+                FieldCondition(key="metadata.document_id", match=MatchValue(value=document_id))
+            ]),
+            limit=10000,
+            with_payload=False,
+            with_vectors=False,
+        )
+        scroll_times.append((time.perf_counter() - start) * 1000)
+
+    return {
+        "search_p50_ms": float(np.percentile(search_times, 50)),
+        "search_p95_ms": float(np.percentile(search_times, 95)),
+        "scroll_p50_ms": float(np.percentile(scroll_times, 50)),
+        "scroll_p95_ms": float(np.percentile(scroll_times, 95)),
+    }
+
+
+@click.command()
+@click.option("--sizes", default="2000,10000,50000", help="Comma-separated corpus sizes (points)")
+@click.option("--dim", default=3072, type=int, help="Dense vector dimension")
+@click.option("--queries", default=200, type=int, help="Queries per measurement")
+@click.option("--output", type=click.Path(), help="Write results as JSON to this file")
+@click.option("--keep", is_flag=True, help="Keep the benchmark collections afterwards")
+def main(sizes: str, dim: int, queries: int, output: str, keep: bool):
+    """Compare filter latency before and after creating keyword payload indexes."""
+    client = QdrantClient(url=QDRANT_HOST)
+    rng = np.random.default_rng(42)
+    results = []
+
+    for size in [int(s) for s in sizes.split(",")]:
+        name = f"bench_payload_index_{size}"
+        if client.collection_exists(name):
+            client.delete_collection(name)
+
+        click.echo(f"\n📦 {size} points ({dim} dims): building collection...")
+        document_ids = build_collection(client, name, size, dim, rng)
+
+        before = measure(client, name, dim, document_ids, queries, rng)
+
+        for field_name in INDEX_FIELDS:
+            client.create_payload_index(
+                collection_name=name,
+                field_name=field_name,
+                field_schema=PayloadSchemaType.KEYWORD,
+                wait=True,
+            )
+
+        after = measure(client, name, dim, document_ids, queries, rng)
+        results.append({"points": size, "dim": dim, "before": before, "after": after})
+
+        click.echo(f"  {'':<14}{'before':>12}{'after':>12}")
+        for key in before:
+            click.echo(f"  {key:<14}{before[key]:>10.2f}ms{after[key]:>10.2f}ms")
+
+        if not keep:
+            client.delete_collection(name)
+
+    if output:
+        Path(output).write_text(json.dumps(results, indent=2))
+        click.echo(f"\n✅ Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""Benchmark scalar/binary quantization of the dense vectors against the full-precision collection.
+
+Copies the dense vectors of the live collection into one throwaway collection
+per quantization mode, then runs provider-filtered searches with stored chunk
+vectors as queries. Reports per mode:
+
+- estimated dense-vector memory (RAM-resident part and total)
+- p50/p95 search latency
+- recall@k against an exact (brute-force) search on the original collection
+
+Requires a running Qdrant instance (QDRANT_HOST) with an ingested collection.
+
+Usage:
+    uv run python scripts/benchmark_quantization.py
+    uv run python scripts/benchmark_quantization.py --modes scalar,binary --oversampling 3.0
+    uv run python scripts/benchmark_quantization.py --output bench_quantization.json
+"""
+
+import json
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import click
+import numpy as np
+from qdrant_client import QdrantClient
+from qdrant_client.http.models import (
+    VectorParams,
+    PointStruct,
+    Filter,
+    FieldCondition,
+    MatchValue,
+    SearchParams,
+    QuantizationSearchParams,
+    OptimizersConfigDiff,
+    CollectionStatus,
+)
+
+from src.config import QDRANT_HOST
+from src.ingestion.config.settings import CollectionSettings, load_settings
+from src.ingestion.indexers.qdrant_indexer import QdrantIndexer
+from src.retrieval.local_engine import LocalVectorEngine
+
+# Bytes per dimension of each dense representation
+BYTES_PER_DIM = {"none": 4.0, "scalar": 1.0, "binary": 1.0 / 8}
+
+
+def estimate_memory_mb(points: int, dim: int, mode: str, on_disk: bool) -> dict:
+    """Estimate dense-vector memory: quantized copy in RAM, originals in RAM unless on disk."""
+    original = points * dim * BYTES_PER_DIM["none"] / 1024 / 1024
+    quantized = points * dim * BYTES_PER_DIM[mode] / 1024 / 1024 if mode != "none" else 0.0
+    ram = quantized + (0.0 if on_disk and mode != "none" else original)
+    return {"ram_mb": round(ram, 2), "total_mb": round(original + quantized, 2)}
+
+
+def build_quantized_copy(client: QdrantClient, name: str, engine: LocalVectorEngine, mode: str, on_disk: bool):
+    """Create a dense-only copy of the corpus with the given quantization mode."""
+    settings = CollectionSettings(quantization=mode, vectors_on_disk=on_disk)
+    # Reuse the indexer's config builder so the benchmark measures what ingestion creates
+    quantization_config = QdrantIndexer.build_quantization_config(settings)
+
+    if client.collection_exists(name):
+        client.delete_collection(name)
+    client.create_collection(
+        collection_name=name,
+        vectors_config={"dense": VectorParams(size=engine.dense.shape[1], distance=settings.distance_metric, on_disk=on_disk)},
+        quantization_config=quantization_config,
+        # Index (and quantize) every segment, even for a small corpus
+        optimizers_config=OptimizersConfigDiff(indexing_threshold=1),
+    )
+
+    batch_size = 256
+    for start in range(0, len(engine), batch_size):
+        client.upsert(
+            collection_name=name,
+            points=[
+                PointStruct(
+                    id=engine.ids[i],
+                    vector={"dense": engine.dense[i].tolist()},
+                    payload={"metadata": {"insurance_provider": str(engine.providers[i])}},
+                )
+                for i in range(start, min(start + batch_size, len(engine)))
+            ],
+            wait=True,
+        )
+
+    while client.get_collection(name).status != CollectionStatus.GREEN:
+        time.sleep(0.5)
+
+
+def run_queries(client: QdrantClient, name: str, queries: list, k: int, params: SearchParams | None) -> tuple[list, list]:
+    """Return (result id lists, latencies in ms) for the query set."""
+    results, latencies = [], []
+    for vector, provider in queries:
+        start = time.perf_counter()
+        response = client.query_points(
+            collection_name=name,
+            query=vector,
+            using="dense",
+            query_filter=Filter(must=[
+                FieldCondition(key="metadata.insurance_provider", match=MatchValue(value=provider))
+            ]),
+            limit=k,
+            search_params=params,
+            with_payload=False,
+        )
+        latencies.append((time.perf_counter() - start) * 1000)
+        results.append([point.id for point in response.points])
+    return results, latencies
+
+
+def recall_at_k(results: list, truth: list) -> float:
+    scores = [len(set(r) & set(t)) / len(t) for r, t in zip(results, truth) if t]
+    return float(np.mean(scores)) if scores else 0.0
+
+
+@click.command()
+@click.option("--config", type=click.Path(exists=True), help="Path to YAML config file")
+@click.option("--modes", default="scalar,binary", help="Comma-separated quantization modes to test")
+@click.option("--queries", default=200, type=int, help="Number of sampled query vectors")
+@click.option("--k", default=25, type=int, help="Results per query (recall@k)")
+@click.option("--oversampling", default=2.0, type=float, help="Quantization oversampling factor")
+@click.option("--rescore/--no-rescore", default=True, help="Rescore candidates with original vectors")
+@click.option("--on-disk/--in-ram", default=True, help="Keep original vectors on disk for quantized copies")
+@click.option("--output", type=click.Path(), help="Write results as JSON to this file")
+@click.option("--keep", is_flag=True, help="Keep the benchmark collections afterwards")
+def main(config, modes, queries, k, oversampling, rescore, on_disk, output, keep):
+    """Compare memory, latency and recall@k of quantized copies of the collection."""
+    settings = load_settings(config)
+    source = settings.get_collection_name()
+    client = QdrantClient(url=QDRANT_HOST)
+
+    click.echo(f"📥 Exporting '{source}'...")
+    engine = LocalVectorEngine.from_qdrant(
+        client,
+        source,
+        dense_vector_name=settings.collection.dense_vector_name,
+        sparse_vector_name=settings.collection.sparse_vector_name,
+    )
+    points, dim = engine.dense.shape
+    click.echo(f"  → {points} chunks, {dim} dims")
+
+    rng = np.random.default_rng(42)
+    sample = rng.choice(points, size=min(queries, points), replace=False)
+    query_set = [(engine.dense[i].tolist(), str(engine.providers[i])) for i in sample]
+
+    truth, _ = run_queries(client, source, query_set, k, SearchParams(exact=True))
+    baseline, baseline_latency = run_queries(client, source, query_set, k, None)
+
+    report = [{
+        "mode": "none",
+        **estimate_memory_mb(points, dim, "none", on_disk=False),
+        "p50_ms": float(np.percentile(baseline_latency, 50)),
+        "p95_ms": float(np.percentile(baseline_latency, 95)),
+        f"recall@{k}": recall_at_k(baseline, truth),
+    }]
+
+    params = SearchParams(quantization=QuantizationSearchParams(rescore=rescore, oversampling=oversampling))
+    for mode in [m.strip() for m in modes.split(",") if m.strip()]:
+        name = f"{source}_bench_{mode}"
+        click.echo(f"🔧 Building {mode}-quantized copy '{name}'...")
+        build_quantized_copy(client, name, engine, mode, on_disk)
+
+        results, latency = run_queries(client, name, query_set, k, params)
+        report.append({
+            "mode": mode,
+            **estimate_memory_mb(points, dim, mode, on_disk=on_disk),
+            "p50_ms": float(np.percentile(latency, 50)),
+            "p95_ms": float(np.percentile(latency, 95)),
+            f"recall@{k}": recall_at_k(results, truth),
+        })
+
+        if not keep:
+            client.delete_collection(name)
+
+    click.echo(f"\n{'mode':<8}{'RAM MB':>10}{'total MB':>10}{'p50 ms':>10}{'p95 ms':>10}{f'recall@{k}':>12}")
+    for row in report:
+        click.echo(
+            f"{row['mode']:<8}{row['ram_mb']:>10.1f}{row['total_mb']:>10.1f}"
+            f"{row['p50_ms']:>10.2f}{row['p95_ms']:>10.2f}{row[f'recall@{k}']:>12.3f}"
+        )
+
+    if output:
+        Path(output).write_text(json.dumps({
+            "collection": source,
+            "points": points,
+            "dim": dim,
+            "k": k,
+            "oversampling": oversampling,
+            "rescore": rescore,
+            "results": report,
+        }, indent=2))
+        click.echo(f"\n✅ Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
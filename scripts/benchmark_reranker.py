@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""Benchmark the local ONNX cross-encoder against the remote SiliconFlow reranker.
+
+For every query of the golden set, the candidates are retrieved once and
+then scored by each backend. Reported per backend:
+
+- p50/p95/p99 scoring latency (the model load is excluded),
+- recall@top_n and MRR of the reranked order against the golden relevance,
+- ranking agreement with the reference backend: Spearman correlation over
+  all candidates and the overlap of the top_n the agents keep.
+
+With --skip-margins, the adaptive rerank policy (reranker/adaptive.py) is
+replayed on the same scores for each margin: how often it skips or narrows
+the rerank, how many candidates it saves sending, and the recall/MRR change
+against a full rerank.
+
+Requires an ingested collection, OPENAI_API_KEY for the query embeddings
+and SILICONFLOW_API_KEY for the remote reference. The local model is
+downloaded into the fastembed cache on first use.
+
+Usage:
+    uv run python scripts/benchmark_reranker.py
+    uv run python scripts/benchmark_reranker.py --threads 1,2,4,8 --k 25 --top-n 8
+    uv run python scripts/benchmark_reranker.py --model jinaai/jina-reranker-v2-base-multilingual
+    uv run python scripts/benchmark_reranker.py --skip-margins 0.3,0.5,0.7 --band-margin 0.25
+    uv run python scripts/benchmark_reranker.py --output bench_reranker.json
+"""
+
+import json
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import click
+import numpy as np
+
+from src.retrieval.config import GOLDEN_QUERIES_PATH
+from src.retrieval.benchmark import (
+    load_golden_set,
+    latency_percentiles,
+    recall_at_k,
+    reciprocal_rank,
+    spearman_correlation,
+    top_n_overlap,
+)
+from src.retrieval.reranker.adaptive import AdaptiveRerankPolicy, RETRIEVAL_SCORE_KEY
+from src.retrieval.reranker.backends import CrossEncoderBackend, SiliconFlowBackend
+from src.retrieval.reranker.config import (
+    LOCAL_RERANKER_MODEL,
+    LOCAL_RERANKER_BATCH_SIZE,
+    RERANK_BAND_MARGIN,
+)
+
+
+def score_all(backend, candidates: list, repeats: int) -> tuple[list[list[float]], list[float]]:
+    """Score every (query, documents) pair; returns scores per query and latencies in ms."""
+    all_scores, latencies = [], []
+    for query, docs in candidates:
+        texts = [doc.page_content for doc in docs]
+        for _ in range(repeats):
+            start = time.perf_counter()
+            scores = backend.score(query, texts)
+            latencies.append((time.perf_counter() - start) * 1000)
+        all_scores.append(scores)
+    return all_scores, latencies
+
+
+def ranking_quality(golden_items, orders: list[list], top_n: int) -> tuple[float, float]:
+    """Mean recall@top_n and MRR of one document order per golden query."""
+    recalls, reciprocal_ranks = [], []
+    for item, ranked in zip(golden_items, orders):
+        relevance = item.relevance(ranked)
+        recalls.append(recall_at_k(relevance, len(item.relevant), top_n))
+        reciprocal_ranks.append(reciprocal_rank(relevance, top_n))
+    return float(np.mean(recalls)), float(np.mean(reciprocal_ranks))
+
+
+def replay_adaptive(candidates: list, scores: list, top_n: int, skip_margin: float, band_margin: float) -> tuple:
+    """Document orders the adaptive policy would produce given the full rerank scores."""
+    policy = AdaptiveRerankPolicy(skip_margin, band_margin)
+    orders = []
+    for (_, docs), doc_scores in zip(candidates, scores):
+        by_id = {id(doc): score for doc, score in zip(docs, doc_scores)}
+        action, selected = policy.plan(docs, top_n)
+        if action != "skip":
+            selected = sorted(selected, key=lambda doc: by_id[id(doc)], reverse=True)
+        orders.append(selected[:top_n])
+    return orders, policy.stats()
+
+
+@click.command()
+@click.option("--golden", type=click.Path(exists=True), default=str(GOLDEN_QUERIES_PATH), help="Golden query file")
+@click.option("--k", default=25, type=int, help="Candidates retrieved per query (RetrieverAgent default)")
+@click.option("--top-n", default=8, type=int, help="Documents kept after reranking")
+@click.option("--model", default=LOCAL_RERANKER_MODEL, help="Local cross-encoder model")
+@click.option("--threads", default="4", help="Comma-separated ONNX thread counts to compare")
+@click.option("--batch-size", default=LOCAL_RERANKER_BATCH_SIZE, type=int, help="Local batch size")
+@click.option("--repeats", default=1, type=int, help="Timed repetitions per query")
+@click.option("--remote/--no-remote", default=True, help="Include the SiliconFlow reference backend")
+@click.option("--provider", "providers", multiple=True, help="Only run queries for this provider (repeatable)")
+@click.option("--skip-margins", default="", help="Comma-separated adaptive skip margins to replay")
+@click.option("--band-margin", default=RERANK_BAND_MARGIN, type=float, help="Adaptive band margin")
+@click.option("--output", type=click.Path(), help="Write the full report as JSON to this file")
+def main(golden, k, top_n, model, threads, batch_size, repeats, remote, providers, skip_margins, band_margin, output):
+    """Compare reranker backends on latency, quality and ranking agreement."""
+    # Importing the retriever module connects to Qdrant, so keep it out of module scope
+    from src.retrieval.retriever import InsuranceRetriever
+
+    golden_set = load_golden_set(golden).filter(list(providers))
+    retriever = InsuranceRetriever(use_result_cache=False)
+    candidates, golden_items = [], []
+    for item in golden_set.queries:
+        hits = retriever.retrieve_company_docs(item.query, item.insurance_provider, k=k)
+        docs = []
+        for doc, score in hits:
+            doc.metadata[RETRIEVAL_SCORE_KEY] = score
+            docs.append(doc)
+        if docs:
+            candidates.append((item.query, docs))
+            golden_items.append(item)
+    click.echo(f"📋 {len(candidates)} queries with up to {k} candidates each")
+
+    backends = {}
+    if remote:
+        backends["siliconflow"] = SiliconFlowBackend()
+    for count in (int(t) for t in threads.split(",") if t.strip()):
+        backends[f"local/{count}t"] = CrossEncoderBackend(model=model, threads=count or None, batch_size=batch_size)
+
+    results, reference = [], None
+    for name, backend in backends.items():
+        load_start = time.perf_counter()
+        # Warm-up call: loads the local model / opens the remote connection
+        backend.score(candidates[0][0], [doc.page_content for doc in candidates[0][1]])
+        load_seconds = time.perf_counter() - load_start
+
+        scores, latencies = score_all(backend, candidates, repeats)
+        recall, mrr = ranking_quality(golden_items, [
+            [docs[i] for i in np.argsort(doc_scores)[::-1]]
+            for (_, docs), doc_scores in zip(candidates, scores)
+        ], top_n)
+
+        row = {
+            "backend": name,
+            "model": backend.model,
+            "warmup_s": round(load_seconds, 2),
+            f"recall@{top_n}": round(recall, 4),
+            "mrr": round(mrr, 4),
+            **latency_percentiles(latencies),
+        }
+
+        adaptive_rows = []
+        for margin in (float(m) for m in skip_margins.split(",") if m.strip()):
+            orders, policy_stats = replay_adaptive(candidates, scores, top_n, margin, band_margin)
+            adaptive_recall, adaptive_mrr = ranking_quality(golden_items, orders, top_n)
+            adaptive_rows.append({
+                **policy_stats,
+                "documents_saved_share": round(
+                    policy_stats["documents_saved"] / sum(len(docs) for _, docs in candidates), 4
+                ),
+                f"recall@{top_n}": round(adaptive_recall, 4),
+                "mrr": round(adaptive_mrr, 4),
+                "delta_recall": round(adaptive_recall - recall, 4),
+                "delta_mrr": round(adaptive_mrr - mrr, 4),
+            })
+        if adaptive_rows:
+            row["adaptive"] = adaptive_rows
+        if reference is None:
+            reference = (name, scores)
+        else:
+            row["vs"] = reference[0]
+            row["spearman"] = round(float(np.mean([
+                spearman_correlation(a, b) for a, b in zip(reference[1], scores)
+            ])), 4)
+            row[f"top{top_n}_overlap"] = round(float(np.mean([
+                top_n_overlap(a, b, top_n) for a, b in zip(reference[1], scores)
+            ])), 4)
+        results.append(row)
+
+    click.echo(f"\n{'backend':<14}{'recall':>8}{'MRR':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'spearman':>10}{'overlap':>9}")
+    for row in results:
+        click.echo(
+            f"{row['backend']:<14}{row[f'recall@{top_n}']:>8.3f}{row['mrr']:>8.3f}"
+            f"{row['p50_ms']:>9.1f}{row['p95_ms']:>9.1f}{row['p99_ms']:>9.1f}"
+            f"{row.get('spearman', 1.0):>10.3f}{row.get(f'top{top_n}_overlap', 1.0):>9.3f}"
+        )
+
+    for row in results:
+        if not row.get("adaptive"):
+            continue
+        click.echo(f"\nAdaptive rerank replay on {row['backend']} scores (band margin {band_margin}):")
+        click.echo(f"{'skip margin':>12}{'skipped':>9}{'partial':>9}{'saved':>8}{'Δrecall':>9}{'ΔMRR':>8}")
+        for adaptive in row["adaptive"]:
+            calls = adaptive["full"] + adaptive["skipped"] + adaptive["partial"]
+            click.echo(
+                f"{adaptive['skip_margin']:>12.2f}{adaptive['skipped'] / calls:>9.1%}"
+                f"{adaptive['partial'] / calls:>9.1%}{adaptive['documents_saved_share']:>8.1%}"
+                f"{adaptive['delta_recall']:>+9.3f}{adaptive['delta_mrr']:>+8.3f}"
+            )
+
+    if output:
+        Path(output).write_text(json.dumps({
+            "golden_set_version": golden_set.version,
+            "k": k,
+            "top_n": top_n,
+            "queries": len(candidates),
+            "repeats": repeats,
+            "results": results,
+        }, indent=2))
+        click.echo(f"\n✅ Report written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""Benchmark retrieval quality and latency on the golden query set.
+
+Runs every query of a versioned golden set (data/benchmarks/) through
+`InsuranceRetriever` in hybrid, dense-only and sparse-only mode for a grid of
+k values, and reports recall@k, MRR and p50/p95/p99 search latency. Write the
+report with --output and pass an earlier report as --baseline to see the
+difference between two runs.
+
+Requires an ingested collection (Qdrant, or a snapshot with --backend local)
+and OPENAI_API_KEY for the query embeddings.
+
+Usage:
+    uv run python scripts/benchmark_retrieval.py
+    uv run python scripts/benchmark_retrieval.py --modes hybrid,dense --ks 5,10 --repeats 3
+    uv run python scripts/benchmark_retrieval.py --output bench_retrieval.json
+    uv run python scripts/benchmark_retrieval.py --baseline bench_retrieval.json
+"""
+
+import json
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import click
+
+from src.retrieval.config import GOLDEN_QUERIES_PATH, RETRIEVAL_BACKEND, HYBRID_FUSION
+from src.retrieval.benchmark import load_golden_set, run_benchmark, summary_rows
+
+
+def print_table(rows: list[dict], baseline: dict | None = None):
+    """Print one line per (mode, k), with deltas against a baseline report if given."""
+    previous = {(row["mode"], row["k"]): row for row in baseline["results"]} if baseline else {}
+
+    click.echo(f"\n{'mode':<8}{'k':>4}{'recall':>9}{'MRR':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+    for row in rows:
+        line = (
+            f"{row['mode']:<8}{row['k']:>4}{row['recall']:>9.3f}{row['mrr']:>8.3f}"
+            f"{row['p50_ms']:>9.2f}{row['p95_ms']:>9.2f}{row['p99_ms']:>9.2f}"
+        )
+        old = previous.get((row["mode"], row["k"]))
+        if old:
+            line += (
+                f"   Δrecall {row['recall'] - old['recall']:+.3f}"
+                f"  ΔMRR {row['mrr'] - old['mrr']:+.3f}"
+                f"  Δp95 {row['p95_ms'] - old['p95_ms']:+.2f} ms"
+            )
+        click.echo(line)
+
+
+@click.command()
+@click.option("--golden", type=click.Path(exists=True), default=str(GOLDEN_QUERIES_PATH), help="Golden query file")
+@click.option("--modes", default="hybrid,dense,sparse", help="Comma-separated search modes")
+@click.option("--ks", default="5,10,20", help="Comma-separated k values")
+@click.option("--repeats", default=1, type=int, help="Timed repetitions per query")
+@click.option("--provider", "providers", multiple=True, help="Only run queries for this provider (repeatable)")
+@click.option("--backend", type=click.Choice(["qdrant", "local"]), default=RETRIEVAL_BACKEND, help="Retrieval backend")
+@click.option("--fusion", type=click.Choice(["rrf", "dbsf"]), default=HYBRID_FUSION, help="Hybrid fusion method")
+@click.option("--output", type=click.Path(), help="Write the full report as JSON to this file")
+@click.option("--baseline", type=click.Path(exists=True), help="Earlier report to compare against")
+def main(golden, modes, ks, repeats, providers, backend, fusion, output, baseline):
+    """Report recall@k, MRR and latency percentiles per search mode and k."""
+    # Importing the retriever module creates the default instance, so keep it out of module scope
+    from src.retrieval.retriever import InsuranceRetriever
+
+    golden_set = load_golden_set(golden).filter(list(providers))
+    click.echo(f"📋 Golden set v{golden_set.version}: {len(golden_set.queries)} queries, "
+               f"{len(golden_set.providers())} providers")
+
+    retriever = InsuranceRetriever(use_result_cache=False, backend=backend, fusion=fusion)
+    report = run_benchmark(
+        retriever,
+        golden_set,
+        modes=tuple(m.strip() for m in modes.split(",") if m.strip()),
+        ks=tuple(int(k) for k in ks.split(",") if k.strip()),
+        repeats=repeats,
+    )
+
+    print_table(summary_rows(report), json.loads(Path(baseline).read_text()) if baseline else None)
+
+    if output:
+        Path(output).write_text(json.dumps(report, indent=2))
+        click.echo(f"\n✅ Report written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""Measure what speculative generation saves in the retriever agent.
+
+Runs the golden queries through `RetrieverAgent` twice, once sequentially
+(grade, then generate) and once with SPECULATIVE_GENERATION (the answer is
+drafted while grading runs), with the answer cache disabled. Reports the
+end-to-end latency percentiles of both runs, how many drafts were kept or
+discarded, the latency the kept drafts saved and the tokens spent on
+discarded drafts.
+
+This calls the real grading and generation LLMs (and costs tokens): use
+--limit for a quick run.
+
+Usage:
+    uv run python scripts/benchmark_speculation.py --limit 10
+    uv run python scripts/benchmark_speculation.py --output bench_speculation.json
+"""
+
+import json
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import click
+
+from src.retrieval.config import GOLDEN_QUERIES_PATH
+from src.retrieval.benchmark import load_golden_set, latency_percentiles
+
+
+def run_queries(agent, queries) -> list[float]:
+    """End-to-end latency in ms per query."""
+    latencies = []
+    for item in queries:
+        start = time.perf_counter()
+        agent.invoke(item.query, item.insurance_provider)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+@click.command()
+@click.option("--golden", type=click.Path(exists=True), default=str(GOLDEN_QUERIES_PATH), help="Golden query file")
+@click.option("--limit", type=int, help="Only run the first N queries")
+@click.option("--provider", "providers", multiple=True, help="Only run queries for this provider (repeatable)")
+@click.option("--output", type=click.Path(), help="Write the report as JSON to this file")
+def main(golden, limit, providers, output):
+    """Compare sequential and speculative grading/generation end to end."""
+    # Building the agents connects to Qdrant and the LLM providers
+    from src.agents.retriever import RetrieverAgent
+
+    queries = load_golden_set(golden).filter(list(providers)).queries[:limit]
+    click.echo(f"📋 {len(queries)} queries")
+
+    sequential = RetrieverAgent(use_answer_cache=False, speculative=False)
+    speculative = RetrieverAgent(use_answer_cache=False, speculative=True)
+
+    # Warm up embeddings and connections so the first run isn't penalized
+    run_queries(sequential, queries[:1])
+
+    report = {
+        "queries": len(queries),
+        "sequential": latency_percentiles(run_queries(sequential, queries)),
+        "speculative": latency_percentiles(run_queries(speculative, queries)),
+    }
+    # Discarded drafts finish in the background; give them a moment to report tokens
+    time.sleep(5)
+    report["speculation"] = speculative.speculation.stats()
+
+    seq, spec, stats = report["sequential"], report["speculative"], report["speculation"]
+    click.echo(f"\n{'':<12}{'p50 ms':>9}{'p95 ms':>9}{'mean ms':>9}")
+    for name in ("sequential", "speculative"):
+        row = report[name]
+        click.echo(f"{name:<12}{row['p50_ms']:>9.0f}{row['p95_ms']:>9.0f}{row['mean_ms']:>9.0f}")
+    click.echo(
+        f"\nDrafts kept: {stats['accepted']}/{stats['runs']} ({stats['acceptance_rate']:.0%}), "
+        f"discarded: {stats['discarded']}"
+    )
+    click.echo(
+        f"Latency saved by kept drafts: {stats['latency_saved_s']:.1f}s total, "
+        f"{stats['mean_latency_saved_s']:.2f}s per kept draft "
+        f"(mean end-to-end Δ {spec['mean_ms'] - seq['mean_ms']:+.0f} ms)"
+    )
+    click.echo(
+        f"Tokens wasted on discarded drafts: {stats['wasted_tokens']} "
+        f"({stats['wasted_token_share']:.1%} of draft tokens)"
+    )
+
+    if output:
+        Path(output).write_text(json.dumps(report, indent=2))
+        click.echo(f"\n✅ Report written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""Calibrate the local relevance grader against the LLM grader.
+
+Runs retrieve → rerank → pack for the golden queries, exactly like the
+retriever agent, and labels every turn with the LLM grader. Each query is
+also asked against other providers, which gives the "miss" and "indirect"
+turns the golden set itself lacks. Human labels can override the LLM labels
+with --labels (JSON object: "<query id>" or "<query id>@<provider>" → status).
+
+The thresholds that decide the most turns locally at the target precision
+are written for the active reranker model to GRADER_CALIBRATION_PATH, with
+the escalation rate and agreement with the labels on a held-out split.
+
+Requires an ingested collection and the API keys of the agent's reranker
+and grading LLM.
+
+Usage:
+    uv run python scripts/calibrate_grader.py
+    uv run python scripts/calibrate_grader.py --target-precision 0.97 --cross-provider 2
+    uv run python scripts/calibrate_grader.py --labels data/benchmarks/grade_labels.json --dry-run
+"""
+
+import json
+import random
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import click
+
+from src.retrieval.config import GOLDEN_QUERIES_PATH
+from src.retrieval.benchmark import load_golden_set
+from src.agents.local_grader import calibrate, evaluate, grade_features, save_calibration
+
+
+def label_turns(turns, k, top_n, labels):
+    """(features, label) per (query, provider) turn, labelled by the LLM grader unless overridden."""
+    # Building the nodes connects to Qdrant, the reranker and the grading LLM
+    from src.agents.retriever import config
+    from src.agents.retriever.nodes import make_retrieve, make_rerank, make_pack, make_grade
+    from src.agents.retriever.state import RetrieverState
+
+    steps = [
+        make_retrieve(config.retriever, k=k),
+        make_rerank(config.reranker, top_n=top_n),
+        make_pack(config.retriever, max_tokens=config.CONTEXT_TOKENS["pack"]),
+    ]
+    llm_grade = make_grade(config.retriever, config.grading_llm, max_tokens=config.CONTEXT_TOKENS["grade"])
+
+    samples = []
+    for turn_id, query, provider in turns:
+        state = RetrieverState(original_query=query, current_query=query, insurance_provider=provider)
+        for step in steps:
+            # retrieve and rerank are RunnableLambdas (sync + async), pack a plain function
+            update = step.invoke(state) if hasattr(step, "invoke") else step(state)
+            state = state.model_copy(update=update)
+        features = grade_features(query, state.documents)
+        if features is None:
+            continue
+        label = labels.get(turn_id) or llm_grade.invoke(state)["evaluation_status"]
+        samples.append((features, label))
+        click.echo(f"  {turn_id:<28} {label:<9} top={features.top_score:.3f} overlap={features.overlap:.2f}")
+    return samples, config.reranker.model
+
+
+@click.command()
+@click.option("--golden", type=click.Path(exists=True), default=str(GOLDEN_QUERIES_PATH), help="Golden query file")
+@click.option("--labels", type=click.Path(exists=True), help="JSON file of human labels overriding the LLM grader")
+@click.option("--cross-provider", default=1, type=int, help="Other providers each query is also asked against")
+@click.option("--k", default=25, type=int, help="Candidates retrieved per query (RetrieverAgent default)")
+@click.option("--top-n", default=8, type=int, help="Documents kept after reranking")
+@click.option("--target-precision", default=0.95, type=float, help="Minimum agreement of local decisions with the labels")
+@click.option("--holdout", default=0.3, type=float, help="Share of turns held out to report agreement on")
+@click.option("--seed", default=0, type=int, help="Seed for cross-provider sampling and the held-out split")
+@click.option("--dry-run", is_flag=True, help="Report without writing the calibration file")
+def main(golden, labels, cross_provider, k, top_n, target_precision, holdout, seed, dry_run):
+    """Fit the local grader thresholds for the active reranker model."""
+    from src.agents.retriever.config import GRADER_CALIBRATION_PATH
+
+    rng = random.Random(seed)
+    golden_set = load_golden_set(golden)
+    providers = golden_set.providers()
+    turns = []
+    for item in golden_set.queries:
+        turns.append((item.id, item.query, item.insurance_provider))
+        others = [p for p in providers if p != item.insurance_provider]
+        for provider in rng.sample(others, min(cross_provider, len(others))):
+            turns.append((f"{item.id}@{provider}", item.query, provider))
+    human_labels = json.loads(Path(labels).read_text(encoding="utf-8")) if labels else {}
+    click.echo(f"📋 {len(turns)} turns ({len(golden_set.queries)} golden queries, {len(human_labels)} human labels)")
+
+    samples, model = label_turns(turns, k, top_n, human_labels)
+    rng.shuffle(samples)
+    split = int(len(samples) * (1 - holdout))
+    fit, held_out = samples[:split], samples[split:] or samples
+
+    thresholds = calibrate(fit, target_precision=target_precision)
+    report = {
+        "target_precision": target_precision,
+        "label_counts": {
+            label: sum(sample_label == label for _, sample_label in samples)
+            for label in ("direct", "indirect", "miss")
+        },
+        "fit": evaluate(fit, thresholds),
+        "held_out": evaluate(held_out, thresholds),
+    }
+
+    click.echo(f"\nReranker model: {model}")
+    click.echo(f"Thresholds: {thresholds}")
+    for name in ("fit", "held_out"):
+        row = report[name]
+        click.echo(
+            f"{name:<9} {row['samples']:>4} turns  escalated {row['escalation_rate']:>6.1%}  "
+            f"agreement when local {row['agreement']:>6.1%}"
+        )
+    click.echo(f"Held-out confusion (label → decision): {json.dumps(report['held_out']['confusion'])}")
+
+    if not dry_run:
+        save_calibration(GRADER_CALIBRATION_PATH, model, thresholds, report)
+        click.echo(f"\n✅ Calibration for {model} written to {GRADER_CALIBRATION_PATH}")
+
+
+if __name__ == "__main__":
+    main()
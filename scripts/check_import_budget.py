@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Check that importing the application modules stays cheap.
+
+Imports each module in a fresh interpreter and fails when:
+
+- the import takes longer than the budget, or
+- the import builds a shared resource (retriever, reranker, LLM client, ...)
+  from src/registry.py. Those must be built on first use, not at import.
+
+Modules whose third-party dependencies are not installed in this
+environment (e.g. chainlit on an ingestion worker) are reported and skipped.
+
+Usage:
+    uv run python scripts/check_import_budget.py
+    uv run python scripts/check_import_budget.py --budget 3.0
+    uv run python scripts/check_import_budget.py --module src.frontend.settings
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+import click
+
+DEFAULT_MODULES = [
+    "src.frontend.settings",
+    "src.agents.retriever",
+    "src.agents.comparer",
+    "src.graph.react.graphs",
+    "src.ingestion.cli.ingest",
+]
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+try:
+    import {module}
+except ModuleNotFoundError as e:
+    if e.name.split(".")[0] == "src":
+        raise
+    print(json.dumps({{"missing": e.name}}))
+    sys.exit(0)
+seconds = time.perf_counter() - start
+from src.registry import registry
+print(json.dumps({{"seconds": seconds, "built": sorted(registry.built())}}))
+"""
+
+
+def probe(module: str) -> dict:
+    """Import `module` in a fresh interpreter and return timing and built resources."""
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE.format(module=module)],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        return {"error": result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "import failed"}
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+@click.command()
+@click.option("--module", "modules", multiple=True, help="Module to check (repeatable, default: app entry points)")
+@click.option("--budget", default=3.0, type=float, help="Maximum import time per module in seconds")
+@click.option("--warm/--cold", default=True, help="Import once untimed first so .pyc compilation isn't measured")
+def main(modules, budget, warm):
+    """Fail if an entry-point import is slow or builds shared resources."""
+    failures = 0
+    for module in modules or DEFAULT_MODULES:
+        if warm:
+            probe(module)
+        result = probe(module)
+
+        if "missing" in result:
+            click.echo(f"⏭️  {module}: skipped (missing dependency '{result['missing']}')")
+            continue
+        if "error" in result:
+            failures += 1
+            click.echo(f"❌ {module}: {result['error']}")
+            continue
+
+        problems = []
+        if result["seconds"] > budget:
+            problems.append(f"over budget ({budget:.1f}s)")
+        if result["built"]:
+            problems.append(f"built at import: {', '.join(result['built'])}")
+
+        status = "❌" if problems else "✅"
+        click.echo(f"{status} {module}: {result['seconds']:.2f}s" + (f" - {'; '.join(problems)}" if problems else ""))
+        failures += bool(problems)
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""Compare reduced-dimension (Matryoshka) collections against the full-size one.
+
+text-embedding-3-* vectors requested with `dimensions=d` are the first d
+components of the full embedding, re-normalized. The script therefore derives
+every reduced size from the vectors already stored in the full-dimension
+collection (no re-embedding of the corpus), writes one throwaway collection
+per size and reports:
+
+- dense vector storage (MB)
+- p50/p95 provider-filtered search latency
+- recall@k against exact search on the full-dimension collection
+
+Queries are sampled chunk vectors (the chunk itself is excluded from the
+results), or real questions from --questions, embedded once at full size.
+
+Requires a running Qdrant instance (QDRANT_HOST) with an ingested collection.
+
+Usage:
+    uv run python scripts/compare_embedding_dimensions.py
+    uv run python scripts/compare_embedding_dimensions.py --dims 256,512,1024 --k 10
+    uv run python scripts/compare_embedding_dimensions.py --questions questions.txt --output dims.json
+"""
+
+import json
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import click
+import numpy as np
+from qdrant_client import QdrantClient
+from qdrant_client.http.models import (
+    VectorParams,
+    PointStruct,
+    Filter,
+    FieldCondition,
+    MatchValue,
+    SearchParams,
+    OptimizersConfigDiff,
+    CollectionStatus,
+)
+
+from src.config import QDRANT_HOST
+from src.ingestion.config.settings import load_settings
+from src.ingestion.embedders.factory import EmbedderFactory
+from src.retrieval.local_engine import LocalVectorEngine
+
+
+def truncate(vectors: np.ndarray, dim: int) -> np.ndarray:
+    """Matryoshka reduction: keep the first `dim` components and re-normalize."""
+    reduced = vectors[:, :dim]
+    norms = np.linalg.norm(reduced, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return reduced / norms
+
+
+def build_reduced_copy(client: QdrantClient, name: str, engine: LocalVectorEngine, vectors: np.ndarray, distance):
+    """Create a dense-only collection holding the reduced vectors."""
+    if client.collection_exists(name):
+        client.delete_collection(name)
+    client.create_collection(
+        collection_name=name,
+        vectors_config={"dense": VectorParams(size=vectors.shape[1], distance=distance)},
+        # Build the HNSW graph even for a small corpus
+        optimizers_config=OptimizersConfigDiff(indexing_threshold=1),
+    )
+
+    batch_size = 256
+    for start in range(0, len(engine), batch_size):
+        client.upsert(
+            collection_name=name,
+            points=[
+                PointStruct(
+                    id=engine.ids[i],
+                    vector={"dense": vectors[i].tolist()},
+                    payload={"metadata": {"insurance_provider": str(engine.providers[i])}},
+                )
+                for i in range(start, min(start + batch_size, len(engine)))
+            ],
+            wait=True,
+        )
+
+    while client.get_collection(name).status != CollectionStatus.GREEN:
+        time.sleep(0.5)
+
+
+def run_queries(
+    client: QdrantClient, name: str, queries: list, k: int, params: SearchParams | None = None
+) -> tuple[list, list]:
+    """Return (result id lists, latencies in ms); each query is (vector, provider, excluded id)."""
+    results, latencies = [], []
+    for vector, provider, exclude_id in queries:
+        start = time.perf_counter()
+        response = client.query_points(
+            collection_name=name,
+            query=vector,
+            using="dense",
+            query_filter=Filter(must=[
+                FieldCondition(key="metadata.insurance_provider", match=MatchValue(value=provider))
+            ]),
+            limit=k + (exclude_id is not None),
+            search_params=params,
+            with_payload=False,
+        )
+        latencies.append((time.perf_counter() - start) * 1000)
+        results.append([point.id for point in response.points if point.id != exclude_id][:k])
+    return results, latencies
+
+
+def recall_at_k(results: list, truth: list) -> float:
+    scores = [len(set(r) & set(t)) / len(t) for r, t in zip(results, truth) if t]
+    return float(np.mean(scores)) if scores else 0.0
+
+
+def load_questions(path: str, settings, providers: list[str]) -> list:
+    """Embed each question once at full size and pair it with every provider."""
+    questions = [line.strip() for line in Path(path).read_text().splitlines() if line.strip()]
+    settings.embedding.dimension = settings.embedding.get_native_dimension() or settings.embedding.dimension
+    embeddings = EmbedderFactory.create(settings.embedding)
+    vectors = np.asarray(embeddings.embed_documents(questions), dtype=np.float32)
+    return [(vector, provider, None) for vector in vectors for provider in providers]
+
+
+@click.command()
+@click.option("--config", type=click.Path(exists=True), help="Path to YAML config file")
+@click.option("--dims", default="256,512,1024", help="Comma-separated reduced dimensions to test")
+@click.option("--queries", default=200, type=int, help="Number of sampled chunk vectors used as queries")
+@click.option("--questions", type=click.Path(exists=True), help="Text file with one question per line")
+@click.option("--k", default=25, type=int, help="Results per query (recall@k)")
+@click.option("--output", type=click.Path(), help="Write results as JSON to this file")
+@click.option("--keep", is_flag=True, help="Keep the benchmark collections afterwards")
+def main(config, dims, queries, questions, k, output, keep):
+    """Report storage, latency and recall@k per embedding dimension."""
+    settings = load_settings(config)
+    native = settings.embedding.get_native_dimension()
+    if native is None:
+        raise click.UsageError(f"{settings.embedding.model_name} does not support reduced dimensions")
+    settings.embedding.dimension = native
+    source = settings.get_collection_name()
+    client = QdrantClient(url=QDRANT_HOST)
+
+    click.echo(f"📥 Exporting '{source}'...")
+    engine = LocalVectorEngine.from_qdrant(
+        client,
+        source,
+        dense_vector_name=settings.collection.dense_vector_name,
+        sparse_vector_name=settings.collection.sparse_vector_name,
+    )
+    points, dim = engine.dense.shape
+    click.echo(f"  → {points} chunks, {dim} dims")
+
+    if questions:
+        query_set = load_questions(questions, settings, sorted(set(engine.providers.tolist())))
+    else:
+        rng = np.random.default_rng(42)
+        sample = rng.choice(points, size=min(queries, points), replace=False)
+        query_set = [(engine.dense[i], str(engine.providers[i]), engine.ids[i]) for i in sample]
+
+    def with_dim(size: int) -> list:
+        return [
+            (truncate(vector[None, :], size)[0].tolist(), provider, exclude_id)
+            for vector, provider, exclude_id in query_set
+        ]
+
+    full_queries = with_dim(dim)
+    truth, _ = run_queries(client, source, full_queries, k, SearchParams(exact=True))
+    baseline, baseline_latency = run_queries(client, source, full_queries, k)
+
+    report = [{
+        "dimension": dim,
+        "vectors_mb": round(points * dim * 4 / 1024 / 1024, 2),
+        "p50_ms": float(np.percentile(baseline_latency, 50)),
+        "p95_ms": float(np.percentile(baseline_latency, 95)),
+        f"recall@{k}": recall_at_k(baseline, truth),
+    }]
+
+    for size in sorted(int(d) for d in dims.split(",") if d.strip()):
+        if size >= dim:
+            click.echo(f"⚠️  Skipping {size}: not smaller than {dim}")
+            continue
+
+        name = f"{source}_bench_{size}d"
+        click.echo(f"🔧 Building {size}-dim copy '{name}'...")
+        build_reduced_copy(client, name, engine, truncate(engine.dense, size), settings.collection.distance_metric)
+
+        results, latency = run_queries(client, name, with_dim(size), k)
+        report.append({
+            "dimension": size,
+            "vectors_mb": round(points * size * 4 / 1024 / 1024, 2),
+            "p50_ms": float(np.percentile(latency, 50)),
+            "p95_ms": float(np.percentile(latency, 95)),
+            f"recall@{k}": recall_at_k(results, truth),
+        })
+
+        if not keep:
+            client.delete_collection(name)
+
+    click.echo(f"\n{'dim':>6}{'vectors MB':>12}{'p50 ms':>10}{'p95 ms':>10}{f'recall@{k}':>12}")
+    for row in report:
+        click.echo(
+            f"{row['dimension']:>6}{row['vectors_mb']:>12.1f}"
+            f"{row['p50_ms']:>10.2f}{row['p95_ms']:>10.2f}{row[f'recall@{k}']:>12.3f}"
+        )
+
+    if output:
+        Path(output).write_text(json.dumps({
+            "collection": source,
+            "points": points,
+            "k": k,
+            "queries": len(query_set),
+            "query_source": "questions" if questions else "chunks",
+            "results": report,
+        }, indent=2))
+        click.echo(f"\n✅ Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
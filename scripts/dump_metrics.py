@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""Dump the per-node and per-call latency, token and retry metrics of the agents.
+
+Either fetches the metrics of a running Chainlit app (served when it is
+started with METRICS_PORT set, see src/frontend/app.py) or runs golden
+queries through `RetrieverAgent` in this process and dumps what they
+recorded (see src/instrumentation.py).
+
+The table shows the latency histograms (count, mean and the upper bound of
+the p50/p95 bucket) followed by the token, retry and error counters.
+
+Usage:
+    uv run python scripts/dump_metrics.py --url http://localhost:9464
+    uv run python scripts/dump_metrics.py --url http://localhost:9464 --format prometheus
+    uv run python scripts/dump_metrics.py --queries 5 --format json --output metrics.json
+"""
+
+import json
+import sys
+import urllib.request
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import click
+
+from src.retrieval.config import GOLDEN_QUERIES_PATH
+from src.retrieval.benchmark import load_golden_set
+from src.instrumentation import metrics
+
+
+def fetch(url: str, path: str) -> str:
+    with urllib.request.urlopen(url.rstrip("/") + path, timeout=10) as response:
+        return response.read().decode("utf-8")
+
+
+def run_queries(golden: str, limit: int) -> None:
+    """Run the first `limit` golden queries through a fresh RetrieverAgent."""
+    # Building the agent connects to Qdrant and the LLM providers
+    from src.agents.retriever import RetrieverAgent
+
+    agent = RetrieverAgent(use_answer_cache=False)
+    for item in load_golden_set(golden).queries[:limit]:
+        click.echo(f"  {item.id}")
+        agent.invoke(item.query, item.insurance_provider)
+
+
+def _label_text(labels: dict) -> str:
+    return " ".join(f"{key}={value}" for key, value in labels.items())
+
+
+def render_table(data: dict) -> str:
+    lines = [f"{'histogram':<22}{'labels':<48}{'count':>7}{'mean s':>9}{'p50 ≤':>8}{'p95 ≤':>8}"]
+    for row in data["histograms"]:
+        lines.append(
+            f"{row['name']:<22}{_label_text(row['labels']):<48}{row['count']:>7}"
+            f"{row['mean']:>9.3f}{row['p50_le']:>8}{row['p95_le']:>8}"
+        )
+    lines.append("")
+    lines.append(f"{'counter':<22}{'labels':<48}{'value':>7}")
+    for row in data["counters"]:
+        lines.append(f"{row['name']:<22}{_label_text(row['labels']):<48}{row['value']:>7.0f}")
+    return "\n".join(lines)
+
+
+@click.command()
+@click.option("--url", help="Base URL of a running metrics endpoint, e.g. http://localhost:9464")
+@click.option("--queries", default=3, type=int, help="Golden queries to run in-process when no --url is given")
+@click.option("--golden", type=click.Path(exists=True), default=str(GOLDEN_QUERIES_PATH), help="Golden query file")
+@click.option("--format", "fmt", type=click.Choice(["table", "json", "prometheus"]), default="table")
+@click.option("--output", type=click.Path(), help="Write the dump to this file instead of stdout")
+def main(url, queries, golden, fmt, output):
+    """Print the agent metrics as a table, JSON or Prometheus text."""
+    if url:
+        if fmt == "prometheus":
+            text = fetch(url, "/metrics")
+        else:
+            data = json.loads(fetch(url, "/metrics.json"))
+            text = json.dumps(data, indent=2) if fmt == "json" else render_table(data)
+    else:
+        click.echo(f"📋 Running {queries} golden queries", err=True)
+        run_queries(golden, queries)
+        if fmt == "prometheus":
+            text = metrics.to_prometheus()
+        else:
+            data = metrics.to_json()
+            text = json.dumps(data, indent=2) if fmt == "json" else render_table(data)
+
+    if output:
+        Path(output).write_text(text, encoding="utf-8")
+        click.echo(f"✅ Metrics written to {output}", err=True)
+    else:
+        click.echo(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""Cross-session cache of RetrieverAgent answers.
+
+Advisors ask the same questions about the same provider over and over, and
+every fresh answer costs a retrieval, a rerank and at least two LLM calls.
+`AnswerCache` is shared by every agent instance in the process and serves:
+
+- exact hits: same provider and normalized query text,
+- semantic hits: same provider and a query embedding whose cosine
+  similarity with a cached query is at least `similarity_threshold`.
+
+Keys include the collection name and its version stamp, so a re-ingest makes
+earlier answers unreachable; TTL and LRU eviction clean them up.
+"""
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Literal, Optional
+
+import numpy as np
+from langchain_core.documents import Document
+
+from src.cache import TTLCache, normalize_query
+
+HitKind = Literal["exact", "semantic"]
+
+
+@dataclass
+class CachedAnswer:
+    """A generated answer with the documents it was based on."""
+
+    query: str
+    answer: str
+    evaluation_status: Optional[str] = None
+    documents: list[Document] = field(default_factory=list)
+    # Unit-length query embedding, for semantic lookups
+    embedding: Optional[np.ndarray] = None
+
+
+class AnswerCache:
+    """TTL + LRU cache of agent answers with exact and semantic lookup."""
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: float = 24 * 3600,
+        similarity_threshold: float = 0.95,
+    ):
+        """
+        Args:
+            max_entries: Maximum number of cached answers.
+            ttl_seconds: Maximum age of a cached answer.
+            similarity_threshold: Minimum cosine similarity between query
+                embeddings for a semantic hit (None disables semantic hits).
+        """
+        self.cache = TTLCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+        self.similarity_threshold = similarity_threshold
+        self._lock = threading.Lock()
+        self.exact_hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(collection_name: str, version: int, insurance_provider: str, query: str) -> tuple:
+        return (collection_name, version, insurance_provider, normalize_query(query))
+
+    def get(self, key: tuple, embed: Optional[Callable[[], list[float]]] = None) -> tuple[Optional[CachedAnswer], Optional[HitKind]]:
+        """
+        Look up an answer, first by exact key, then by query similarity.
+
+        Args:
+            key: Key from `make_key`.
+            embed: Returns the dense query embedding; only called after an
+                exact miss. Without it only exact hits are served.
+
+        Returns:
+            (copy of the cached answer, "exact" | "semantic"), or (None, None).
+        """
+        cached = self.cache.get(key)
+        if cached is not None:
+            return self._hit(cached, "exact")
+        if embed is None or not self.semantic:
+            return self._miss()
+        return self._get_similar(key, embed())
+
+    async def aget(self, key: tuple, aembed: Optional[Callable[[], Awaitable[list[float]]]] = None) -> tuple[Optional[CachedAnswer], Optional[HitKind]]:
+        """Async variant of `get`, for an async embedding call."""
+        cached = self.cache.get(key)
+        if cached is not None:
+            return self._hit(cached, "exact")
+        if aembed is None or not self.semantic:
+            return self._miss()
+        return self._get_similar(key, await aembed())
+
+    @property
+    def semantic(self) -> bool:
+        """Whether semantic lookups are enabled."""
+        return self.similarity_threshold is not None and self.similarity_threshold <= 1.0
+
+    def _get_similar(self, key: tuple, embedding: list[float]) -> tuple[Optional[CachedAnswer], Optional[HitKind]]:
+        similar_key = self._most_similar(key, _unit(embedding))
+        # Through `cache.get` so the entry's LRU position and hit count are updated
+        cached = self.cache.get(similar_key) if similar_key is not None else None
+        if cached is None:
+            return self._miss()
+        return self._hit(cached, "semantic")
+
+    def _hit(self, cached: CachedAnswer, kind: HitKind) -> tuple[CachedAnswer, HitKind]:
+        with self._lock:
+            if kind == "exact":
+                self.exact_hits += 1
+            else:
+                self.semantic_hits += 1
+        return _copy(cached), kind
+
+    def _miss(self) -> tuple[None, None]:
+        with self._lock:
+            self.misses += 1
+        return None, None
+
+    def set(self, key: tuple, answer: CachedAnswer, embedding: Optional[list[float]] = None) -> None:
+        """Store a copy of `answer` (with its unit query embedding, if given)."""
+        stored = _copy(answer)
+        stored.embedding = _unit(embedding) if embedding is not None else None
+        self.cache.set(key, stored)
+
+    def _most_similar(self, key: tuple, query_vector: np.ndarray) -> Optional[tuple]:
+        """Key of the live entry for the same collection, version and provider closest to the query."""
+        now = time.time()
+        best_key, best_score = None, self.similarity_threshold
+        for other_key, entry in self.cache.items():
+            if other_key[:3] != key[:3] or entry.value.embedding is None:
+                continue
+            if now - entry.created_at > self.cache.ttl_seconds:
+                continue
+            score = float(np.dot(query_vector, entry.value.embedding))
+            if score >= best_score:
+                best_key, best_score = other_key, score
+        return best_key
+
+    def clear(self) -> None:
+        self.cache.clear()
+
+    def stats(self) -> dict:
+        """Return size, hit counters per kind and eviction counters."""
+        cache_stats = self.cache.stats()
+        with self._lock:
+            lookups = self.exact_hits + self.semantic_hits + self.misses
+            return {
+                "entries": cache_stats["entries"],
+                "max_entries": cache_stats["max_entries"],
+                "ttl_seconds": cache_stats["ttl_seconds"],
+                "similarity_threshold": self.similarity_threshold,
+                "exact_hits": self.exact_hits,
+                "semantic_hits": self.semantic_hits,
+                "misses": self.misses,
+                "evictions": cache_stats["evictions"],
+                "expirations": cache_stats["expirations"],
+                "hit_rate": (self.exact_hits + self.semantic_hits) / lookups if lookups else 0.0,
+            }
+
+
+def _unit(embedding) -> np.ndarray:
+    vector = np.asarray(embedding, dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+def _copy(answer: CachedAnswer) -> CachedAnswer:
+    # Nodes write scores into doc.metadata, so never share Documents with the cache
+    return CachedAnswer(
+        query=answer.query,
+        answer=answer.answer,
+        evaluation_status=answer.evaluation_status,
+        documents=[
+            Document(page_content=doc.page_content, metadata=dict(doc.metadata))
+            for doc in answer.documents
+        ],
+        embedding=answer.embedding,
+    )
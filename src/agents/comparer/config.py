@@ -1,20 +1,48 @@
-"""Default configuration for the retriever agent."""
+"""Default configuration for the comparer agent.
 
-import os
-from langchain_openai import ChatOpenAI
-from langchain_google_genai import ChatGoogleGenerativeAI
-from src.retrieval.retriever import retriever
-from src.retrieval.reranker.reranker import reranker
-from src.tools import calculate_premiums
+Resources are resolved lazily: importing this module builds nothing, and
+`config.retriever`, `config.grading_llm`, ... build the shared instance on
+first access (see src/registry.py).
+"""
 
-retriever = retriever
-reranker = reranker
-grading_llm = ChatOpenAI(model="gpt-5-mini", temperature=0)
-rewrite_llm = ChatOpenAI(model="gpt-5-mini", temperature=0.5)
-generation_llm = ChatGoogleGenerativeAI(
-    model="gemini-3-flash-preview",
-    temperature=0.8,
-    google_api_key=os.getenv("GEMINI_API_KEY")  # Use GEMINI_API_KEY from .env
+from src.agents.resources import (
+    default_retriever, default_reranker, default_local_grader, openai_chat, gemini_chat,
 )
-routing_llm = ChatOpenAI(model="gpt-5-mini", temperature=0)
-tools = [calculate_premiums]
\ No newline at end of file
+from src.config import DATA_DIR
+from src.registry import registry
+from src.tools import calculate_premiums
+
+# Local relevance grader in front of the LLM grader (see src/agents/local_grader.py)
+LOCAL_GRADER_ENABLED = True
+GRADER_CALIBRATION_PATH = DATA_DIR / "benchmarks" / "grader_calibration.json"
+
+# Disk cache of the temperature-0 LLM calls (grading, routing), one table per
+# model (see src/agents/llm_cache.py); None disables it
+LLM_CACHE_PATH = DATA_DIR / "cache" / "llm_responses.sqlite"
+
+# Attribute name -> registry name
+RESOURCES = {
+    "retriever": default_retriever(),
+    "reranker": default_reranker(),
+    "grading_llm": openai_chat("gpt-5-mini", temperature=0, cache_path=LLM_CACHE_PATH),
+    "rewrite_llm": openai_chat("gpt-5-mini", temperature=0.5),
+    "generation_llm": gemini_chat("gemini-3-flash-preview", temperature=0.8),
+    "routing_llm": openai_chat("gpt-5-mini", temperature=0, cache_path=LLM_CACHE_PATH),
+    "local_grader": default_local_grader(GRADER_CALIBRATION_PATH),
+}
+
+tools = [calculate_premiums]
+
+# Prompt context budgets in tokens (see src/retrieval/context_packer.py).
+# "pack" runs after rerank and bounds the documents every later node sees.
+CONTEXT_TOKENS = {
+    "pack": 6000,
+    "grade": 3000,
+    "generate": 6000,
+}
+
+
+def __getattr__(name: str):
+    if name in RESOURCES:
+        return registry.get(RESOURCES[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,10 +1,12 @@
 """Comparer agent: runs retrieval for multiple providers in parallel, then compares."""
 
 from langgraph.graph import StateGraph, START, END
+from src.agents.runtime import runtime_config
+from src.instrumentation import instrument
 from .state import RetrieverState, ComparerState
-from .config import retriever, reranker, grading_llm, rewrite_llm, generation_llm, routing_llm, tools
+from . import config
 from .nodes import (
-    make_retrieve, make_rerank, make_grade, make_rewrite, make_generate,
+    make_retrieve, make_rerank, make_pack, make_grade, make_rewrite, make_generate,
     make_retrieve_all, make_compare, make_route,
 )
 
@@ -12,7 +14,15 @@ from .nodes import (
 class ComparerAgent:
     """Runs retrieval for 2-3 insurance providers in parallel, then compares results."""
 
-    def __init__(self, k: int = 15, top_n: int = 5, max_retries: int = 3):
+    def __init__(
+        self,
+        k: int = 15,
+        top_n: int = 5,
+        max_retries: int = 3,
+        use_local_grader: bool = config.LOCAL_GRADER_ENABLED,
+    ):
+        self.k = k
+        self.local_grader = config.local_grader if use_local_grader else None
         self.max_retries = max_retries
         self.retriever_subgraph = self._build_retriever_subgraph(k=k, top_n=top_n)
         self.graph = self._build_graph()
@@ -21,15 +31,22 @@ class ComparerAgent:
         """Build the single-provider retriever subgraph."""
         workflow = StateGraph(RetrieverState)
 
-        workflow.add_node("retrieve", make_retrieve(retriever, k=k))
-        workflow.add_node("rerank", make_rerank(reranker, top_n=top_n))
-        workflow.add_node("grade", make_grade(retriever, grading_llm))
-        workflow.add_node("rewrite", make_rewrite(rewrite_llm))
-        workflow.add_node("generate", make_generate(retriever, generation_llm))
+        workflow.add_node("retrieve", make_retrieve(config.retriever, k=k))
+        workflow.add_node("rerank", make_rerank(config.reranker, top_n=top_n))
+        workflow.add_node("pack", make_pack(config.retriever, max_tokens=config.CONTEXT_TOKENS["pack"]))
+        workflow.add_node("grade", make_grade(
+            config.retriever, config.grading_llm,
+            max_tokens=config.CONTEXT_TOKENS["grade"], local_grader=self.local_grader,
+        ))
+        workflow.add_node("rewrite", make_rewrite(config.rewrite_llm))
+        workflow.add_node("generate", make_generate(
+            config.retriever, config.generation_llm, max_tokens=config.CONTEXT_TOKENS["generate"]
+        ))
 
         workflow.add_edge(START, "retrieve")
         workflow.add_edge("retrieve", "rerank")
-        workflow.add_edge("rerank", "grade")
+        workflow.add_edge("rerank", "pack")
+        workflow.add_edge("pack", "grade")
         workflow.add_conditional_edges(
             "grade",
             self._route_after_grading,
@@ -38,7 +55,7 @@ class ComparerAgent:
         workflow.add_edge("rewrite", "retrieve")
         workflow.add_edge("generate", END)
 
-        return workflow.compile()
+        return instrument(workflow.compile(), agent="comparer")
 
     def _route_after_grading(self, state: RetrieverState) -> str:
         if state.evaluation_status in ("direct", "indirect"):
@@ -50,20 +67,31 @@ class ComparerAgent:
     def _build_graph(self):
         workflow = StateGraph(ComparerState)
 
-        workflow.add_node("route", make_route(routing_llm, tools))
-        workflow.add_node("retrieve_all", make_retrieve_all(self.retriever_subgraph))
-        workflow.add_node("compare", make_compare(generation_llm))
+        workflow.add_node("route", make_route(config.routing_llm, config.tools))
+        workflow.add_node("retrieve_all", make_retrieve_all(self.retriever_subgraph, config.retriever, k=self.k))
+        workflow.add_node("compare", make_compare(config.generation_llm))
 
         workflow.add_edge(START, "route")
         workflow.add_edge("route", "retrieve_all")
         workflow.add_edge("retrieve_all", "compare")
         workflow.add_edge("compare", END)
 
-        return workflow.compile()
+        return instrument(workflow.compile(), agent="comparer")
 
-    def invoke(self, query: str, insurance_providers: list[str]) -> dict:
-        """Run the comparer graph."""
+    def invoke(
+        self, query: str, insurance_providers: list[str], k: int | None = None, top_n: int | None = None
+    ) -> dict:
+        """Run the comparer graph; k/top_n override the defaults for this run."""
         return self.graph.invoke({
             "original_query": query,
             "insurance_providers": insurance_providers,
-        })
+        }, config=runtime_config(k=k, top_n=top_n))
+
+    async def ainvoke(
+        self, query: str, insurance_providers: list[str], k: int | None = None, top_n: int | None = None
+    ) -> dict:
+        """Async `invoke`: every node runs its async variant on the event loop."""
+        return await self.graph.ainvoke({
+            "original_query": query,
+            "insurance_providers": insurance_providers,
+        }, config=runtime_config(k=k, top_n=top_n))
@@ -1,14 +1,27 @@
 """Node functions for the comparer agent."""
 
-from typing import Literal
+import asyncio
+import contextvars
+import logging
+from typing import Literal, TYPE_CHECKING
 from concurrent.futures import ThreadPoolExecutor
 
+from langchain_core.runnables import RunnableConfig, RunnableLambda
 from pydantic import BaseModel, Field
 
-from src.retrieval.retriever import InsuranceRetriever
-from src.retrieval.reranker.reranker import Reranker
+from src.agents.runtime import setting
+from src.retrieval.context_packer import default_packer
+
+if TYPE_CHECKING:
+    # Type hints only: importing these pulls in the Qdrant and embedding clients
+    from src.retrieval.retriever import InsuranceRetriever
+    from src.retrieval.reranker.reranker import Reranker
+    from src.agents.local_grader import LocalGrader
+
 from .state import RetrieverState, ComparerState, ProviderResult
 
+logger = logging.getLogger(__name__)
+
 
 class GradeResult(BaseModel):
     """3-way classification of document relevance."""
@@ -25,54 +38,161 @@ class GradeResult(BaseModel):
 # --- Single-provider retriever nodes (used inside the subgraph) ---
 
 
-def make_retrieve(retriever: InsuranceRetriever, k: int = 15):
-    def retrieve(state: RetrieverState) -> dict:
+def make_retrieve(retriever: "InsuranceRetriever", k: int = 15):
+    """Retrieve `k` candidates; `configurable["k"]` overrides it per invocation."""
+    def retrieve(state: RetrieverState, config: RunnableConfig) -> dict:
         query = state.current_query or state.original_query
-        results = retriever.retrieve_company_docs(query, state.insurance_provider, k=k)
-        return {"documents": [doc for doc, _ in results], "current_query": query}
-    return retrieve
+        if state.prefetched_documents:
+            return _use_prefetched(state, query)
+        results = retriever.retrieve_company_docs(
+            query, state.insurance_provider, k=setting(config, "k", k)
+        )
+        return {"documents": _scored_documents(results), "current_query": query}
 
+    async def aretrieve(state: RetrieverState, config: RunnableConfig) -> dict:
+        query = state.current_query or state.original_query
+        if state.prefetched_documents:
+            return _use_prefetched(state, query)
+        results = await retriever.aretrieve_company_docs(
+            query, state.insurance_provider, k=setting(config, "k", k)
+        )
+        return {"documents": _scored_documents(results), "current_query": query}
 
-def make_rerank(reranker: Reranker, top_n: int = 5):
-    def rerank(state: RetrieverState) -> dict:
-        return {"documents": reranker.rerank(state.current_query, state.documents, top_n=top_n)}
-    return rerank
+    # LangGraph picks `aretrieve` when the graph runs via ainvoke/astream
+    return RunnableLambda(retrieve, afunc=aretrieve)
 
 
-def make_grade(retriever: InsuranceRetriever, llm):
-    def grade(state: RetrieverState) -> dict:
-        docs_text = "\n---\n".join(
-            retriever.format_document_with_context(doc) for doc in state.documents
+def _use_prefetched(state: RetrieverState, query: str) -> dict:
+    """Take the documents from the grouped search instead of querying Qdrant again."""
+    return {
+        "documents": state.prefetched_documents,
+        "prefetched_documents": [],
+        "current_query": query,
+    }
+
+
+def _scored_documents(results: list) -> list:
+    """Documents from (Document, score) hits, keeping the fused score for adaptive reranking."""
+    for doc, score in results:
+        doc.metadata["retrieval_score"] = score
+    return [doc for doc, _ in results]
+
+
+def make_rerank(reranker: "Reranker", top_n: int = 5):
+    """Keep the `top_n` best documents; `configurable["top_n"]` overrides it per invocation."""
+    def rerank(state: RetrieverState, config: RunnableConfig) -> dict:
+        return {"documents": reranker.rerank(
+            state.current_query, state.documents, top_n=setting(config, "top_n", top_n)
+        )}
+
+    async def arerank(state: RetrieverState, config: RunnableConfig) -> dict:
+        return {"documents": await reranker.arerank(
+            state.current_query, state.documents, top_n=setting(config, "top_n", top_n)
+        )}
+
+    return RunnableLambda(rerank, afunc=arerank)
+
+
+def make_pack(retriever: "InsuranceRetriever", max_tokens: int | None = None):
+    """Drop overlapping chunks and trim the reranked documents to a token budget."""
+    def pack(state: RetrieverState) -> dict:
+        packed = default_packer.pack(
+            state.documents, max_tokens, retriever.format_document_with_context
+        )
+        if packed.dropped_overlap or packed.dropped_budget or packed.truncated:
+            logger.info(
+                "Packed %d/%d documents into %d tokens (%d overlapping, %d over budget, truncated=%s)",
+                len(packed.documents), len(state.documents), packed.tokens,
+                packed.dropped_overlap, packed.dropped_budget, packed.truncated,
+            )
+        return {"documents": packed.documents, "context_tokens": {"pack": packed.tokens}}
+    return pack
+
+
+def make_grade(
+    retriever: "InsuranceRetriever",
+    llm,
+    max_tokens: int | None = None,
+    local_grader: "LocalGrader | None" = None,
+):
+    """Grade the documents; confident cases are decided by `local_grader` without the LLM."""
+    structured_llm = llm.with_structured_output(GradeResult)
+
+    def local_grade(state: RetrieverState) -> dict | None:
+        if local_grader is None:
+            return None
+        status = local_grader.decide(state.current_query, state.documents)
+        if status is None:
+            return None
+        return {
+            "evaluation_status": status,
+            "grade_source": "local",
+            "context_tokens": {**state.context_tokens, "grade": 0},
+        }
+
+    def prompt(state: RetrieverState):
+        packed = default_packer.pack(
+            state.documents, max_tokens, retriever.format_document_with_context
         )
-        result = llm.with_structured_output(GradeResult).invoke(
+        return packed, (
             f"Query: {state.current_query}\n\n"
-            f"Documents:\n{docs_text}\n\n"
+            f"Documents:\n{packed.text}\n\n"
             "Classify whether these documents answer the query directly, "
             "indirectly (e.g. explaining why something is excluded), "
             "or not at all (miss)."
         )
-        return {"evaluation_status": result.status}
-    return grade
+
+    def update(state: RetrieverState, packed, result: GradeResult) -> dict:
+        return {
+            "evaluation_status": result.status,
+            "grade_source": "llm",
+            "context_tokens": {**state.context_tokens, "grade": packed.tokens},
+        }
+
+    def grade(state: RetrieverState) -> dict:
+        local = local_grade(state)
+        if local is not None:
+            return local
+        packed, text = prompt(state)
+        return update(state, packed, structured_llm.invoke(text))
+
+    async def agrade(state: RetrieverState) -> dict:
+        local = local_grade(state)
+        if local is not None:
+            return local
+        packed, text = prompt(state)
+        return update(state, packed, await structured_llm.ainvoke(text))
+
+    return RunnableLambda(grade, afunc=agrade)
 
 
 def make_rewrite(llm):
-    def rewrite(state: RetrieverState) -> dict:
-        msg = llm.invoke(
+    def prompt(state: RetrieverState) -> str:
+        return (
             f"The following query did not yield relevant results:\n"
             f"Original query: {state.original_query}\n"
             f"Last query tried: {state.current_query}\n\n"
             f"Rewrite the query to improve retrieval. "
             f"Return only the rewritten query, nothing else."
         )
+
+    def rewrite(state: RetrieverState) -> dict:
+        msg = llm.invoke(prompt(state))
         return {"current_query": msg.content.strip(), "retries": state.retries + 1}
-    return rewrite
 
+    async def arewrite(state: RetrieverState) -> dict:
+        msg = await llm.ainvoke(prompt(state))
+        return {"current_query": msg.content.strip(), "retries": state.retries + 1}
 
-def make_generate(retriever: InsuranceRetriever, llm):
-    def generate(state: RetrieverState) -> dict:
-        docs_text = "\n---\n".join(
-            retriever.format_document_with_context(doc) for doc in state.documents
+    return RunnableLambda(rewrite, afunc=arewrite)
+
+
+def make_generate(retriever: "InsuranceRetriever", llm, max_tokens: int | None = None):
+    def prompt(state: RetrieverState):
+        packed = default_packer.pack(
+            state.documents, max_tokens, retriever.format_document_with_context
         )
+        docs_text = packed.text
         prompt = f"Query: {state.original_query}\n\n"
 
         if state.premium_data:
@@ -91,13 +211,31 @@ def make_generate(retriever: InsuranceRetriever, llm):
 
         if state.premium_data:
             prompt += "\n\nAlso use the premium data provided to give pricing information."
+        return packed, prompt
+
+    def update(state: RetrieverState, packed, response) -> dict:
+        return {
+            "answer": _text(response),
+            "context_tokens": {**state.context_tokens, "generate": packed.tokens},
+        }
+
+    def generate(state: RetrieverState) -> dict:
+        packed, text = prompt(state)
+        return update(state, packed, llm.invoke(text))
+
+    async def agenerate(state: RetrieverState) -> dict:
+        packed, text = prompt(state)
+        return update(state, packed, await llm.ainvoke(text))
+
+    return RunnableLambda(generate, afunc=agenerate)
 
-        response = llm.invoke(prompt)
-        text = response.content
-        if isinstance(text, list):
-            text = "".join(block["text"] for block in text if block.get("type") == "text")
-        return {"answer": text}
-    return generate
+
+def _text(response) -> str:
+    """Text of a chat model response (Gemini returns a list of content blocks)."""
+    text = response.content
+    if isinstance(text, list):
+        text = "".join(block["text"] for block in text if block.get("type") == "text")
+    return text
 
 
 # --- Outer comparer nodes ---
@@ -107,47 +245,93 @@ def make_route(llm, tools):
     """Router node: uses LLM tool-calling to decide pricing vs retrieval."""
     llm_with_tools = llm.bind_tools(tools)
 
+    def tool_args(state: ComparerState, response) -> dict | None:
+        if not response.tool_calls:
+            return None
+        args = response.tool_calls[0]["args"]
+        # Inject the known providers from state instead of relying on the LLM
+        args["insurance_providers"] = state.insurance_providers
+        return args
+
     def route(state: ComparerState) -> dict:
-        response = llm_with_tools.invoke(state.original_query)
+        args = tool_args(state, llm_with_tools.invoke(state.original_query))
+        if args is None:
+            return {"premium_data": ""}
+        return {"premium_data": tools[0].invoke(args)}
 
-        if response.tool_calls:
-            tool_call = response.tool_calls[0]
-            # Inject the known providers from state instead of relying on the LLM
-            tool_call["args"]["insurance_providers"] = state.insurance_providers
-            result = tools[0].invoke(tool_call["args"])
-            return {"premium_data": result}
+    async def aroute(state: ComparerState) -> dict:
+        args = tool_args(state, await llm_with_tools.ainvoke(state.original_query))
+        if args is None:
+            return {"premium_data": ""}
+        return {"premium_data": await tools[0].ainvoke(args)}
 
-        return {"premium_data": ""}
+    return RunnableLambda(route, afunc=aroute)
 
-    return route
 
+def make_retrieve_all(retriever_subgraph, retriever: "InsuranceRetriever", k: int = 15):
+    """Run the retriever subgraph for each provider in parallel.
 
-def make_retrieve_all(retriever_subgraph):
-    """Run the retriever subgraph for each provider in parallel."""
+    The first retrieval for all providers is done up front with a single
+    embedding and one batched Qdrant call; rewrites inside the subgraph still
+    search per provider.
+    """
 
-    def retrieve_all(state: ComparerState) -> dict:
+    def retrieve_all(state: ComparerState, config: RunnableConfig) -> dict:
+        prefetched = retriever.retrieve_multi_company_docs(
+            state.original_query, state.insurance_providers, k=setting(config, "k", k)
+        )
         def run_for_provider(provider: str) -> ProviderResult:
             result = retriever_subgraph.invoke({
                 "original_query": state.original_query,
                 "insurance_provider": provider,
+                "prefetched_documents": _scored_documents(prefetched[provider]),
             })
             return ProviderResult(
                 insurance_provider=provider,
                 answer=result["answer"],
             )
 
+        # Worker threads don't inherit the run config (callbacks, metadata,
+        # k/top_n); run each in a copy of this node's context, as the async path does
         with ThreadPoolExecutor(max_workers=len(state.insurance_providers)) as pool:
-            results = list(pool.map(run_for_provider, state.insurance_providers))
+            futures = [
+                pool.submit(contextvars.copy_context().run, run_for_provider, provider)
+                for provider in state.insurance_providers
+            ]
+            results = [future.result() for future in futures]
 
         return {"provider_results": results}
 
-    return retrieve_all
+    async def aretrieve_all(state: ComparerState, config: RunnableConfig) -> dict:
+        prefetched = await retriever.aretrieve_multi_company_docs(
+            state.original_query, state.insurance_providers, k=setting(config, "k", k)
+        )
+
+        async def run_for_provider(provider: str) -> ProviderResult:
+            result = await retriever_subgraph.ainvoke({
+                "original_query": state.original_query,
+                "insurance_provider": provider,
+                "prefetched_documents": _scored_documents(prefetched[provider]),
+            })
+            return ProviderResult(
+                insurance_provider=provider,
+                answer=result["answer"],
+            )
+
+        results = await asyncio.gather(
+            *(run_for_provider(provider) for provider in state.insurance_providers)
+        )
+
+        return {"provider_results": list(results)}
+
+    # Async runs fan out on the event loop instead of a thread per provider
+    return RunnableLambda(retrieve_all, afunc=aretrieve_all)
 
 
 def make_compare(llm):
     """Compare and summarize results across providers."""
 
-    def compare(state: ComparerState) -> dict:
+    def prompt(state: ComparerState) -> str:
         results_text = "\n\n".join(
             f"### {r.insurance_provider}\n{r.answer}"
             for r in state.provider_results
@@ -170,11 +354,12 @@ def make_compare(llm):
 
         if state.premium_data:
             prompt += "\n\nAlso use the premium data provided to compare pricing."
+        return prompt
+
+    def compare(state: ComparerState) -> dict:
+        return {"comparison": _text(llm.invoke(prompt(state)))}
 
-        response = llm.invoke(prompt)
-        text = response.content
-        if isinstance(text, list):
-            text = "".join(block["text"] for block in text if block.get("type") == "text")
-        return {"comparison": text}
+    async def acompare(state: ComparerState) -> dict:
+        return {"comparison": _text(await llm.ainvoke(prompt(state)))}
 
-    return compare
+    return RunnableLambda(compare, afunc=acompare)
@@ -1,6 +1,6 @@
 """State definitions for the comparer agent."""
 
-from typing import List, Literal, Optional
+from typing import Dict, List, Literal, Optional
 from pydantic import BaseModel, Field
 from langchain_core.documents import Document
 
@@ -12,7 +12,13 @@ class RetrieverState(BaseModel):
     current_query: str = ""
     insurance_provider: str = ""
     documents: List[Document] = Field(default_factory=list)
+    # Filled by the grouped multi-provider search; consumed by the first retrieve
+    prefetched_documents: List[Document] = Field(default_factory=list)
     evaluation_status: Optional[Literal["direct", "indirect", "miss"]] = None
+    # Who decided evaluation_status: the local grader or the LLM
+    grade_source: Optional[Literal["local", "llm"]] = None
+    # Prompt context size in tokens per node ("pack", "grade", "generate")
+    context_tokens: Dict[str, int] = Field(default_factory=dict)
     answer: str = ""
     premium_data: str = ""
     retries: int = 0
@@ -0,0 +1,109 @@
+"""Persistent cache of deterministic LLM calls.
+
+The grading and routing models run at temperature 0: the same prompt to the
+same model gives the same answer, yet every turn pays for the call again.
+`SQLiteLLMCache` is a LangChain `BaseCache` that stores responses in a
+size-bounded SQLite table per model (see `SQLiteStore` in src/cache.py), so
+they survive restarts and one model's traffic cannot evict another's.
+
+Hits and misses are counted per graph node (from LangGraph's run config),
+together with the latency a hit saved: the duration of the original call,
+stored with the response.
+"""
+
+import hashlib
+import inspect
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Sequence
+
+from langchain_core.caches import BaseCache
+from langchain_core.load import dumpd, load
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, Generation
+
+from src.cache import SQLiteStore
+from src.instrumentation import current_labels
+
+# Classes a cached response may deserialize to. `allowed_objects` is newer
+# than the langchain-core 1.0 floor; older releases load any core class.
+_LOAD_KWARGS = (
+    {"allowed_objects": [Generation, ChatGeneration, AIMessage]}
+    if "allowed_objects" in inspect.signature(load).parameters else {}
+)
+
+_instances: list["SQLiteLLMCache"] = []
+
+
+class SQLiteLLMCache(BaseCache):
+    """LangChain LLM cache backed by one SQLite table per model namespace."""
+
+    def __init__(self, path: Path | str, namespace: str, max_entries: int = 20_000):
+        """
+        Args:
+            path: SQLite file shared by all namespaces.
+            namespace: Model identifier, e.g. "openai:gpt-5-mini".
+            max_entries: Maximum number of cached responses for this model.
+        """
+        self.namespace = namespace
+        table = "llm_" + re.sub(r"\W", "_", namespace)
+        self.store = SQLiteStore(path, max_entries=max_entries, table=table)
+        self._lock = threading.Lock()
+        # Start time of calls that missed, until their response is stored
+        self._pending: dict[str, float] = {}
+        self._nodes: dict[str, dict] = {}
+        _instances.append(self)
+
+    @staticmethod
+    def _key(prompt: str, llm_string: str) -> str:
+        return hashlib.sha256(f"{llm_string}\x00{prompt}".encode("utf-8")).hexdigest()
+
+    def _node_stats(self, node: str) -> dict:
+        return self._nodes.setdefault(node, {"hits": 0, "misses": 0, "saved_latency_s": 0.0})
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[Sequence[Generation]]:
+        key = self._key(prompt, llm_string)
+        entry = self.store.get(key)
+        node = current_labels()["node"]
+        with self._lock:
+            stats = self._node_stats(node)
+            if entry is None:
+                stats["misses"] += 1
+                self._pending[key] = time.perf_counter()
+                return None
+            stats["hits"] += 1
+            stats["saved_latency_s"] += entry["latency_s"]
+        return [load(generation, **_LOAD_KWARGS) for generation in entry["generations"]]
+
+    def update(self, prompt: str, llm_string: str, return_val: Sequence[Generation]) -> None:
+        key = self._key(prompt, llm_string)
+        with self._lock:
+            started = self._pending.pop(key, None)
+        self.store.set(key, {
+            "generations": [dumpd(generation) for generation in return_val],
+            "latency_s": time.perf_counter() - started if started is not None else 0.0,
+        })
+
+    def clear(self, **kwargs) -> None:
+        self.store.clear()
+
+    def stats(self) -> dict:
+        """Entries plus hits, misses, hit rate and saved latency per graph node."""
+        with self._lock:
+            nodes = {
+                node: {
+                    **counts,
+                    "saved_latency_s": round(counts["saved_latency_s"], 3),
+                    "hit_rate": counts["hits"] / (counts["hits"] + counts["misses"])
+                    if counts["hits"] + counts["misses"] else 0.0,
+                }
+                for node, counts in self._nodes.items()
+            }
+        return {"namespace": self.namespace, "entries": len(self.store), "nodes": nodes}
+
+
+def llm_cache_stats() -> list[dict]:
+    """Stats of every LLM cache built in this process."""
+    return [cache.stats() for cache in _instances]
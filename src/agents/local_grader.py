@@ -0,0 +1,229 @@
+"""Local relevance grader: a fast path in front of the LLM grader.
+
+The grade node asks an LLM whether the reranked documents answer the query
+directly, indirectly or not at all. Most turns are easy: the reranker is
+already confident the top chunk answers the question, or that nothing does.
+`LocalGrader` decides those turns from the rerank scores and the lexical
+overlap between the query and the top documents, and returns None (escalate
+to the LLM) for everything in between. "indirect" always needs the LLM: it
+depends on what the documents say, not on how well they match.
+
+Thresholds are calibrated per reranker model against LLM (or human) labels
+with scripts/calibrate_grader.py, and stored in a JSON file. Without a
+calibration for the active reranker model every turn is escalated.
+"""
+
+import json
+import logging
+import re
+import threading
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import List, Literal, Optional
+
+from langchain_core.documents import Document
+
+logger = logging.getLogger(__name__)
+
+LocalStatus = Literal["direct", "miss"]
+
+# Documents whose text counts towards the lexical overlap
+OVERLAP_DOCUMENTS = 3
+
+# Short Dutch and English function words that say nothing about relevance
+_STOPWORDS = frozenset("""
+    aan als ben bij dan dat de die dit door een en er het hoe ik in is ja je kan
+    kunnen maar met mijn na naar niet nog of om ook op over te tot uit van voor
+    waar wat wel wie wij word wordt zijn zal ze zich zo
+    a about an and any are as at be by can do does for from have how i if in is
+    it my of on or that the there this to what when where which who will with
+""".split())
+
+
+def query_terms(text: str) -> set[str]:
+    """Lower-cased content words of at least three characters."""
+    return {
+        word for word in re.findall(r"\w+", text.casefold())
+        if len(word) >= 3 and word not in _STOPWORDS
+    }
+
+
+@dataclass
+class GradeFeatures:
+    """What the local grader looks at for one turn."""
+
+    top_score: float
+    # Share of the query's content words found in the top documents
+    overlap: float
+
+
+def grade_features(query: str, documents: List[Document]) -> Optional[GradeFeatures]:
+    """Features of reranked documents, or None when they carry no rerank scores.
+
+    Turns where adaptive reranking skipped the backend carry the fused
+    retrieval score relative to rank 1 as `rerank_score` (see
+    src/retrieval/reranker/adaptive.py), so they are graded locally too.
+    """
+    scores = [doc.metadata.get("rerank_score") for doc in documents]
+    if not documents or any(score is None for score in scores):
+        return None
+    terms = query_terms(query)
+    found = set()
+    for doc in documents[:OVERLAP_DOCUMENTS]:
+        found |= terms & query_terms(doc.page_content)
+    return GradeFeatures(
+        top_score=max(scores),
+        overlap=len(found) / len(terms) if terms else 0.0,
+    )
+
+
+@dataclass
+class GraderThresholds:
+    """Decision thresholds for one reranker model (see scripts/calibrate_grader.py)."""
+
+    # "direct" when top_score >= direct_score and overlap >= direct_overlap
+    direct_score: Optional[float] = None
+    direct_overlap: float = 0.0
+    # "miss" when top_score <= miss_score and overlap <= miss_overlap
+    miss_score: Optional[float] = None
+    miss_overlap: float = 1.0
+
+    def decide(self, features: GradeFeatures) -> Optional[LocalStatus]:
+        if (
+            self.direct_score is not None
+            and features.top_score >= self.direct_score
+            and features.overlap >= self.direct_overlap
+        ):
+            return "direct"
+        if (
+            self.miss_score is not None
+            and features.top_score <= self.miss_score
+            and features.overlap <= self.miss_overlap
+        ):
+            return "miss"
+        return None
+
+
+class LocalGrader:
+    """Grades confident turns locally and counts how often it escalates."""
+
+    def __init__(self, thresholds: Optional[GraderThresholds] = None, model: str = ""):
+        """
+        Args:
+            thresholds: Calibrated thresholds; None escalates every turn.
+            model: Reranker model the thresholds were calibrated for.
+        """
+        self.thresholds = thresholds
+        self.model = model
+        self._lock = threading.Lock()
+        self.counts = {"direct": 0, "miss": 0, "escalated": 0}
+
+    @classmethod
+    def from_calibration(cls, path: Path | str, model: str) -> "LocalGrader":
+        """Load the thresholds calibrated for reranker `model` from `path`."""
+        try:
+            with open(path, encoding="utf-8") as f:
+                calibrations = json.load(f).get("models", {})
+        except FileNotFoundError:
+            calibrations = {}
+        entry = calibrations.get(model)
+        if entry is None:
+            logger.info("No grader calibration for reranker %s; every grade goes to the LLM", model)
+            return cls(None, model)
+        return cls(GraderThresholds(**entry["thresholds"]), model)
+
+    def decide(self, query: str, documents: List[Document]) -> Optional[LocalStatus]:
+        """"direct" or "miss" when confident, None to escalate to the LLM grader."""
+        status = None
+        if self.thresholds is not None:
+            features = grade_features(query, documents)
+            if features is not None:
+                status = self.thresholds.decide(features)
+        with self._lock:
+            self.counts[status or "escalated"] += 1
+        return status
+
+    def stats(self) -> dict:
+        """Local decisions and escalations so far."""
+        with self._lock:
+            total = sum(self.counts.values())
+            return {
+                "model": self.model,
+                "calibrated": self.thresholds is not None,
+                **self.counts,
+                "escalation_rate": self.counts["escalated"] / total if total else 0.0,
+            }
+
+
+# --- Calibration ---
+
+
+def evaluate(samples: list[tuple[GradeFeatures, str]], thresholds: GraderThresholds) -> dict:
+    """Escalation rate and agreement with the reference labels of `samples`."""
+    decided = agreed = 0
+    confusion: dict[str, dict[str, int]] = {}
+    for features, label in samples:
+        status = thresholds.decide(features) or "escalated"
+        confusion.setdefault(label, {}).setdefault(status, 0)
+        confusion[label][status] += 1
+        if status != "escalated":
+            decided += 1
+            agreed += status == label
+    return {
+        "samples": len(samples),
+        "escalation_rate": 1 - decided / len(samples) if samples else 0.0,
+        "agreement": agreed / decided if decided else 0.0,
+        "confusion": confusion,
+    }
+
+
+def _best_rule(samples, label, matches, score_grid, overlap_grid, target_precision, min_support):
+    """(score, overlap) rule with the highest coverage at the target precision."""
+    best, best_coverage = None, 0
+    for score in score_grid:
+        for overlap in overlap_grid:
+            hits = [sample_label for features, sample_label in samples if matches(features, score, overlap)]
+            if len(hits) < min_support:
+                continue
+            precision = sum(hit == label for hit in hits) / len(hits)
+            if precision >= target_precision and len(hits) > best_coverage:
+                best, best_coverage = (score, overlap), len(hits)
+    return best
+
+
+def calibrate(
+    samples: list[tuple[GradeFeatures, str]],
+    target_precision: float = 0.95,
+    min_support: int = 3,
+) -> GraderThresholds:
+    """
+    Pick the thresholds that decide the most turns locally while agreeing
+    with the labels at least `target_precision` of the time, separately for
+    "direct" and "miss". A rule backed by fewer than `min_support` samples
+    is not used.
+    """
+    score_grid = sorted({features.top_score for features, _ in samples})
+    overlap_grid = [i / 10 for i in range(11)]
+    direct = _best_rule(
+        samples, "direct", lambda f, s, o: f.top_score >= s and f.overlap >= o,
+        score_grid, overlap_grid, target_precision, min_support,
+    )
+    miss = _best_rule(
+        samples, "miss", lambda f, s, o: f.top_score <= s and f.overlap <= o,
+        score_grid, overlap_grid, target_precision, min_support,
+    )
+    thresholds = GraderThresholds()
+    if direct:
+        thresholds.direct_score, thresholds.direct_overlap = direct
+    if miss:
+        thresholds.miss_score, thresholds.miss_overlap = miss
+    return thresholds
+
+
+def save_calibration(path: Path | str, model: str, thresholds: GraderThresholds, report: dict) -> None:
+    """Store the thresholds for `model` in `path`, keeping other models' entries."""
+    path = Path(path)
+    data = json.loads(path.read_text(encoding="utf-8")) if path.exists() else {"models": {}}
+    data["models"][model] = {"thresholds": asdict(thresholds), "report": report}
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data, indent=2), encoding="utf-8")
@@ -0,0 +1,102 @@
+"""Shared resources for the agents: retriever, reranker, caches and chat model clients.
+
+Each helper registers a factory in the process-wide registry and returns the
+registry name. Nothing is built, and the heavy client libraries (Qdrant,
+FastEmbed, OpenAI, Gemini) are not even imported, until an agent first
+uses the resource. Chat models are named by provider, model and temperature,
+so agents asking for the same model share one client.
+"""
+
+import os
+
+from src.registry import registry
+
+
+def _build_retriever():
+    from src.retrieval.retriever import InsuranceRetriever
+    return InsuranceRetriever()
+
+
+def _build_reranker():
+    from src.retrieval.reranker.reranker import Reranker
+    return Reranker()
+
+
+def default_retriever() -> str:
+    """Register the default InsuranceRetriever and return its registry name."""
+    return registry.register("retriever", _build_retriever)
+
+
+def default_reranker() -> str:
+    """Register the default Reranker and return its registry name."""
+    return registry.register("reranker", _build_reranker)
+
+
+def default_answer_cache(max_entries: int, ttl_seconds: float, similarity_threshold: float | None) -> str:
+    """Register the process-wide AnswerCache and return its registry name."""
+    def build():
+        from src.agents.answer_cache import AnswerCache
+        return AnswerCache(
+            max_entries=max_entries,
+            ttl_seconds=ttl_seconds,
+            similarity_threshold=similarity_threshold,
+        )
+
+    return registry.register("answer_cache", build)
+
+
+def default_local_grader(calibration_path) -> str:
+    """Register the LocalGrader calibrated for the default reranker's model and return its registry name."""
+    def build():
+        from src.agents.local_grader import LocalGrader
+        return LocalGrader.from_calibration(calibration_path, registry.get(default_reranker()).model)
+
+    return registry.register(f"local_grader:{calibration_path}", build)
+
+
+def llm_cache(path, namespace: str, max_entries: int) -> str:
+    """Register the persistent response cache of one model and return its registry name."""
+    def build():
+        from src.agents.llm_cache import SQLiteLLMCache
+        return SQLiteLLMCache(path, namespace=namespace, max_entries=max_entries)
+
+    return registry.register(f"llm_cache:{namespace}", build)
+
+
+def openai_chat(
+    model: str,
+    temperature: float,
+    cache_path=None,
+    cache_max_entries: int = 20_000,
+) -> str:
+    """
+    Register a ChatOpenAI client and return its registry name.
+
+    With `cache_path`, responses are cached on disk per model (only useful
+    for deterministic, temperature-0 calls).
+    """
+    cache = llm_cache(cache_path, f"openai:{model}", cache_max_entries) if cache_path else None
+
+    def build():
+        from langchain_openai import ChatOpenAI
+        return ChatOpenAI(
+            model=model,
+            temperature=temperature,
+            cache=registry.get(cache) if cache else None,
+        )
+
+    suffix = ":cached" if cache else ""
+    return registry.register(f"llm:openai:{model}:{temperature}{suffix}", build)
+
+
+def gemini_chat(model: str, temperature: float) -> str:
+    """Register a Gemini chat client (GEMINI_API_KEY from .env) and return its registry name."""
+    def build():
+        from langchain_google_genai import ChatGoogleGenerativeAI
+        return ChatGoogleGenerativeAI(
+            model=model,
+            temperature=temperature,
+            google_api_key=os.getenv("GEMINI_API_KEY"),
+        )
+
+    return registry.register(f"llm:gemini:{model}:{temperature}", build)
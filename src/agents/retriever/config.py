@@ -1,18 +1,67 @@
-"""Default configuration for the retriever agent."""
-
-import os
-from langchain_openai import ChatOpenAI
-from langchain_google_genai import ChatGoogleGenerativeAI
-from src.retrieval.retriever import retriever
-from src.retrieval.reranker.reranker import reranker
-
-retriever = retriever
-reranker = reranker
-grading_llm = ChatOpenAI(model="gpt-5-mini", temperature=0)
-rewrite_llm = ChatOpenAI(model="gpt-5-mini", temperature=0.5)
-generation_llm = ChatGoogleGenerativeAI(
-    model="gemini-3-flash-preview",
-    temperature=0.8,
-    google_api_key=os.getenv("GEMINI_API_KEY")  
+"""Default configuration for the retriever agent.
+
+Resources are resolved lazily: importing this module builds nothing, and
+`config.retriever`, `config.grading_llm`, ... build the shared instance on
+first access (see src/registry.py).
+"""
+
+from src.agents.resources import (
+    default_retriever, default_reranker, default_answer_cache, default_local_grader,
+    openai_chat, gemini_chat,
 )
-routing_llm = ChatOpenAI(model="gpt-5-mini", temperature=0)
\ No newline at end of file
+from src.config import DATA_DIR
+from src.registry import registry
+
+# Cross-session answer cache (see src/agents/answer_cache.py)
+ANSWER_CACHE_ENABLED = True
+ANSWER_CACHE_MAX_ENTRIES = 1024
+ANSWER_CACHE_TTL_SECONDS = 24 * 3600
+# Cosine similarity of query embeddings for a semantic hit; None = exact hits only
+ANSWER_CACHE_SIMILARITY = 0.95
+
+# Local relevance grader in front of the LLM grader (see src/agents/local_grader.py).
+# Thresholds per reranker model come from scripts/calibrate_grader.py; without
+# a calibration for the active model every grade goes to the LLM.
+LOCAL_GRADER_ENABLED = True
+GRADER_CALIBRATION_PATH = DATA_DIR / "benchmarks" / "grader_calibration.json"
+
+# On a miss, one LLM call proposes QUERY_FANOUT_VARIANTS rephrasings that are
+# searched together and fused with RRF, instead of up to max_retries
+# sequential rewrite rounds
+QUERY_FANOUT = False
+QUERY_FANOUT_VARIANTS = 3
+
+# Draft the answer while grading runs; kept only when the grade is "direct"
+SPECULATIVE_GENERATION = False
+
+# Disk cache of the temperature-0 LLM calls (grading, routing), one table per
+# model (see src/agents/llm_cache.py); None disables it
+LLM_CACHE_PATH = DATA_DIR / "cache" / "llm_responses.sqlite"
+
+# Attribute name -> registry name
+RESOURCES = {
+    "retriever": default_retriever(),
+    "reranker": default_reranker(),
+    "grading_llm": openai_chat("gpt-5-mini", temperature=0, cache_path=LLM_CACHE_PATH),
+    "rewrite_llm": openai_chat("gpt-5-mini", temperature=0.5),
+    "generation_llm": gemini_chat("gemini-3-flash-preview", temperature=0.8),
+    "routing_llm": openai_chat("gpt-5-mini", temperature=0, cache_path=LLM_CACHE_PATH),
+    "answer_cache": default_answer_cache(
+        ANSWER_CACHE_MAX_ENTRIES, ANSWER_CACHE_TTL_SECONDS, ANSWER_CACHE_SIMILARITY
+    ),
+    "local_grader": default_local_grader(GRADER_CALIBRATION_PATH),
+}
+
+# Prompt context budgets in tokens (see src/retrieval/context_packer.py).
+# "pack" runs after rerank and bounds the documents every later node sees.
+CONTEXT_TOKENS = {
+    "pack": 12000,
+    "grade": 4000,
+    "generate": 12000,
+}
+
+
+def __getattr__(name: str):
+    if name in RESOURCES:
+        return registry.get(RESOURCES[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
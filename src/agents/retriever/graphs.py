@@ -1,21 +1,44 @@
 """Self-reflective RAG agent with retrieval, reranking, grading, and query rewriting."""
 
 from langgraph.graph import StateGraph, START, END
+from src.agents.runtime import runtime_config
+from src.agents.speculation import SpeculationStats
+from src.instrumentation import instrument
 from .state import RetrieverState
-from .config import retriever, reranker, grading_llm, rewrite_llm, generation_llm
-from .nodes import make_retrieve, make_rerank, make_grade, make_rewrite, make_generate
+from . import config
+from .nodes import (
+    make_check_cache, make_retrieve, make_rerank, make_pack, make_grade, make_rewrite,
+    make_generate, make_store_cache, make_speculative_grade, make_expand, make_fanout_retrieve,
+)
 
 
 class RetrieverAgent:
     """Self-reflective RAG agent. All configuration comes from config.py."""
 
-    def __init__(self, k: int = 25, top_n: int = 8, max_retries: int = 3):
-        self.retriever = retriever
-        self.reranker = reranker
-        self.grading_llm = grading_llm
-        self.rewrite_llm = rewrite_llm
-        self.generation_llm = generation_llm
+    def __init__(
+        self,
+        k: int = 25,
+        top_n: int = 8,
+        max_retries: int = 3,
+        use_answer_cache: bool = config.ANSWER_CACHE_ENABLED,
+        speculative: bool = config.SPECULATIVE_GENERATION,
+        use_local_grader: bool = config.LOCAL_GRADER_ENABLED,
+        fanout: bool = config.QUERY_FANOUT,
+    ):
+        self.retriever = config.retriever
+        self.reranker = config.reranker
+        self.grading_llm = config.grading_llm
+        self.rewrite_llm = config.rewrite_llm
+        self.generation_llm = config.generation_llm
+        # Shared by every RetrieverAgent in the process, so hits carry across chat sessions
+        self.answer_cache = config.answer_cache if use_answer_cache else None
+        # Decides confident grades from the rerank scores, escalating the rest to grading_llm
+        self.local_grader = config.local_grader if use_local_grader else None
+        # Accepted/discarded drafts, latency saved and tokens wasted (speculative mode)
+        self.speculation = SpeculationStats() if speculative else None
         self.max_retries = max_retries
+        # After a miss, search several rephrasings at once instead of rewriting one at a time
+        self.fanout = fanout
         self.graph = self._build_graph(k=k, top_n=top_n)
 
     def _build_graph(self, k: int, top_n: int):
@@ -23,33 +46,86 @@ class RetrieverAgent:
 
         workflow.add_node("retrieve", make_retrieve(self.retriever, k=k))
         workflow.add_node("rerank", make_rerank(self.reranker, top_n=top_n))
-        workflow.add_node("grade", make_grade(self.retriever, self.grading_llm))
-        workflow.add_node("rewrite", make_rewrite(self.rewrite_llm))
-        workflow.add_node("generate", make_generate(self.retriever, self.generation_llm))
+        workflow.add_node("pack", make_pack(self.retriever, max_tokens=config.CONTEXT_TOKENS["pack"]))
+        grade = make_grade(
+            self.retriever, self.grading_llm,
+            max_tokens=config.CONTEXT_TOKENS["grade"], local_grader=self.local_grader,
+        )
+        generate = make_generate(
+            self.retriever, self.generation_llm, max_tokens=config.CONTEXT_TOKENS["generate"]
+        )
+        if self.speculation is not None:
+            grade = make_speculative_grade(grade, generate, self.speculation)
+        workflow.add_node("grade", grade)
+        if self.fanout:
+            workflow.add_node("expand", make_expand(self.rewrite_llm, n_variants=config.QUERY_FANOUT_VARIANTS))
+            workflow.add_node("fanout_retrieve", make_fanout_retrieve(self.retriever, k=k))
+            workflow.add_edge("expand", "fanout_retrieve")
+            workflow.add_edge("fanout_retrieve", "rerank")
+            retry = "expand"
+        else:
+            workflow.add_node("rewrite", make_rewrite(self.rewrite_llm))
+            workflow.add_edge("rewrite", "retrieve")
+            retry = "rewrite"
+        workflow.add_node("generate", generate)
+
+        # Where a run goes once it has an answer
+        finish = END
+        if self.answer_cache is not None:
+            workflow.add_node("check_cache", make_check_cache(self.retriever, self.answer_cache))
+            workflow.add_node("store_cache", make_store_cache(self.retriever, self.answer_cache))
+            workflow.add_edge(START, "check_cache")
+            workflow.add_conditional_edges(
+                "check_cache",
+                self._route_after_cache,
+                {END: END, "retrieve": "retrieve"},
+            )
+            workflow.add_edge("store_cache", END)
+            finish = "store_cache"
+        else:
+            workflow.add_edge(START, "retrieve")
+        workflow.add_edge("generate", finish)
 
-        workflow.add_edge(START, "retrieve")
         workflow.add_edge("retrieve", "rerank")
-        workflow.add_edge("rerank", "grade")
+        workflow.add_edge("rerank", "pack")
+        workflow.add_edge("pack", "grade")
         workflow.add_conditional_edges(
             "grade",
             self._route_after_grading,
-            {"generate": "generate", "rewrite": "rewrite"},
+            {"generate": "generate", "rewrite": retry, "done": finish},
         )
-        workflow.add_edge("rewrite", "retrieve")
-        workflow.add_edge("generate", END)
 
-        return workflow.compile()
+        return instrument(workflow.compile(), agent="retriever")
+
+    def _route_after_cache(self, state: RetrieverState) -> str:
+        return END if state.cache_hit else "retrieve"
 
     def _route_after_grading(self, state: RetrieverState) -> str:
+        if state.draft_accepted:
+            return "done"
         if state.evaluation_status in ("direct", "indirect"):
             return "generate"
         if state.retries >= self.max_retries:
             return "generate"
+        # Fan-out gets a single retry round
+        if self.fanout and state.query_variants:
+            return "generate"
         return "rewrite"
 
-    def invoke(self, query: str, insurance_provider: str) -> dict:
-        """Convenience method to run the graph."""
+    def invoke(
+        self, query: str, insurance_provider: str, k: int | None = None, top_n: int | None = None
+    ) -> dict:
+        """Convenience method to run the graph; k/top_n override the defaults for this run."""
         return self.graph.invoke({
             "original_query": query,
             "insurance_provider": insurance_provider,
-        })
+        }, config=runtime_config(k=k, top_n=top_n))
+
+    async def ainvoke(
+        self, query: str, insurance_provider: str, k: int | None = None, top_n: int | None = None
+    ) -> dict:
+        """Async `invoke`: every node runs its async variant on the event loop."""
+        return await self.graph.ainvoke({
+            "original_query": query,
+            "insurance_provider": insurance_provider,
+        }, config=runtime_config(k=k, top_n=top_n))
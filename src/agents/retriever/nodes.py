@@ -1,14 +1,27 @@
 """Node functions for the self-reflective RAG retriever graph."""
 
+import asyncio
 import json
 import logging
-from typing import Literal
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Literal, TYPE_CHECKING
+from langchain_core.runnables import RunnableConfig, RunnableLambda
 from pydantic import BaseModel, Field
 
+from src.agents.answer_cache import AnswerCache, CachedAnswer
+from src.agents.speculation import SpeculationStats
+from src.agents.runtime import setting
+from src.retrieval.context_packer import default_packer
+
 logger = logging.getLogger(__name__)
 
-from src.retrieval.retriever import InsuranceRetriever
-from src.retrieval.reranker.reranker import Reranker
+if TYPE_CHECKING:
+    # Type hints only: importing these pulls in the Qdrant and embedding clients
+    from src.retrieval.retriever import InsuranceRetriever
+    from src.retrieval.reranker.reranker import Reranker
+    from src.agents.local_grader import LocalGrader
+
 from .state import RetrieverState
 
 
@@ -24,55 +37,283 @@ class GradeResult(BaseModel):
     )
 
 
-def make_retrieve(retriever: InsuranceRetriever, k: int = 25):
-    def retrieve(state: RetrieverState) -> dict:
+class QueryVariants(BaseModel):
+    """Alternative phrasings of a query for multi-query retrieval."""
+
+    queries: List[str] = Field(description="Rephrased search queries, one per list item.")
+
+
+def make_check_cache(retriever: "InsuranceRetriever", answer_cache: AnswerCache):
+    """Serve a cached answer for this provider and (a similar) query, if there is one."""
+    def check_cache(state: RetrieverState) -> dict:
+        key = answer_cache.make_key(
+            retriever.collection_name, retriever.collection_version(),
+            state.insurance_provider, state.original_query,
+        )
+        cached, kind = answer_cache.get(
+            key, lambda: retriever.embeddings.embed_query(state.original_query)
+        )
+        return _cache_hit_update(cached, kind)
+
+    async def acheck_cache(state: RetrieverState) -> dict:
+        key = answer_cache.make_key(
+            retriever.collection_name, await retriever.acollection_version(),
+            state.insurance_provider, state.original_query,
+        )
+        cached, kind = await answer_cache.aget(
+            key, lambda: retriever.embeddings.aembed_query(state.original_query)
+        )
+        return _cache_hit_update(cached, kind)
+
+    return RunnableLambda(check_cache, afunc=acheck_cache)
+
+
+def _cache_hit_update(cached, kind) -> dict:
+    if cached is None:
+        return {"cache_hit": None}
+    logger.info("Answer cache %s hit for '%s'", kind, cached.query)
+    return {
+        "answer": cached.answer,
+        "documents": cached.documents,
+        "evaluation_status": cached.evaluation_status,
+        "cache_hit": kind,
+    }
+
+
+def make_store_cache(retriever: "InsuranceRetriever", answer_cache: AnswerCache):
+    """Cache answers grounded in relevant documents (not those given up on after a miss)."""
+    def cacheable(state: RetrieverState) -> bool:
+        return state.evaluation_status in ("direct", "indirect") and bool(state.answer)
+
+    def store(state: RetrieverState, key: tuple, embedding) -> dict:
+        answer_cache.set(key, CachedAnswer(
+            query=state.original_query,
+            answer=state.answer,
+            evaluation_status=state.evaluation_status,
+            documents=state.documents,
+        ), embedding)
+        return {}
+
+    def store_cache(state: RetrieverState) -> dict:
+        if not cacheable(state):
+            return {}
+        key = answer_cache.make_key(
+            retriever.collection_name, retriever.collection_version(),
+            state.insurance_provider, state.original_query,
+        )
+        # Served from the embedding cache: check_cache embedded this query already
+        embedding = (
+            retriever.embeddings.embed_query(state.original_query) if answer_cache.semantic else None
+        )
+        return store(state, key, embedding)
+
+    async def astore_cache(state: RetrieverState) -> dict:
+        if not cacheable(state):
+            return {}
+        key = answer_cache.make_key(
+            retriever.collection_name, await retriever.acollection_version(),
+            state.insurance_provider, state.original_query,
+        )
+        embedding = (
+            await retriever.embeddings.aembed_query(state.original_query) if answer_cache.semantic else None
+        )
+        return store(state, key, embedding)
+
+    return RunnableLambda(store_cache, afunc=astore_cache)
+
+
+def make_retrieve(retriever: "InsuranceRetriever", k: int = 25):
+    """Retrieve `k` candidates; `configurable["k"]` overrides it per invocation."""
+    def retrieve(state: RetrieverState, config: RunnableConfig) -> dict:
         query = state.current_query or state.original_query
-        results = retriever.retrieve_company_docs(query, state.insurance_provider, k=k)
-        return {"documents": [doc for doc, _ in results], "current_query": query}
-    return retrieve
+        results = retriever.retrieve_company_docs(
+            query, state.insurance_provider, k=setting(config, "k", k)
+        )
+        return {"documents": _scored_documents(results), "current_query": query}
 
+    async def aretrieve(state: RetrieverState, config: RunnableConfig) -> dict:
+        query = state.current_query or state.original_query
+        results = await retriever.aretrieve_company_docs(
+            query, state.insurance_provider, k=setting(config, "k", k)
+        )
+        return {"documents": _scored_documents(results), "current_query": query}
 
-def make_rerank(reranker: Reranker, top_n: int = 8):
-    def rerank(state: RetrieverState) -> dict:
-        return {"documents": reranker.rerank(state.current_query, state.documents, top_n=top_n)}
-    return rerank
+    # LangGraph picks `aretrieve` when the graph runs via ainvoke/astream
+    return RunnableLambda(retrieve, afunc=aretrieve)
 
 
-def make_grade(retriever: InsuranceRetriever, llm):
-    def grade(state: RetrieverState) -> dict:
-        docs_text = "\n---\n".join(
-            retriever.format_document_with_context(doc) for doc in state.documents
+def _scored_documents(results: list) -> list:
+    """Documents from (Document, score) hits, keeping the fused score for adaptive reranking."""
+    for doc, score in results:
+        doc.metadata["retrieval_score"] = score
+    return [doc for doc, _ in results]
+
+
+def make_rerank(reranker: "Reranker", top_n: int = 8):
+    """Keep the `top_n` best documents; `configurable["top_n"]` overrides it per invocation."""
+    def rerank(state: RetrieverState, config: RunnableConfig) -> dict:
+        return {"documents": reranker.rerank(
+            state.current_query, state.documents, top_n=setting(config, "top_n", top_n)
+        )}
+
+    async def arerank(state: RetrieverState, config: RunnableConfig) -> dict:
+        return {"documents": await reranker.arerank(
+            state.current_query, state.documents, top_n=setting(config, "top_n", top_n)
+        )}
+
+    return RunnableLambda(rerank, afunc=arerank)
+
+
+def make_expand(llm, n_variants: int = 3):
+    """Fan-out: one LLM call proposes several rephrasings of the original query."""
+    structured_llm = llm.with_structured_output(QueryVariants)
+
+    def prompt(state: RetrieverState) -> str:
+        return (
+            f"The following query did not yield relevant results:\n"
+            f"Original query: {state.original_query}\n\n"
+            f"Write {n_variants} different search queries that could find the answer "
+            f"in an insurance policy: use synonyms, the policy's likely terminology, "
+            f"and both Dutch and English where it helps."
+        )
+
+    def update(state: RetrieverState, result: QueryVariants) -> dict:
+        variants = [query.strip() for query in result.queries if query.strip()][:n_variants]
+        return {
+            "query_variants": variants,
+            "current_query": state.original_query,
+            "retries": state.retries + 1,
+        }
+
+    def expand(state: RetrieverState) -> dict:
+        return update(state, structured_llm.invoke(prompt(state)))
+
+    async def aexpand(state: RetrieverState) -> dict:
+        return update(state, await structured_llm.ainvoke(prompt(state)))
+
+    return RunnableLambda(expand, afunc=aexpand)
+
+
+def make_fanout_retrieve(retriever: "InsuranceRetriever", k: int = 25):
+    """Retrieve with the original query and all its variants at once, fused with RRF."""
+    def fanout_retrieve(state: RetrieverState, config: RunnableConfig) -> dict:
+        queries = [state.original_query, *state.query_variants]
+        results = retriever.retrieve_multi_query_docs(
+            queries, state.insurance_provider, k=setting(config, "k", k)
+        )
+        return {"documents": _scored_documents(results)}
+
+    async def afanout_retrieve(state: RetrieverState, config: RunnableConfig) -> dict:
+        queries = [state.original_query, *state.query_variants]
+        results = await retriever.aretrieve_multi_query_docs(
+            queries, state.insurance_provider, k=setting(config, "k", k)
+        )
+        return {"documents": _scored_documents(results)}
+
+    return RunnableLambda(fanout_retrieve, afunc=afanout_retrieve)
+
+
+def make_pack(retriever: "InsuranceRetriever", max_tokens: int | None = None):
+    """Drop overlapping chunks and trim the reranked documents to a token budget."""
+    def pack(state: RetrieverState) -> dict:
+        packed = default_packer.pack(
+            state.documents, max_tokens, retriever.format_document_with_context
+        )
+        if packed.dropped_overlap or packed.dropped_budget or packed.truncated:
+            logger.info(
+                "Packed %d/%d documents into %d tokens (%d overlapping, %d over budget, truncated=%s)",
+                len(packed.documents), len(state.documents), packed.tokens,
+                packed.dropped_overlap, packed.dropped_budget, packed.truncated,
+            )
+        return {"documents": packed.documents, "context_tokens": {"pack": packed.tokens}}
+    return pack
+
+
+def make_grade(
+    retriever: "InsuranceRetriever",
+    llm,
+    max_tokens: int | None = None,
+    local_grader: "LocalGrader | None" = None,
+):
+    """Grade the documents; confident cases are decided by `local_grader` without the LLM."""
+    structured_llm = llm.with_structured_output(GradeResult)
+
+    def local_grade(state: RetrieverState) -> dict | None:
+        if local_grader is None:
+            return None
+        status = local_grader.decide(state.current_query, state.documents)
+        if status is None:
+            return None
+        return {
+            "evaluation_status": status,
+            "grade_source": "local",
+            "context_tokens": {**state.context_tokens, "grade": 0},
+        }
+
+    def prompt(state: RetrieverState):
+        packed = default_packer.pack(
+            state.documents, max_tokens, retriever.format_document_with_context
         )
-        result = llm.with_structured_output(GradeResult).invoke(
+        return packed, (
             f"Query: {state.current_query}\n\n"
-            f"Documents:\n{docs_text}\n\n"
+            f"Documents:\n{packed.text}\n\n"
             "Classify whether these documents answer the query directly, "
             "indirectly (e.g. explaining why something is excluded), "
             "or not at all (miss)."
         )
-        return {"evaluation_status": result.status}
-    return grade
+
+    def update(state: RetrieverState, packed, result: GradeResult) -> dict:
+        return {
+            "evaluation_status": result.status,
+            "grade_source": "llm",
+            "context_tokens": {**state.context_tokens, "grade": packed.tokens},
+        }
+
+    def grade(state: RetrieverState) -> dict:
+        local = local_grade(state)
+        if local is not None:
+            return local
+        packed, text = prompt(state)
+        return update(state, packed, structured_llm.invoke(text))
+
+    async def agrade(state: RetrieverState) -> dict:
+        local = local_grade(state)
+        if local is not None:
+            return local
+        packed, text = prompt(state)
+        return update(state, packed, await structured_llm.ainvoke(text))
+
+    return RunnableLambda(grade, afunc=agrade)
 
 
 def make_rewrite(llm):
-    def rewrite(state: RetrieverState) -> dict:
-        msg = llm.invoke(
+    def prompt(state: RetrieverState) -> str:
+        return (
             f"The following query did not yield relevant results:\n"
             f"Original query: {state.original_query}\n"
             f"Last query tried: {state.current_query}\n\n"
             f"Rewrite the query to improve retrieval. "
             f"Return only the rewritten query, nothing else."
         )
+
+    def rewrite(state: RetrieverState) -> dict:
+        msg = llm.invoke(prompt(state))
         return {"current_query": msg.content.strip(), "retries": state.retries + 1}
-    return rewrite
 
+    async def arewrite(state: RetrieverState) -> dict:
+        msg = await llm.ainvoke(prompt(state))
+        return {"current_query": msg.content.strip(), "retries": state.retries + 1}
 
+    return RunnableLambda(rewrite, afunc=arewrite)
 
-def make_generate(retriever: InsuranceRetriever, llm):
-    def generate(state: RetrieverState) -> dict:
-        docs_text = "\n---\n".join(
-            retriever.format_document_with_context(doc) for doc in state.documents
+
+
+def make_generate(retriever: "InsuranceRetriever", llm, max_tokens: int | None = None):
+    def prompt(state: RetrieverState):
+        packed = default_packer.pack(
+            state.documents, max_tokens, retriever.format_document_with_context
         )
+        docs_text = packed.text
         
         # System Instructions for a "Synthesized but Strict" answer
         base_instructions = (
@@ -105,13 +346,116 @@ def make_generate(retriever: InsuranceRetriever, llm):
             )
 
         prompt += "\n\nFINAL ANSWER:"
+        return packed, prompt
 
-        response = llm.invoke(prompt)
+    def update(state: RetrieverState, packed, response) -> dict:
         text = response.content
         
         if isinstance(text, list):
             text = "".join(block["text"] for block in text if block.get("type") == "text")
             
-        return {"answer": text.strip()}
-        
-    return generate
+        return {
+            "answer": text.strip(),
+            "context_tokens": {**state.context_tokens, "generate": packed.tokens},
+            "generation_tokens": _total_tokens(response),
+        }
+
+    def generate(state: RetrieverState) -> dict:
+        packed, text = prompt(state)
+        return update(state, packed, llm.invoke(text))
+
+    async def agenerate(state: RetrieverState) -> dict:
+        packed, text = prompt(state)
+        return update(state, packed, await llm.ainvoke(text))
+
+    return RunnableLambda(generate, afunc=agenerate)
+
+
+def _total_tokens(response) -> int:
+    usage = getattr(response, "usage_metadata", None) or {}
+    return usage.get("total_tokens", 0)
+
+
+def make_speculative_grade(grade, generate, stats: SpeculationStats, max_workers: int = 4):
+    """Grade and draft a "direct" answer at the same time.
+
+    The draft is kept only when the grade is "direct". Otherwise the node
+    returns as soon as grading is done; the draft finishes in the background
+    and its tokens are counted as wasted. Sync runs draft on a thread pool,
+    async runs in a task on the event loop.
+    """
+    pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="speculative-draft")
+    # The event loop only keeps weak references to running tasks
+    running_drafts: set = set()
+
+    # The node's config carries the run's callbacks and `configurable`
+    # settings; the draft thread would not inherit them otherwise
+    def timed(node, state: RetrieverState, config: RunnableConfig) -> tuple[dict, float]:
+        start = time.perf_counter()
+        return node.invoke(state, config), time.perf_counter() - start
+
+    async def atimed(node, state: RetrieverState, config: RunnableConfig) -> tuple[dict, float]:
+        start = time.perf_counter()
+        return await node.ainvoke(state, config), time.perf_counter() - start
+
+    def as_direct(state: RetrieverState) -> RetrieverState:
+        return state.model_copy(update={"evaluation_status": "direct"})
+
+    def record_wasted(future) -> None:
+        if not future.cancelled() and future.exception() is None:
+            stats.record_wasted_tokens(future.result()[0].get("generation_tokens", 0))
+
+    def consume_error(task) -> None:
+        # Retrieves the exception of a draft nobody awaits (grading failed)
+        if not task.cancelled() and task.exception() is not None:
+            logger.debug("Abandoned speculative draft failed: %r", task.exception())
+
+    def discard(graded: dict, draft) -> dict:
+        stats.record_discarded(graded["evaluation_status"])
+        draft.add_done_callback(record_wasted)
+        return {**graded, "draft_accepted": False}
+
+    def accept(graded: dict, grade_s: float, drafted: dict, draft_s: float) -> dict:
+        stats.record_accepted(grade_s, draft_s, drafted.get("generation_tokens", 0))
+        return {
+            **graded,
+            "answer": drafted["answer"],
+            "generation_tokens": drafted.get("generation_tokens", 0),
+            "context_tokens": {**graded["context_tokens"], **drafted["context_tokens"]},
+            "draft_accepted": True,
+        }
+
+    def speculative_grade(state: RetrieverState, config: RunnableConfig) -> dict:
+        draft = pool.submit(timed, generate, as_direct(state), config)
+        graded, grade_s = timed(grade, state, config)
+        if graded["evaluation_status"] != "direct":
+            return discard(graded, draft)
+
+        try:
+            drafted, draft_s = draft.result()
+        except Exception as e:
+            # Fall back to the regular generate node
+            logger.warning("Speculative draft failed: %r", e)
+            return {**graded, "draft_accepted": False}
+        return accept(graded, grade_s, drafted, draft_s)
+
+    async def aspeculative_grade(state: RetrieverState, config: RunnableConfig) -> dict:
+        draft = asyncio.ensure_future(atimed(generate, as_direct(state), config))
+        running_drafts.add(draft)
+        draft.add_done_callback(running_drafts.discard)
+        try:
+            graded, grade_s = await atimed(grade, state, config)
+        except BaseException:
+            draft.add_done_callback(consume_error)
+            raise
+        if graded["evaluation_status"] != "direct":
+            return discard(graded, draft)
+
+        try:
+            drafted, draft_s = await draft
+        except Exception as e:
+            logger.warning("Speculative draft failed: %r", e)
+            return {**graded, "draft_accepted": False}
+        return accept(graded, grade_s, drafted, draft_s)
+
+    return RunnableLambda(speculative_grade, afunc=aspeculative_grade)
@@ -1,6 +1,6 @@
 """State for the self-reflective RAG retriever graph."""
 
-from typing import List, Literal, Optional
+from typing import Dict, List, Literal, Optional
 from pydantic import BaseModel, Field
 from langchain_core.documents import Document
 
@@ -13,6 +13,18 @@ class RetrieverState(BaseModel):
     insurance_provider: str = ""
     documents: List[Document] = Field(default_factory=list)
     evaluation_status: Optional[Literal["direct", "indirect", "miss"]] = None
+    # Who decided evaluation_status: the local grader or the LLM
+    grade_source: Optional[Literal["local", "llm"]] = None
+    # Prompt context size in tokens per node ("pack", "grade", "generate")
+    context_tokens: Dict[str, int] = Field(default_factory=dict)
     answer: str = ""
+    # Total tokens of the generation call (0 when the model reports no usage)
+    generation_tokens: int = 0
+    # Speculative mode: the draft generated during grading became the answer
+    draft_accepted: bool = False
+    # Set when the answer was served from the answer cache
+    cache_hit: Optional[Literal["exact", "semantic"]] = None
     retries: int = 0
+    # Fan-out mode: rephrasings of original_query searched together after a miss
+    query_variants: List[str] = Field(default_factory=list)
     premium_data: str = ""
@@ -0,0 +1,25 @@
+"""Per-invocation settings for the agent graphs.
+
+The compiled graphs are shared by every chat session, so settings that vary
+per session (k, top_n) are not baked into the nodes: they travel with each
+run in `config["configurable"]`, and the nodes fall back to the values the
+agent was built with.
+"""
+
+from langchain_core.runnables import RunnableConfig
+
+# Settings the retrieve and rerank nodes read from config["configurable"]
+RUNTIME_SETTINGS = ("k", "top_n")
+
+
+def runtime_config(**settings) -> RunnableConfig:
+    """Graph config carrying the given settings; None values keep the graph's default."""
+    return {"configurable": {
+        name: int(value) for name, value in settings.items()
+        if name in RUNTIME_SETTINGS and value is not None
+    }}
+
+
+def setting(config: RunnableConfig | None, name: str, default):
+    """Per-invocation setting from `config["configurable"]`, else `default`."""
+    return ((config or {}).get("configurable") or {}).get(name, default)
@@ -0,0 +1,56 @@
+"""Bookkeeping for speculative generation.
+
+In speculative mode the retriever agent starts generating an answer for a
+"direct" grade while the grading LLM is still running. When the grade comes
+back "direct" the draft is kept and the grading call is off the critical
+path; otherwise the draft is discarded and its tokens are wasted.
+`SpeculationStats` keeps the numbers needed to judge that trade-off.
+"""
+
+import threading
+
+
+class SpeculationStats:
+    """Thread-safe counters of accepted and discarded speculative drafts."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.accepted = 0
+        self.discarded = {"indirect": 0, "miss": 0}
+        self.latency_saved_s = 0.0
+        self.wasted_tokens = 0
+        self.accepted_tokens = 0
+
+    def record_accepted(self, grade_s: float, draft_s: float, tokens: int) -> None:
+        """A kept draft saves the shorter of the two calls (they ran side by side)."""
+        with self._lock:
+            self.accepted += 1
+            self.latency_saved_s += min(grade_s, draft_s)
+            self.accepted_tokens += tokens
+
+    def record_discarded(self, status: str) -> None:
+        with self._lock:
+            self.discarded[status] = self.discarded.get(status, 0) + 1
+
+    def record_wasted_tokens(self, tokens: int) -> None:
+        """Tokens of a discarded draft, reported when the draft call finishes."""
+        with self._lock:
+            self.wasted_tokens += tokens
+
+    def stats(self) -> dict:
+        with self._lock:
+            discarded = sum(self.discarded.values())
+            runs = self.accepted + discarded
+            return {
+                "runs": runs,
+                "accepted": self.accepted,
+                "discarded": dict(self.discarded),
+                "acceptance_rate": self.accepted / runs if runs else 0.0,
+                "latency_saved_s": round(self.latency_saved_s, 3),
+                "mean_latency_saved_s": round(self.latency_saved_s / self.accepted, 3) if self.accepted else 0.0,
+                "wasted_tokens": self.wasted_tokens,
+                "wasted_token_share": (
+                    self.wasted_tokens / (self.wasted_tokens + self.accepted_tokens)
+                    if self.wasted_tokens + self.accepted_tokens else 0.0
+                ),
+            }
@@ -1,12 +1,17 @@
 """Chainlit frontend with dynamic agent selection via ChatProfiles."""
 
+import logging
 import os
+from functools import cache
 
 import chainlit as cl
 from chainlit.data.sql_alchemy import SQLAlchemyDataLayer
 
+from src.agents.runtime import runtime_config
+from src.instrumentation import serve_metrics
 from src.frontend.settings import AGENTS, AGENT_NAMES, DEFAULT_AGENT
 
+logger = logging.getLogger(__name__)
 
 # --- Data layer for chat history persistence ---
 
@@ -19,6 +24,19 @@ def get_data_layer():
     return SQLAlchemyDataLayer(conninfo=conninfo)
 
 
+# --- Metrics of the agent graphs: /metrics (Prometheus) and /metrics.json ---
+# Opt-in: served only when METRICS_PORT is set, on loopback unless METRICS_HOST
+# widens it (the endpoint has no authentication)
+
+if os.environ.get("METRICS_PORT"):
+    metrics_host = os.environ.get("METRICS_HOST", "127.0.0.1")
+    metrics_port = int(os.environ["METRICS_PORT"])
+    try:
+        serve_metrics(port=metrics_port, host=metrics_host)
+    except OSError as e:
+        logger.error("Could not serve metrics on %s:%d: %r", metrics_host, metrics_port, e)
+
+
 # --- Auto-authenticate every request (no login screen) ---
 
 @cl.header_auth_callback
@@ -38,29 +56,26 @@ async def chat_profiles():
     ]
 
 
-def _build_agent(agent_name: str, settings: dict):
-    """Build agent with current settings (k, top_n passed as constructor args)."""
-    config = AGENTS[agent_name]
-    kwargs = {}
-    if "k" in settings:
-        kwargs["k"] = int(settings["k"])
-    if "top_n" in settings:
-        kwargs["top_n"] = int(settings["top_n"])
-    return config["class"](**kwargs)
+@cache
+def _get_agent(agent_name: str):
+    """One agent (and compiled graph) per agent type, shared by all sessions.
+
+    Session settings such as k and top_n are passed per run through the
+    graph config instead (see src/agents/runtime.py).
+    """
+    return AGENTS[agent_name]["class"]()
 
 
 @cl.on_chat_start
 async def on_chat_start():
-    """Initialize the selected agent and present its settings."""
+    """Select the agent for this session and present its settings."""
     agent_name = cl.user_session.get("chat_profile") or DEFAULT_AGENT
 
     settings = await cl.ChatSettings(AGENTS[agent_name]["build_widgets"]()).send()
     for key, value in settings.items():
         cl.user_session.set(key, value)
 
-    agent = _build_agent(agent_name, settings)
     cl.user_session.set("agent_name", agent_name)
-    cl.user_session.set("agent", agent)
 
     await cl.Message(content=f"**{agent_name}** agent ready.").send()
 
@@ -69,38 +84,59 @@ async def on_chat_start():
 async def on_chat_resume(thread):
     """Restore the agent when reopening an old chat."""
     agent_name = thread.get("metadata", {}).get("agent_name", DEFAULT_AGENT)
-    config = AGENTS.get(agent_name, AGENTS[DEFAULT_AGENT])
-    agent = config["class"]()
-
+    if agent_name not in AGENTS:
+        agent_name = DEFAULT_AGENT
     cl.user_session.set("agent_name", agent_name)
-    cl.user_session.set("agent", agent)
 
 
 @cl.on_settings_update
 async def on_settings_update(settings):
-    """Store updated settings and rebuild agent if k/top_n changed."""
+    """Store updated settings; k/top_n take effect on the next message."""
     for key, value in settings.items():
         cl.user_session.set(key, value)
 
-    agent_name = cl.user_session.get("agent_name")
-    agent = _build_agent(agent_name, settings)
-    cl.user_session.set("agent", agent)
+
+def _answer_token(chunk, metadata: dict, stream_nodes: set) -> str:
+    """Text of an LLM message chunk that belongs in the answer, else ""."""
+    if metadata.get("langgraph_node") not in stream_nodes:
+        return ""
+    # Tool-calling turns (ReAct) are not part of the answer
+    if getattr(chunk, "tool_call_chunks", None) or getattr(chunk, "tool_calls", None):
+        return ""
+    return chunk.text
 
 
 @cl.on_message
 async def on_message(message: cl.Message):
-    """Stream the active agent's graph and display intermediate steps."""
-    agent = cl.user_session.get("agent")
-    config = AGENTS[cl.user_session.get("agent_name")]
+    """Stream the active agent's graph: steps per node, answer tokens as they are generated."""
+    agent_name = cl.user_session.get("agent_name")
+    agent = _get_agent(agent_name)
+    config = AGENTS[agent_name]
+    run_config = runtime_config(k=cl.user_session.get("k"), top_n=cl.user_session.get("top_n"))
 
     inputs = config["build_inputs"](message.content, cl.user_session)
     render_node = config["render_node"]
     output_key = config["output_key"]
+    stream_nodes = config["stream_nodes"]
 
     final_answer = ""
+    answer_message = None
+
+    async for mode, event in agent.graph.astream(
+        inputs, config=run_config, stream_mode=["updates", "messages"]
+    ):
+        if mode == "messages":
+            token = _answer_token(*event, stream_nodes)
+            if token:
+                if answer_message is None:
+                    answer_message = cl.Message(content="")
+                await answer_message.stream_token(token)
+            continue
 
-    async for event in agent.graph.astream(inputs, stream_mode="updates"):
         for node_name, node_output in event.items():
+            # Nodes with side effects only (e.g. store_cache) emit no update
+            if not node_output:
+                continue
             if output_key in node_output:
                 final_answer = node_output[output_key]
 
@@ -110,4 +146,9 @@ async def on_message(message: cl.Message):
                 async with cl.Step(name=label) as step:
                     step.output = text
 
-    await cl.Message(content=final_answer or "No answer generated.").send()
+    if answer_message is None:
+        # Nothing streamed (cached answer or speculative draft)
+        answer_message = cl.Message(content="")
+    # The node's output is authoritative over the streamed tokens
+    answer_message.content = final_answer or answer_message.content or "No answer generated."
+    await answer_message.send()
@@ -45,6 +45,11 @@ def _render_retriever_node(node_name, node_output):
     result = _render_route_node(node_name, node_output)
     if result:
         return result
+    if node_name == "check_cache":
+        kind = node_output.get("cache_hit")
+        if kind:
+            return ("Checking answer cache", f"Answer served from cache (**{kind}** match)")
+        return None
     if node_name == "retrieve":
         docs = node_output.get("documents", [])
         return ("Retrieving documents", f"Retrieved **{len(docs)}** documents")
@@ -56,9 +61,21 @@ def _render_retriever_node(node_name, node_output):
             source = doc.metadata.get("source", "unknown")
             lines.append(f"{i}. `{source}` (score: {score})")
         return ("Reranking documents", "\n".join(lines) or "No documents after reranking")
+    if node_name == "pack":
+        docs = node_output.get("documents", [])
+        tokens = node_output.get("context_tokens", {}).get("pack", 0)
+        return ("Packing context", f"Kept **{len(docs)}** documents (**{tokens}** tokens)")
     if node_name == "grade":
         status = node_output.get("evaluation_status", "")
-        return ("Grading relevance", f"Evaluation: **{status}**")
+        source = " (local grader)" if node_output.get("grade_source") == "local" else ""
+        drafted = " (drafted answer kept)" if node_output.get("draft_accepted") else ""
+        return ("Grading relevance", f"Evaluation: **{status}**{source}{drafted}")
+    if node_name == "expand":
+        variants = node_output.get("query_variants", [])
+        return ("Expanding query", "\n".join(f"- *{query}*" for query in variants))
+    if node_name == "fanout_retrieve":
+        docs = node_output.get("documents", [])
+        return ("Retrieving with all query variants", f"Retrieved **{len(docs)}** fused documents")
     if node_name == "rewrite":
         query = node_output.get("current_query", "")
         retries = node_output.get("retries", 0)
@@ -113,6 +130,8 @@ AGENTS = {
             "insurance_provider": session.get("provider"),
         },
         "output_key": "answer",
+        # Nodes whose LLM tokens are streamed into the answer message
+        "stream_nodes": {"generate"},
         "render_node": _render_retriever_node,
     },
     "Vergelijker": {
@@ -165,6 +184,7 @@ AGENTS = {
             ],
         },
         "output_key": "comparison",
+        "stream_nodes": {"compare"},
         "render_node": _render_comparer_node,
     },
 }
@@ -1,18 +1,30 @@
-"""Configuration for the single ReAct agent."""
+"""Configuration for the single ReAct agent.
 
-from pathlib import Path
+`reasoning_llm` and `retriever_agent` are built lazily on first access and
+shared process-wide (see src/registry.py).
+"""
 
-from langchain_openai import ChatOpenAI
+from pathlib import Path
 
+from src.agents.resources import openai_chat
 from src.agents.retriever import RetrieverAgent
 from src.config import DATA_DIR
+from src.registry import registry
+
 
+# Attribute name -> registry name
+RESOURCES = {
+    # Main reasoning LLM
+    "reasoning_llm": openai_chat("gpt-5.2", temperature=0.3),
+    # Retriever agent instance (reuses its own internal config)
+    "retriever_agent": registry.register("agent:retriever", RetrieverAgent),
+}
 
-# Main reasoning LLM
-reasoning_llm = ChatOpenAI(model="gpt-5.2", temperature=0.3)
 
-# Retriever agent instance (reuses its own internal config)
-retriever_agent = RetrieverAgent()
+def __getattr__(name: str):
+    if name in RESOURCES:
+        return registry.get(RESOURCES[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Static product description directory
 STATIC_FILES_DIR = DATA_DIR / "static_agent_files"
@@ -3,10 +3,12 @@
 from langgraph.graph import StateGraph, START, END
 from langgraph.prebuilt import ToolNode, tools_condition
 from langchain_core.messages import SystemMessage, HumanMessage
+from langchain_core.runnables import RunnableLambda
 
+from src.instrumentation import instrument
 from .state import SingleAgentState
 from .prompts import build_system_prompt
-from .config import reasoning_llm, retriever_agent, load_product_descriptions
+from . import config
 from .tools import make_retriever_tool
 
 
@@ -18,18 +20,18 @@ class SingleReActAgent:
     """
 
     def __init__(self):
-        self.llm = reasoning_llm
-        self.retriever_tool = make_retriever_tool(retriever_agent)
+        self.llm = config.reasoning_llm
+        self.retriever_tool = make_retriever_tool(config.retriever_agent)
         self.tools = [self.retriever_tool]
         self.llm_with_tools = self.llm.bind_tools(self.tools)
-        self.product_descriptions = load_product_descriptions()
+        self.product_descriptions = config.load_product_descriptions()
         self.graph = self._build_graph()
 
     def _build_graph(self):
         """Build the ReAct StateGraph: agent <-> tools loop."""
         workflow = StateGraph(SingleAgentState)
 
-        workflow.add_node("agent", self._call_model)
+        workflow.add_node("agent", RunnableLambda(self._call_model, afunc=self._acall_model))
         workflow.add_node("tools", ToolNode(self.tools))
 
         workflow.add_edge(START, "agent")
@@ -39,7 +41,7 @@ class SingleReActAgent:
         )
         workflow.add_edge("tools", "agent")
 
-        return workflow.compile()
+        return instrument(workflow.compile(), agent="react")
 
     def _call_model(self, state: SingleAgentState):
         """Invoke the LLM with system prompt + message history."""
@@ -48,6 +50,13 @@ class SingleReActAgent:
         response = self.llm_with_tools.invoke(messages)
         return {"messages": [response]}
 
+    async def _acall_model(self, state: SingleAgentState):
+        """Async variant of `_call_model`, used when the graph runs via ainvoke/astream."""
+        system_msg = SystemMessage(content=build_system_prompt(state))
+        messages = [system_msg] + state["messages"]
+        response = await self.llm_with_tools.ainvoke(messages)
+        return {"messages": [response]}
+
     def invoke(
         self,
         user_constraints: str,
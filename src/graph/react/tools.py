@@ -1,13 +1,12 @@
 """Tool wrappers for the single ReAct agent."""
 
-from langchain_core.tools import tool
+from langchain_core.tools import StructuredTool
 from src.agents.retriever import RetrieverAgent
 
 
 def make_retriever_tool(retriever_agent: RetrieverAgent):
     """Factory that wraps a RetrieverAgent as a LangChain tool."""
 
-    @tool
     def retrieve_documents(query: str, insurance_provider: str) -> str:
         """Retrieve and synthesize information about an insurance product.
 
@@ -22,23 +21,30 @@ def make_retriever_tool(retriever_agent: RetrieverAgent):
         Returns:
             Synthesized answer with supporting document excerpts.
         """
-        result = retriever_agent.invoke(query=query, insurance_provider=insurance_provider)
+        return _format_result(retriever_agent.invoke(query=query, insurance_provider=insurance_provider))
 
-        answer = result.get("answer", "") if isinstance(result, dict) else result.answer
-        documents = result.get("documents", []) if isinstance(result, dict) else result.documents
+    async def aretrieve_documents(query: str, insurance_provider: str) -> str:
+        return _format_result(await retriever_agent.ainvoke(query=query, insurance_provider=insurance_provider))
 
-        # Format top 3 document excerpts as context
-        excerpts = []
-        for doc in documents[:3]:
-            content = doc.page_content if hasattr(doc, "page_content") else str(doc)
-            excerpts.append(content[:500])
+    # The coroutine runs the agent's graph on the event loop when the ReAct graph runs async
+    return StructuredTool.from_function(func=retrieve_documents, coroutine=aretrieve_documents)
 
-        output = f"**Answer:**\n{answer}"
-        if excerpts:
-            output += "\n\n**Supporting excerpts:**\n"
-            for i, excerpt in enumerate(excerpts, 1):
-                output += f"\n[{i}] {excerpt}\n"
 
-        return output
+def _format_result(result) -> str:
+    """The agent's answer followed by the top 3 document excerpts."""
+    answer = result.get("answer", "") if isinstance(result, dict) else result.answer
+    documents = result.get("documents", []) if isinstance(result, dict) else result.documents
 
-    return retrieve_documents
+    # Format top 3 document excerpts as context
+    excerpts = []
+    for doc in documents[:3]:
+        content = doc.page_content if hasattr(doc, "page_content") else str(doc)
+        excerpts.append(content[:500])
+
+    output = f"**Answer:**\n{answer}"
+    if excerpts:
+        output += "\n\n**Supporting excerpts:**\n"
+        for i, excerpt in enumerate(excerpts, 1):
+            output += f"\n[{i}] {excerpt}\n"
+
+    return output
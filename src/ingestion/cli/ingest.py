@@ -15,8 +15,20 @@ Usage:
     # Filter by document pattern
     python -m src.ingestion.cli.ingest --pattern "webpage_*.md"
 
+    # Ingest into a reduced-dimension (Matryoshka) collection
+    python -m src.ingestion.cli.ingest run --dimension 1024
+
     # Inspect collection
     python -m src.ingestion.cli.ingest --inspect
+
+    # Add payload indexes to an existing collection
+    python -m src.ingestion.cli.ingest create-indexes
+
+    # Apply the configured quantization to an existing collection
+    python -m src.ingestion.cli.ingest quantize --config config/quantized.yaml
+
+    # Export the collection for the local (in-process) retrieval backend
+    python -m src.ingestion.cli.ingest export-snapshot
 """
 
 import click
@@ -49,15 +61,24 @@ def cli():
     type=str,
     help="Glob pattern to filter documents (e.g., 'webpage_*.md')"
 )
-def run(config: str, insurance: str, pattern: str):
+@click.option(
+    "--dimension",
+    type=int,
+    help="Override the embedding dimension (e.g., 1024); reduced sizes get their own collection"
+)
+def run(config: str, insurance: str, pattern: str, dimension: int):
     """
     Run the ingestion pipeline.
 
     Loads, chunks, embeds, and indexes documents into Qdrant.
     """
     try:
+        settings = load_settings(config)
+        if dimension:
+            settings.embedding.dimension = dimension
+
         # Initialize pipeline
-        pipeline = IngestionPipeline(config_file=config)
+        pipeline = IngestionPipeline(settings=settings)
 
         # Run pipeline
         result = pipeline.run(
@@ -119,6 +140,7 @@ def inspect(config: str):
             click.echo(f"Points count: {info.get('points_count')}")
             click.echo(f"Vectors count: {info.get('vectors_count')}")
             click.echo(f"Indexed vectors: {info.get('indexed_vectors_count')}")
+            click.echo(f"Payload indexes: {', '.join(info.get('payload_indexes', [])) or 'none'}")
             click.echo(f"Status: {info.get('status')}")
 
         click.echo("=" * 60)
@@ -132,6 +154,7 @@ def inspect(config: str):
         click.echo(f"Chunking strategy: {settings.chunking.strategy}")
         click.echo(f"Max chunk size: {settings.chunking.max_chunk_size}")
         click.echo(f"Use sparse vectors: {settings.collection.use_sparse}")
+        click.echo(f"Quantization: {settings.collection.quantization}")
         click.echo("=" * 60 + "\n")
 
     except Exception as e:
@@ -141,6 +164,134 @@ def inspect(config: str):
         exit(1)
 
 
+@cli.command("create-indexes")
+@click.option(
+    "--config",
+    type=click.Path(exists=True),
+    help="Path to YAML config file"
+)
+def create_indexes(config: str):
+    """
+    Add keyword payload indexes to an existing collection.
+
+    Migration for collections created before payload indexes were added
+    at creation time. Already indexed fields are skipped.
+    """
+    try:
+        settings = load_settings(config)
+
+        embeddings = EmbedderFactory.create(settings.embedding)
+        embedding_dim = EmbedderFactory.get_embedding_dimension(settings.embedding)
+        collection_name = settings.get_collection_name()
+
+        indexer = QdrantIndexer(
+            embeddings=embeddings,
+            collection_settings=settings.collection,
+            collection_name=collection_name,
+            embedding_dimension=embedding_dim,
+            enable_deduplication=False
+        )
+
+        click.echo(f"\nCreating payload indexes on '{collection_name}'...")
+        created = indexer.ensure_payload_indexes()
+
+        if created:
+            click.echo(f"✅ Created {len(created)} payload index(es)")
+        else:
+            click.echo("✅ All payload indexes already exist")
+
+    except Exception as e:
+        click.echo(f"❌ Error: {e}", err=True)
+        import traceback
+        traceback.print_exc()
+        exit(1)
+
+
+@cli.command()
+@click.option(
+    "--config",
+    type=click.Path(exists=True),
+    help="Path to YAML config file"
+)
+def quantize(config: str):
+    """
+    Apply the configured quantization to an existing collection.
+
+    Uses collection.quantization ("scalar", "binary" or "none") and
+    collection.vectors_on_disk from the settings.
+    """
+    try:
+        settings = load_settings(config)
+
+        embeddings = EmbedderFactory.create(settings.embedding)
+        embedding_dim = EmbedderFactory.get_embedding_dimension(settings.embedding)
+        collection_name = settings.get_collection_name()
+
+        indexer = QdrantIndexer(
+            embeddings=embeddings,
+            collection_settings=settings.collection,
+            collection_name=collection_name,
+            embedding_dimension=embedding_dim,
+            enable_deduplication=False
+        )
+
+        click.echo(f"\nApplying '{settings.collection.quantization}' quantization to '{collection_name}'...")
+        indexer.apply_quantization()
+        click.echo("✅ Quantization config updated (Qdrant re-optimizes in the background)")
+
+    except Exception as e:
+        click.echo(f"❌ Error: {e}", err=True)
+        import traceback
+        traceback.print_exc()
+        exit(1)
+
+
+@cli.command("export-snapshot")
+@click.option(
+    "--config",
+    type=click.Path(exists=True),
+    help="Path to YAML config file"
+)
+@click.option(
+    "--output",
+    type=click.Path(),
+    help="Snapshot file (defaults to the local backend's LOCAL_SNAPSHOT_PATH)"
+)
+def export_snapshot(config: str, output: str):
+    """
+    Export the collection to a snapshot for the local retrieval backend.
+
+    Writes all chunk vectors and payloads to a compressed .npz file that
+    InsuranceRetriever loads when RETRIEVAL_BACKEND=local.
+    """
+    try:
+        from qdrant_client import QdrantClient
+        from src.config import QDRANT_HOST, DATA_DIR
+        from src.retrieval.local_engine import LocalVectorEngine
+
+        settings = load_settings(config)
+        collection_name = settings.get_collection_name()
+        output_path = Path(output) if output else DATA_DIR / "snapshots" / f"{collection_name}.npz"
+
+        click.echo(f"\nExporting '{collection_name}' from Qdrant...")
+        engine = LocalVectorEngine.from_qdrant(
+            QdrantClient(url=QDRANT_HOST),
+            collection_name,
+            dense_vector_name=settings.collection.dense_vector_name,
+            sparse_vector_name=settings.collection.sparse_vector_name,
+        )
+        engine.save_snapshot(output_path)
+
+        size_mb = output_path.stat().st_size / 1024 / 1024
+        click.echo(f"✅ Exported {len(engine)} chunks to {output_path} ({size_mb:.1f} MB)")
+
+    except Exception as e:
+        click.echo(f"❌ Error: {e}", err=True)
+        import traceback
+        traceback.print_exc()
+        exit(1)
+
+
 @cli.command()
 def validate():
     """
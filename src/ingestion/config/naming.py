@@ -0,0 +1,39 @@
+"""
+Collection naming shared by ingestion and retrieval.
+
+Free of client imports: the retriever config, which the agents import at
+startup, names its collection with the same function as the ingestion
+pipeline.
+"""
+
+from typing import Optional
+
+# Native output size of models trained with Matryoshka representation learning.
+# These accept a `dimensions` parameter that returns a shortened, re-normalized
+# embedding, so one model can serve several (cheaper) collection sizes.
+MATRYOSHKA_MODEL_DIMENSIONS = {
+    "text-embedding-3-large": 3072,
+    "text-embedding-3-small": 1536,
+}
+
+
+def collection_name(base_name: str, model_name: str, reduced_dimension: Optional[int] = None) -> str:
+    """
+    Name of the collection holding one embedding model's vectors.
+
+    Args:
+        base_name: Collection base name, e.g. "insurance_docs".
+        model_name: Embedding model as configured, e.g. "text-embedding-3-large"
+            or "openai/text-embedding-3-large" (OpenRouter).
+        reduced_dimension: Matryoshka dimension below the model's native size.
+
+    Returns:
+        {base_name}_{sanitized_model_name}, with a `_{dimension}d` suffix for
+        reduced-dimension collections
+    """
+    model = model_name.replace("/", "_").replace(":", "_").replace(".", "_")
+    name = f"{base_name}_{model}"
+    # Reduced-dimension vectors can't share a collection with full-size ones
+    if reduced_dimension is not None:
+        name = f"{name}_{reduced_dimension}d"
+    return name
@@ -10,6 +10,8 @@ from typing import Literal, Optional
 from pydantic import BaseModel, Field
 from qdrant_client.models import Distance
 
+from .naming import MATRYOSHKA_MODEL_DIMENSIONS, collection_name
+
 
 class EmbeddingSettings(BaseModel):
     """Embedding model configuration (non-sensitive)"""
@@ -23,6 +25,31 @@ class EmbeddingSettings(BaseModel):
     # OpenRouter settings
     openrouter_base_url: str = "https://openrouter.ai/api/v1"
 
+    def get_native_dimension(self) -> Optional[int]:
+        """Full output size of a Matryoshka model, or None for other models."""
+        # OpenRouter names carry a provider prefix ("openai/text-embedding-3-large")
+        return MATRYOSHKA_MODEL_DIMENSIONS.get(self.model_name.split("/")[-1])
+
+    def get_reduced_dimension(self) -> Optional[int]:
+        """
+        Get the `dimensions` value to request from the embedding API.
+
+        Returns:
+            The configured dimension if it shortens a Matryoshka model's
+            output, otherwise None (use the model's native size)
+
+        Raises:
+            ValueError: If the dimension exceeds the model's native size
+        """
+        native = self.get_native_dimension()
+        if native is None or self.dimension == native:
+            return None
+        if self.dimension > native:
+            raise ValueError(
+                f"Dimension {self.dimension} exceeds the native size ({native}) of {self.model_name}"
+            )
+        return self.dimension
+
 
 class ChunkingSettings(BaseModel):
     """Text chunking configuration"""
@@ -58,6 +85,24 @@ class CollectionSettings(BaseModel):
     dense_vector_name: str = "dense"
     sparse_vector_name: str = "sparse"
 
+    # Dense vector quantization: "scalar" (int8, ~4x smaller) or "binary" (~32x smaller).
+    # Quantized vectors stay in RAM; originals can move to disk for rescoring.
+    quantization: Literal["none", "scalar", "binary"] = "none"
+    quantization_always_ram: bool = True
+    scalar_quantile: float = 0.99
+    vectors_on_disk: bool = False
+
+    # Query-time rescoring/oversampling is configured on the retriever side
+    # (QUANTIZATION_RESCORE / QUANTIZATION_OVERSAMPLING in src/retrieval/config.py)
+
+    # Keyword payload indexes (retrieval filters on provider, dedup on document_id)
+    payload_index_fields: list[str] = Field(
+        default=[
+            "metadata.insurance_provider",
+            "metadata.document_id",
+        ]
+    )
+
 
 class IngestionSettings(BaseModel):
     """Main ingestion pipeline configuration"""
@@ -82,11 +127,14 @@ class IngestionSettings(BaseModel):
         Get the collection name, auto-generated from model settings.
 
         Returns:
-            Collection name: {base_name}_{sanitized_model_name}
+            Collection name: {base_name}_{sanitized_model_name}, with a
+            `_{dimension}d` suffix for reduced-dimension collections
         """
-        # Sanitize model name for collection name
-        model = self.embedding.model_name.replace("/", "_").replace(":", "_").replace(".", "_")
-        return f"{self.collection.base_name}_{model}"
+        return collection_name(
+            self.collection.base_name,
+            self.embedding.model_name,
+            self.embedding.get_reduced_dimension(),
+        )
 
 
 def load_settings(config_file: Optional[str] = None) -> IngestionSettings:
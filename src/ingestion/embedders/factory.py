@@ -57,7 +57,8 @@ class EmbedderFactory:
         return OpenAIEmbeddings(
             model=settings.model_name,
             openai_api_key=SecretStr(key),
-            openai_api_base=settings.openrouter_base_url
+            openai_api_base=settings.openrouter_base_url,
+            dimensions=settings.get_reduced_dimension()
         )
 
     @staticmethod
@@ -69,7 +70,8 @@ class EmbedderFactory:
 
         return OpenAIEmbeddings(
             model=settings.model_name,
-            api_key=SecretStr(key)
+            api_key=SecretStr(key),
+            dimensions=settings.get_reduced_dimension()
         )
 
     @staticmethod
@@ -7,7 +7,23 @@ from langchain_core.embeddings import Embeddings
 from langchain_qdrant import QdrantVectorStore, FastEmbedSparse, RetrievalMode
 from qdrant_client import QdrantClient
 from qdrant_client.http import models
-from qdrant_client.http.models import Distance, VectorParams, Filter, FieldCondition, MatchValue, PointIdsList, SparseVectorParams
+from qdrant_client.http.models import (
+    Distance,
+    VectorParams,
+    Filter,
+    FieldCondition,
+    MatchValue,
+    PointIdsList,
+    SparseVectorParams,
+    PayloadSchemaType,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+    BinaryQuantization,
+    BinaryQuantizationConfig,
+    QuantizationConfig,
+    VectorParamsDiff,
+)
 
 from src.ingestion.chunkers.base import Chunk
 from src.ingestion.config.settings import CollectionSettings
@@ -77,7 +93,8 @@ class QdrantIndexer:
                     vectors_config={
                         self.collection_settings.dense_vector_name: VectorParams(
                             size=self.embedding_dimension,
-                            distance=self.collection_settings.distance_metric
+                            distance=self.collection_settings.distance_metric,
+                            on_disk=self.collection_settings.vectors_on_disk,
                         )
                     },
                     sparse_vectors_config={
@@ -85,6 +102,7 @@ class QdrantIndexer:
                             index=models.SparseIndexParams(on_disk=False)
                         )
                     },
+                    quantization_config=self.build_quantization_config(self.collection_settings),
                 )
             else:
                 # Dense only
@@ -93,14 +111,99 @@ class QdrantIndexer:
                     collection_name=collection_name,
                     vectors_config=VectorParams(
                         size=self.embedding_dimension,
-                        distance=self.collection_settings.distance_metric
-                    )
+                        distance=self.collection_settings.distance_metric,
+                        on_disk=self.collection_settings.vectors_on_disk,
+                    ),
+                    quantization_config=self.build_quantization_config(self.collection_settings),
                 )
 
+            self.ensure_payload_indexes()
+
+            if self.collection_settings.quantization != "none":
+                print(f"  → Dense vectors quantized ({self.collection_settings.quantization})")
+
             print(f"✅ Collection '{collection_name}' created successfully")
         else:
             print(f"✅ Collection '{collection_name}' already exists")
 
+    @staticmethod
+    def build_quantization_config(settings: CollectionSettings) -> QuantizationConfig | None:
+        """
+        Build the Qdrant quantization config from collection settings.
+
+        Args:
+            settings: Collection configuration
+
+        Returns:
+            Scalar (int8) or binary quantization config, or None if disabled
+        """
+        if settings.quantization == "scalar":
+            return ScalarQuantization(
+                scalar=ScalarQuantizationConfig(
+                    type=ScalarType.INT8,
+                    quantile=settings.scalar_quantile,
+                    always_ram=settings.quantization_always_ram,
+                )
+            )
+        if settings.quantization == "binary":
+            return BinaryQuantization(
+                binary=BinaryQuantizationConfig(
+                    always_ram=settings.quantization_always_ram,
+                )
+            )
+        return None
+
+    def apply_quantization(self) -> None:
+        """
+        Apply the configured quantization to an existing collection.
+
+        Qdrant builds the quantized vectors in the background; originals are
+        moved to disk if `vectors_on_disk` is set.
+        """
+        quantization_config = self.build_quantization_config(self.collection_settings)
+        if quantization_config is None:
+            # Explicitly remove quantization from the collection
+            quantization_config = models.Disabled.DISABLED
+
+        # Dense-only collections use the unnamed ("") vector
+        dense_name = self.collection_settings.dense_vector_name if self.collection_settings.use_sparse else ""
+        vectors_config = {
+            dense_name: VectorParamsDiff(on_disk=self.collection_settings.vectors_on_disk)
+        }
+
+        self.client.update_collection(
+            collection_name=self.collection_name,
+            quantization_config=quantization_config,
+            vectors_config=vectors_config,
+        )
+
+    def ensure_payload_indexes(self) -> List[str]:
+        """
+        Create keyword payload indexes for the configured metadata fields.
+
+        Safe to run against existing collections: fields that are already
+        indexed are skipped.
+
+        Returns:
+            List of field names for which an index was created
+        """
+        existing = self.client.get_collection(self.collection_name).payload_schema or {}
+
+        created = []
+        for field_name in self.collection_settings.payload_index_fields:
+            if field_name in existing:
+                continue
+            self.client.create_payload_index(
+                collection_name=self.collection_name,
+                field_name=field_name,
+                field_schema=PayloadSchemaType.KEYWORD,
+                wait=True,
+            )
+            print(f"  → Created keyword payload index on '{field_name}'")
+            created.append(field_name)
+
+        return created
+
     def delete_by_document_id(self, document_id: str) -> int:
         """
         Delete all chunks for a specific document.
@@ -246,6 +349,7 @@ class QdrantIndexer:
                 "points_count": info.points_count,
                 "vectors_count": info.vectors_count,
                 "indexed_vectors_count": info.indexed_vectors_count,
+                "payload_indexes": sorted((info.payload_schema or {}).keys()),
                 "status": info.status,
             }
         except Exception as e:
@@ -12,6 +12,7 @@ from src.ingestion.chunkers.base import Chunk
 from src.ingestion.chunkers.hybrid import HybridChunker
 from src.ingestion.embedders.factory import EmbedderFactory
 from src.ingestion.indexers.qdrant_indexer import QdrantIndexer
+from src.retrieval.collection_version import CollectionVersionStore
 
 
 class IngestionPipeline:
@@ -127,6 +128,10 @@ class IngestionPipeline:
         print("\n[4/4] Indexing to Qdrant...")
         vector_store = self.indexer.index_chunks(all_chunks)
 
+        # Invalidate retrieval caches keyed on the previous collection version
+        version = CollectionVersionStore(self.indexer.client).bump(self.settings.get_collection_name())
+        print(f"✅ Collection version bumped to {version}")
+
         # Get collection info
         collection_info = self.indexer.get_collection_info()
 
@@ -143,6 +148,7 @@ class IngestionPipeline:
             "documents_processed": len(documents),
             "chunks_created": len(all_chunks),
             "collection_name": self.settings.get_collection_name(),
+            "collection_version": version,
             "collection_info": collection_info
         }
 
@@ -0,0 +1,348 @@
+"""Per-process latency, token and retry metrics for the agent graphs.
+
+`InstrumentationHandler` is a LangChain callback handler attached to each
+agent graph (see `instrument`). It times every graph node and every LLM call
+and counts LLM tokens. The retriever and reranker time their own external
+calls (embedding, search, rerank) with `timed` and report HTTP retries with
+`record_retry`; the graph node a call belongs to is read from LangGraph's run
+config.
+
+Everything lands in the process-wide `metrics` registry of histograms and
+counters, exported as Prometheus text (`metrics.to_prometheus()`) or JSON
+(`metrics.to_json()`). The Chainlit app serves both; `serve_metrics` does the
+same for other processes, and scripts/dump_metrics.py prints them.
+"""
+
+import bisect
+import json
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Iterator, Optional
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+
+# Label value for calls made outside a LangGraph run
+OUTSIDE_GRAPH = "-"
+
+# Seconds; upper bounds of the latency histogram buckets (+Inf is implicit)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Nodes that start another retrieval round after a miss
+RETRY_NODES = ("rewrite", "expand")
+
+METRIC_HELP = {
+    "node_duration_seconds": ("histogram", "Wall time per graph node"),
+    "call_duration_seconds": ("histogram", "Wall time per external call (embedding, search, rerank, llm)"),
+    "llm_tokens_total": ("counter", "LLM tokens by direction (input/output)"),
+    "retries_total": ("counter", "Retried external calls and query retry rounds"),
+    "errors_total": ("counter", "Failed graph nodes and external calls"),
+}
+PREFIX = "advies_"
+
+
+class Histogram:
+    """Cumulative-bucket histogram with count and sum."""
+
+    def __init__(self, buckets: tuple = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-quantile (inf past the last bucket)."""
+        rank, seen = q * self.count, 0
+        for bound, count in zip((*self.buckets, float("inf")), self.counts):
+            seen += count
+            if seen >= rank and count:
+                return bound
+        return 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "mean": round(self.sum / self.count, 6) if self.count else 0.0,
+            "p50_le": self.quantile(0.5),
+            "p95_le": self.quantile(0.95),
+            "buckets": {str(bound): count for bound, count in zip((*self.buckets, "+Inf"), self.counts)},
+        }
+
+
+class MetricsRegistry:
+    """Thread-safe labelled histograms and counters."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms: dict[tuple, Histogram] = {}
+        self._counters: dict[tuple, float] = {}
+
+    @staticmethod
+    def _key(name: str, labels: dict) -> tuple:
+        return name, tuple(sorted(labels.items()))
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        with self._lock:
+            key = self._key(name, labels)
+            if key not in self._histograms:
+                self._histograms[key] = Histogram()
+            self._histograms[key].observe(value)
+
+    def inc(self, name: str, amount: float = 1, **labels: str) -> None:
+        with self._lock:
+            key = self._key(name, labels)
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+    def to_json(self) -> dict:
+        """{"histograms": [...], "counters": [...]}, one entry per label set."""
+        with self._lock:
+            return {
+                "histograms": [
+                    {"name": name, "labels": dict(labels), **histogram.to_dict()}
+                    for (name, labels), histogram in sorted(self._histograms.items())
+                ],
+                "counters": [
+                    {"name": name, "labels": dict(labels), "value": value}
+                    for (name, labels), value in sorted(self._counters.items())
+                ],
+            }
+
+    def to_prometheus(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        lines, described = [], set()
+
+        def describe(name: str) -> None:
+            if name not in described:
+                kind, text = METRIC_HELP.get(name, ("untyped", name))
+                lines.append(f"# HELP {PREFIX}{name} {text}")
+                lines.append(f"# TYPE {PREFIX}{name} {kind}")
+                described.add(name)
+
+        with self._lock:
+            for (name, labels), histogram in sorted(self._histograms.items()):
+                describe(name)
+                cumulative = 0
+                for bound, count in zip((*histogram.buckets, "+Inf"), histogram.counts):
+                    cumulative += count
+                    lines.append(f"{PREFIX}{name}_bucket{_labels(labels, le=bound)} {cumulative}")
+                lines.append(f"{PREFIX}{name}_sum{_labels(labels)} {histogram.sum}")
+                lines.append(f"{PREFIX}{name}_count{_labels(labels)} {histogram.count}")
+            for (name, labels), value in sorted(self._counters.items()):
+                describe(name)
+                lines.append(f"{PREFIX}{name}{_labels(labels)} {value}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels: tuple, **extra) -> str:
+    pairs = [*labels, *extra.items()]
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in pairs) + "}"
+
+
+metrics = MetricsRegistry()
+
+
+# --- External calls (retriever, reranker) ---
+
+
+def current_labels() -> dict:
+    """Agent and node of the graph run this call belongs to."""
+    try:
+        from langgraph.config import get_config
+        metadata = get_config().get("metadata", {})
+    except RuntimeError:
+        # Not called from inside a graph node
+        return {"agent": OUTSIDE_GRAPH, "node": OUTSIDE_GRAPH}
+    return {
+        "agent": metadata.get("agent", OUTSIDE_GRAPH),
+        "node": metadata.get("langgraph_node", OUTSIDE_GRAPH),
+    }
+
+
+@contextmanager
+def timed(call: str) -> Iterator[None]:
+    """Time an external call ("embedding", "search", "rerank") in the current node."""
+    labels = current_labels()
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        metrics.inc("errors_total", call=call, **labels)
+        raise
+    finally:
+        metrics.observe("call_duration_seconds", time.perf_counter() - start, call=call, **labels)
+
+
+def record_retry(call: str) -> None:
+    """Count one retried external call."""
+    metrics.inc("retries_total", call=call, **current_labels())
+
+
+# --- Graph nodes and LLM calls ---
+
+
+class InstrumentationHandler(BaseCallbackHandler):
+    """Times graph nodes and LLM calls, and counts LLM tokens, into `metrics`."""
+
+    # Only takes timestamps: cheap enough to run on the event loop
+    run_inline = True
+
+    def __init__(self, registry: MetricsRegistry = metrics):
+        self.registry = registry
+        self._lock = threading.Lock()
+        self._runs: dict[UUID, tuple[float, dict]] = {}
+
+    def _start(self, run_id: UUID, labels: dict) -> None:
+        with self._lock:
+            self._runs[run_id] = (time.perf_counter(), labels)
+
+    def _finish(self, run_id: UUID) -> Optional[tuple[float, dict]]:
+        with self._lock:
+            started = self._runs.pop(run_id, None)
+        if started is None:
+            return None
+        return time.perf_counter() - started[0], started[1]
+
+    def on_chain_start(
+        self,
+        serialized: dict,
+        inputs: Any,
+        *,
+        run_id: UUID,
+        tags: Optional[list[str]] = None,
+        metadata: Optional[dict] = None,
+        **kwargs: Any,
+    ) -> None:
+        metadata = metadata or {}
+        node = metadata.get("langgraph_node")
+        # Node runs are tagged "graph:step:N"; runnables inside a node inherit its metadata but not the tag
+        if node is None or kwargs.get("name") != node or not any(t.startswith("graph:step:") for t in tags or ()):
+            return
+        agent = metadata.get("agent", OUTSIDE_GRAPH)
+        self._start(run_id, {"agent": agent, "node": node})
+        if node in RETRY_NODES:
+            self.registry.inc("retries_total", call="query", agent=agent, node=node)
+
+    def on_chain_end(self, outputs: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        finished = self._finish(run_id)
+        if finished:
+            self.registry.observe("node_duration_seconds", finished[0], **finished[1])
+
+    def on_chain_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        finished = self._finish(run_id)
+        if finished:
+            self.registry.observe("node_duration_seconds", finished[0], **finished[1])
+            self.registry.inc("errors_total", call="node", **finished[1])
+
+    def _on_model_start(self, run_id: UUID, metadata: Optional[dict]) -> None:
+        metadata = metadata or {}
+        self._start(run_id, {
+            "agent": metadata.get("agent", OUTSIDE_GRAPH),
+            "node": metadata.get("langgraph_node", OUTSIDE_GRAPH),
+            "model": metadata.get("ls_model_name", "unknown"),
+        })
+
+    def on_chat_model_start(self, serialized, messages, *, run_id: UUID, metadata=None, **kwargs: Any) -> None:
+        self._on_model_start(run_id, metadata)
+
+    def on_llm_start(self, serialized, prompts, *, run_id: UUID, metadata=None, **kwargs: Any) -> None:
+        self._on_model_start(run_id, metadata)
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        finished = self._finish(run_id)
+        if not finished:
+            return
+        seconds, labels = finished
+        self.registry.observe("call_duration_seconds", seconds, call="llm", **labels)
+        input_tokens, output_tokens = _token_usage(response)
+        if input_tokens:
+            self.registry.inc("llm_tokens_total", input_tokens, direction="input", **labels)
+        if output_tokens:
+            self.registry.inc("llm_tokens_total", output_tokens, direction="output", **labels)
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        finished = self._finish(run_id)
+        if finished:
+            self.registry.observe("call_duration_seconds", finished[0], call="llm", **finished[1])
+            self.registry.inc("errors_total", call="llm", **finished[1])
+
+    def on_retry(self, retry_state: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        with self._lock:
+            started = self._runs.get(run_id)
+        labels = started[1] if started else {"agent": OUTSIDE_GRAPH, "node": OUTSIDE_GRAPH}
+        self.registry.inc("retries_total", call="llm", agent=labels["agent"], node=labels["node"])
+
+
+def _token_usage(response: LLMResult) -> tuple[int, int]:
+    """(input, output) tokens from the messages' usage_metadata, else the provider's llm_output."""
+    input_tokens = output_tokens = 0
+    for generations in response.generations:
+        for generation in generations:
+            usage = getattr(getattr(generation, "message", None), "usage_metadata", None) or {}
+            input_tokens += usage.get("input_tokens", 0)
+            output_tokens += usage.get("output_tokens", 0)
+    if not (input_tokens or output_tokens):
+        usage = (response.llm_output or {}).get("token_usage") or {}
+        input_tokens = usage.get("prompt_tokens", 0)
+        output_tokens = usage.get("completion_tokens", 0)
+    return input_tokens, output_tokens
+
+
+handler = InstrumentationHandler()
+
+
+def instrument(graph, agent: str):
+    """The compiled graph with the shared handler attached and runs labelled with `agent`."""
+    return graph.with_config(callbacks=[handler], metadata={"agent": agent})
+
+
+# --- Export ---
+
+
+def serve_metrics(port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """Serve /metrics (Prometheus) and /metrics.json from a daemon thread.
+
+    There is no authentication, so the default only listens on loopback.
+    """
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path == "/metrics":
+                body, content_type = metrics.to_prometheus(), "text/plain; version=0.0.4"
+            elif self.path == "/metrics.json":
+                body, content_type = json.dumps(metrics.to_json()), "application/json"
+            else:
+                self.send_error(404)
+                return
+            payload = body.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True, name="metrics-server").start()
+    return server
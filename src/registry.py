@@ -0,0 +1,79 @@
+"""Process-wide registry of lazily built shared resources.
+
+Modules register a factory under a name at import time, which costs nothing.
+The resource (retriever, reranker, chat model client, ...) is built on the
+first `get` and shared by every later caller in the process. Names that
+encode the full configuration (e.g. "llm:openai:gpt-5-mini:0") let
+different modules share one client when they ask for the same model.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+
+class LazyRegistry:
+    """Thread-safe name -> factory registry that builds each resource once."""
+
+    def __init__(self):
+        self._factories: dict[str, Callable[[], Any]] = {}
+        self._instances: dict[str, Any] = {}
+        self._build_seconds: dict[str, float] = {}
+        self._lock = threading.RLock()
+
+    def register(self, name: str, factory: Callable[[], Any]) -> str:
+        """
+        Register a factory, unless `name` is already registered.
+
+        The first registration wins, so use names that identify the
+        configuration when several modules register the same resource.
+
+        Returns:
+            The name, for use in module-level lookup tables.
+        """
+        with self._lock:
+            self._factories.setdefault(name, factory)
+        return name
+
+    def get(self, name: str) -> Any:
+        """Return the shared resource, building it on first use."""
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+
+        with self._lock:
+            if name in self._instances:
+                return self._instances[name]
+            if name not in self._factories:
+                raise KeyError(f"No resource registered as '{name}'")
+
+            start = time.perf_counter()
+            instance = self._factories[name]()
+            self._build_seconds[name] = time.perf_counter() - start
+            self._instances[name] = instance
+            logger.info("Built shared resource '%s' in %.2fs", name, self._build_seconds[name])
+            return instance
+
+    def is_built(self, name: str) -> bool:
+        return name in self._instances
+
+    def built(self) -> dict[str, float]:
+        """Names of the resources built so far with their build time in seconds."""
+        with self._lock:
+            return dict(self._build_seconds)
+
+    def reset(self, name: str | None = None) -> None:
+        """Drop one built resource (or all), so the next `get` rebuilds it."""
+        with self._lock:
+            if name is None:
+                self._instances.clear()
+                self._build_seconds.clear()
+            else:
+                self._instances.pop(name, None)
+                self._build_seconds.pop(name, None)
+
+
+registry = LazyRegistry()
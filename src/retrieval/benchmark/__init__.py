@@ -0,0 +1,19 @@
+"""Retrieval benchmark: golden query sets, metrics and the benchmark runner."""
+
+from .golden import GoldenQuery, GoldenSet, RelevantChunk, load_golden_set
+from .metrics import recall_at_k, reciprocal_rank, latency_percentiles, spearman_correlation, top_n_overlap
+from .runner import run_benchmark, summary_rows
+
+__all__ = [
+    "GoldenQuery",
+    "GoldenSet",
+    "RelevantChunk",
+    "load_golden_set",
+    "recall_at_k",
+    "reciprocal_rank",
+    "latency_percentiles",
+    "spearman_correlation",
+    "top_n_overlap",
+    "run_benchmark",
+    "summary_rows",
+]
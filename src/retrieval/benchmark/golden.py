@@ -0,0 +1,72 @@
+"""Versioned golden query sets for the retrieval benchmark.
+
+Relevance is judged on stable content rather than point ids (which change on
+every re-ingest): a retrieved chunk is relevant to a judgment when it comes
+from the judgment's document and its text contains the judgment's snippet.
+"""
+
+import json
+import re
+from pathlib import Path
+from typing import Optional
+
+from langchain_core.documents import Document
+from pydantic import BaseModel, Field
+
+
+def _normalize(text: str) -> str:
+    # Markdown emphasis and line wrapping differ between source files and chunks
+    return re.sub(r"\s+", " ", text.replace("*", "")).strip().casefold()
+
+
+class RelevantChunk(BaseModel):
+    """One relevance judgment: a document plus a snippet its chunk must contain."""
+
+    document_name: str
+    contains: Optional[str] = None
+
+    def matches(self, doc: Document) -> bool:
+        if doc.metadata.get("document_name") != self.document_name:
+            return False
+        return self.contains is None or _normalize(self.contains) in _normalize(doc.page_content)
+
+
+class GoldenQuery(BaseModel):
+    """A query with its provider filter and relevance judgments."""
+
+    id: str
+    insurance_provider: str
+    query: str
+    relevant: list[RelevantChunk]
+
+    def relevance(self, docs: list[Document]) -> list[set[int]]:
+        """For each retrieved doc, the indices of the judgments it satisfies."""
+        return [
+            {i for i, judgment in enumerate(self.relevant) if judgment.matches(doc)}
+            for doc in docs
+        ]
+
+
+class GoldenSet(BaseModel):
+    """A versioned collection of golden queries."""
+
+    version: int
+    description: str = ""
+    queries: list[GoldenQuery] = Field(default_factory=list)
+
+    def providers(self) -> list[str]:
+        return sorted({query.insurance_provider for query in self.queries})
+
+    def filter(self, insurance_providers: Optional[list[str]] = None) -> "GoldenSet":
+        """Subset restricted to some providers (all queries when None)."""
+        if not insurance_providers:
+            return self
+        return self.model_copy(update={
+            "queries": [q for q in self.queries if q.insurance_provider in insurance_providers]
+        })
+
+
+def load_golden_set(path: Path | str) -> GoldenSet:
+    """Load and validate a golden query file."""
+    with open(path, encoding="utf-8") as f:
+        return GoldenSet(**json.load(f))
@@ -0,0 +1,52 @@
+"""Ranking and latency metrics for the retrieval benchmark."""
+
+import numpy as np
+
+
+def recall_at_k(relevance: list[set[int]], n_relevant: int, k: int) -> float:
+    """Fraction of relevance judgments satisfied by at least one of the top-k hits."""
+    if n_relevant == 0:
+        return 0.0
+    found = set().union(*relevance[:k]) if relevance[:k] else set()
+    return len(found) / n_relevant
+
+
+def reciprocal_rank(relevance: list[set[int]], k: int) -> float:
+    """1 / rank of the first relevant hit within the top-k, 0 if there is none."""
+    for rank, matched in enumerate(relevance[:k], start=1):
+        if matched:
+            return 1.0 / rank
+    return 0.0
+
+
+def latency_percentiles(latencies_ms: list[float]) -> dict:
+    """p50/p95/p99 and mean of a list of latencies in milliseconds."""
+    if not latencies_ms:
+        return {"p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0, "mean_ms": 0.0}
+    p50, p95, p99 = np.percentile(latencies_ms, [50, 95, 99])
+    return {
+        "p50_ms": round(float(p50), 3),
+        "p95_ms": round(float(p95), 3),
+        "p99_ms": round(float(p99), 3),
+        "mean_ms": round(float(np.mean(latencies_ms)), 3),
+    }
+
+
+def spearman_correlation(scores_a: list[float], scores_b: list[float]) -> float:
+    """Spearman rank correlation of two score lists over the same items (1.0 = same order)."""
+    if len(scores_a) < 2:
+        return 1.0
+    ranks_a = np.argsort(np.argsort(scores_a))
+    ranks_b = np.argsort(np.argsort(scores_b))
+    n = len(scores_a)
+    return float(1 - 6 * np.sum((ranks_a - ranks_b) ** 2) / (n * (n ** 2 - 1)))
+
+
+def top_n_overlap(scores_a: list[float], scores_b: list[float], n: int) -> float:
+    """Share of the top-n items by `scores_a` that are also in the top-n by `scores_b`."""
+    n = min(n, len(scores_a))
+    if n == 0:
+        return 1.0
+    top_a = set(np.argsort(scores_a)[::-1][:n].tolist())
+    top_b = set(np.argsort(scores_b)[::-1][:n].tolist())
+    return len(top_a & top_b) / n
@@ -0,0 +1,103 @@
+"""Drive `InsuranceRetriever` over a golden query set and collect metrics."""
+
+import platform
+import time
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from .golden import GoldenSet
+from .metrics import recall_at_k, reciprocal_rank, latency_percentiles
+
+if TYPE_CHECKING:
+    # Importing the retriever module connects to Qdrant
+    from ..retriever import InsuranceRetriever
+
+
+def run_benchmark(
+    retriever: "InsuranceRetriever",
+    golden: GoldenSet,
+    modes: tuple[str, ...] = ("hybrid", "dense", "sparse"),
+    ks: tuple[int, ...] = (5, 10, 20),
+    repeats: int = 1,
+    warmup: bool = True,
+) -> dict:
+    """
+    Run every golden query for each (mode, k) and report quality and latency.
+
+    Query embeddings are computed in an untimed warm-up pass (and served from
+    the embedding cache afterwards), so latencies measure the search itself
+    rather than the embedding API.
+
+    Args:
+        retriever: Retriever to benchmark; disable its result cache so every
+            call hits the search backend.
+        golden: Golden query set.
+        modes: Search modes to compare ("hybrid", "dense", "sparse").
+        ks: Result counts to evaluate.
+        repeats: Timed repetitions per query (latency samples = queries * repeats).
+        warmup: Run each query once before timing.
+
+    Returns:
+        JSON-serializable report with one result per (mode, k), plus
+        per-query details.
+    """
+    results = []
+    for mode in modes:
+        if warmup:
+            for item in golden.queries:
+                retriever.retrieve_company_docs(item.query, item.insurance_provider, k=max(ks), mode=mode)
+
+        for k in ks:
+            latencies, recalls, reciprocal_ranks, per_query = [], [], [], []
+            for item in golden.queries:
+                for _ in range(repeats):
+                    start = time.perf_counter()
+                    hits = retriever.retrieve_company_docs(
+                        item.query, item.insurance_provider, k=k, mode=mode
+                    )
+                    latencies.append((time.perf_counter() - start) * 1000)
+
+                relevance = item.relevance([doc for doc, _ in hits])
+                recall = recall_at_k(relevance, len(item.relevant), k)
+                rr = reciprocal_rank(relevance, k)
+                recalls.append(recall)
+                reciprocal_ranks.append(rr)
+                per_query.append({
+                    "id": item.id,
+                    f"recall@{k}": round(recall, 4),
+                    "reciprocal_rank": round(rr, 4),
+                    "first_relevant_rank": next(
+                        (rank for rank, matched in enumerate(relevance, start=1) if matched), None
+                    ),
+                })
+
+            results.append({
+                "mode": mode,
+                "k": k,
+                "queries": len(golden.queries),
+                "recall": round(float(np.mean(recalls)), 4) if recalls else 0.0,
+                "mrr": round(float(np.mean(reciprocal_ranks)), 4) if reciprocal_ranks else 0.0,
+                **latency_percentiles(latencies),
+                "per_query": per_query,
+            })
+
+    return {
+        "golden_set_version": golden.version,
+        "collection": retriever.collection_name,
+        "backend": "local" if retriever.local_engine is not None else "qdrant",
+        "fusion": retriever.fusion.value,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "repeats": repeats,
+        "results": results,
+    }
+
+
+def summary_rows(report: dict) -> list[dict]:
+    """Report results without the per-query details (for tables and diffs)."""
+    return [
+        {key: value for key, value in row.items() if key != "per_query"}
+        for row in report["results"]
+    ]
@@ -0,0 +1,123 @@
+"""Version stamps for Qdrant collections.
+
+The ingestion pipeline bumps a collection's version whenever it writes to it;
+retrieval-side caches include the version in their keys, so entries from
+before a re-ingest are never served again.
+
+Stamps live as payload-only points in a small `collection_versions`
+collection, which works on every Qdrant server version (collection-level
+metadata needs Qdrant >= 1.16).
+"""
+
+import threading
+import time
+import uuid
+from datetime import datetime
+
+from qdrant_client import AsyncQdrantClient, QdrantClient
+from qdrant_client.models import PointStruct
+
+VERSION_COLLECTION = "collection_versions"
+
+
+def _point_id(collection_name: str) -> str:
+    """Stable point id for a collection's version stamp."""
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, f"qdrant-collection/{collection_name}"))
+
+
+class CollectionVersionStore:
+    """Reads and bumps per-collection version stamps, caching reads briefly."""
+
+    def __init__(
+        self,
+        client: QdrantClient,
+        async_client: AsyncQdrantClient | None = None,
+        refresh_interval: float = 30.0,
+    ):
+        """
+        Args:
+            client: Sync Qdrant client.
+            async_client: Async Qdrant client, used by `aget`.
+            refresh_interval: Seconds a version read is reused before Qdrant
+                is asked again. Bounds how long stale cache entries can live
+                after a re-ingest.
+        """
+        self.client = client
+        self.async_client = async_client
+        self.refresh_interval = refresh_interval
+        self._cached: dict[str, tuple[int, float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, collection_name: str) -> int:
+        """Return the current version of `collection_name` (0 if never stamped)."""
+        cached = self._fresh(collection_name)
+        if cached is not None:
+            return cached
+
+        version = 0
+        if self.client.collection_exists(VERSION_COLLECTION):
+            records = self.client.retrieve(VERSION_COLLECTION, ids=[_point_id(collection_name)])
+            if records:
+                version = records[0].payload.get("version", 0)
+
+        self._remember(collection_name, version)
+        return version
+
+    async def aget(self, collection_name: str) -> int:
+        """Async variant of `get`."""
+        if self.async_client is None:
+            return self.get(collection_name)
+
+        cached = self._fresh(collection_name)
+        if cached is not None:
+            return cached
+
+        version = 0
+        if await self.async_client.collection_exists(VERSION_COLLECTION):
+            records = await self.async_client.retrieve(
+                VERSION_COLLECTION, ids=[_point_id(collection_name)]
+            )
+            if records:
+                version = records[0].payload.get("version", 0)
+
+        self._remember(collection_name, version)
+        return version
+
+    def bump(self, collection_name: str) -> int:
+        """Increment the version of `collection_name` and return the new value."""
+        if not self.client.collection_exists(VERSION_COLLECTION):
+            self.client.create_collection(VERSION_COLLECTION, vectors_config={})
+
+        with self._lock:
+            self._cached.pop(collection_name, None)
+        version = self.get(collection_name) + 1
+
+        self.client.upsert(
+            collection_name=VERSION_COLLECTION,
+            points=[
+                PointStruct(
+                    id=_point_id(collection_name),
+                    vector={},
+                    payload={
+                        "collection": collection_name,
+                        "version": version,
+                        "updated_at": datetime.now().isoformat(),
+                    },
+                )
+            ],
+            wait=True,
+        )
+
+        self._remember(collection_name, version)
+        return version
+
+    def _fresh(self, collection_name: str) -> int | None:
+        with self._lock:
+            cached = self._cached.get(collection_name)
+        if cached and time.monotonic() - cached[1] < self.refresh_interval:
+            return cached[0]
+        return None
+
+    def _remember(self, collection_name: str, version: int) -> None:
+        with self._lock:
+            self._cached[collection_name] = (version, time.monotonic())
@@ -1,4 +1,5 @@
 """Configuration for the retrieval module."""
+import os
 import sys
 from pathlib import Path
 
@@ -12,19 +13,84 @@ if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
 # 3. Now import using the actual package name 'src'
-from src.config import QDRANT_HOST, OPENAI_API_KEY
+from src.config import QDRANT_HOST, OPENAI_API_KEY, DATA_DIR
+from src.ingestion.config.naming import MATRYOSHKA_MODEL_DIMENSIONS, collection_name
 
 # Embedding configuration
 EMBEDDING_MODEL = "text-embedding-3-large"
 SPARSE_EMBEDDING_MODEL = "Qdrant/bm25"
 
-# Collection configuration
-COLLECTION_NAME = "insurance_docs_text-embedding-3-large"
+# Dense query dimension. text-embedding-3-large is a Matryoshka model, so a
+# reduced size (e.g. 256/512/1024) can be served from its own collection.
+EMBEDDING_NATIVE_DIMENSION = MATRYOSHKA_MODEL_DIMENSIONS[EMBEDDING_MODEL]
+EMBEDDING_DIMENSION = int(os.getenv("EMBEDDING_DIMENSION", EMBEDDING_NATIVE_DIMENSION))
+
+# Collection configuration: named like IngestionSettings.get_collection_name,
+# i.e. the collection ingested with model_name "text-embedding-3-large"
+COLLECTION_BASE_NAME = "insurance_docs"
+COLLECTION_NAME = collection_name(
+    COLLECTION_BASE_NAME,
+    EMBEDDING_MODEL,
+    EMBEDDING_DIMENSION if EMBEDDING_DIMENSION != EMBEDDING_NATIVE_DIMENSION else None,
+)
 
 # Vector store configuration
 DENSE_VECTOR_NAME = "dense"
 SPARSE_VECTOR_NAME = "sparse"
 
+# Native Query API hybrid search (bypasses QdrantVectorStore on the hot path)
+HYBRID_SEARCH_NATIVE = True
+# Candidates per prefetch stage; None = k (what QdrantVectorStore uses)
+DENSE_PREFETCH_LIMIT = None
+SPARSE_PREFETCH_LIMIT = None
+HYBRID_FUSION = "rrf"  # "rrf" (rank based) or "dbsf" (score normalization)
+HNSW_EF = None  # None = collection default
+# Payload returned per hit: chunk text plus what the agents and UI read
+PAYLOAD_FIELDS = [
+    "page_content",
+    "metadata.header_1",
+    "metadata.header_2",
+    "metadata.header_3",
+    "metadata.header_4",
+    "metadata.source",
+    "metadata.insurance_provider",
+    "metadata.document_name",
+]
+
+# Quantized search (only applied when the collection has a quantization config)
+QUANTIZATION_RESCORE = True
+QUANTIZATION_OVERSAMPLING = 2.0
+
+# Retrieval backend: "qdrant" (server) or "local" (in-process engine)
+RETRIEVAL_BACKEND = os.getenv("RETRIEVAL_BACKEND", "qdrant")
+LOCAL_SNAPSHOT_PATH = Path(os.getenv(
+    "LOCAL_SNAPSHOT_PATH", DATA_DIR / "snapshots" / f"{COLLECTION_NAME}.npz"
+))
+# Qdrant's sparse vectors are indexed without Modifier.IDF (term frequency
+# only); keep this False so the local engine ranks sparse hits the same way
+LOCAL_ENGINE_BM25_IDF = False
+
+# Query embedding cache (in-process LRU backed by SQLite on disk)
+EMBEDDING_CACHE_ENABLED = True
+EMBEDDING_CACHE_MEMORY_ENTRIES = 2048
+EMBEDDING_CACHE_DISK_ENTRIES = 50_000
+EMBEDDING_CACHE_PATH = DATA_DIR / "cache" / "query_embeddings.sqlite"
+
+# Retrieval result cache (keyed on the collection version stamp)
+RESULT_CACHE_ENABLED = True
+RESULT_CACHE_MAX_ENTRIES = 1024
+RESULT_CACHE_TTL_SECONDS = 6 * 3600
+COLLECTION_VERSION_REFRESH_SECONDS = 30
+
+# Prompt context packing (see context_packer.py); budgets are set per agent node
+CONTEXT_TOKEN_ENCODING = "o200k_base"  # tokenizer of the gpt-4o/gpt-5 family
+CONTEXT_OVERLAP_THRESHOLD = 0.8  # drop chunks whose shingles are >80% already in context
+CONTEXT_SHINGLE_SIZE = 5  # words per shingle
+CONTEXT_MIN_TRUNCATED_TOKENS = 200  # smallest useful prefix of the chunk crossing the budget
+
+# Retrieval benchmark (see src/retrieval/benchmark)
+GOLDEN_QUERIES_PATH = DATA_DIR / "benchmarks" / "golden_queries_v1.json"
+
 # Export shared config
 QDRANT_URL = QDRANT_HOST
 OPENAI_KEY = OPENAI_API_KEY
@@ -0,0 +1,202 @@
+"""Token-budgeted packing of reranked chunks into LLM prompt context.
+
+Chunks can be whole document sections (ingestion does not cap chunk size), so
+joining every reranked chunk into a prompt makes grading and generation cost
+and latency grow with the corpus. `ContextPacker` keeps the reranker's order
+and:
+
+1. drops chunks whose word shingles are mostly contained in a higher-ranked
+   chunk (overlapping splits, the same clause in a PDF and on a web page),
+2. adds chunks until the token budget is reached, truncating the chunk that
+   crosses it when enough budget is left to be useful.
+
+Tokens are counted with tiktoken when its encoding is available and estimated
+from the character count otherwise (e.g. offline, where tiktoken cannot
+download its encoding files).
+"""
+
+import logging
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, Sequence
+
+from langchain_core.documents import Document
+
+from .config import (
+    CONTEXT_TOKEN_ENCODING,
+    CONTEXT_OVERLAP_THRESHOLD,
+    CONTEXT_SHINGLE_SIZE,
+    CONTEXT_MIN_TRUNCATED_TOKENS,
+)
+
+logger = logging.getLogger(__name__)
+
+# Fallback estimate for English/Dutch prose with OpenAI tokenizers
+CHARS_PER_TOKEN = 4
+SEPARATOR = "\n---\n"
+
+_WORD = re.compile(r"\w+")
+
+
+class TokenCounter:
+    """Counts and truncates text in tokens, loading the tiktoken encoding on first use."""
+
+    def __init__(self, encoding_name: str = CONTEXT_TOKEN_ENCODING):
+        self.encoding_name = encoding_name
+        self._encoding = None
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    @property
+    def encoding(self):
+        """The tiktoken encoding, or None when it cannot be loaded."""
+        if not self._loaded:
+            with self._lock:
+                if not self._loaded:
+                    try:
+                        import tiktoken
+                        self._encoding = tiktoken.get_encoding(self.encoding_name)
+                    except Exception as e:
+                        logger.warning(
+                            "tiktoken encoding '%s' unavailable (%s), estimating tokens from length",
+                            self.encoding_name, e,
+                        )
+                    self._loaded = True
+        return self._encoding
+
+    def count(self, text: str) -> int:
+        if self.encoding is None:
+            return -(-len(text) // CHARS_PER_TOKEN)
+        return len(self.encoding.encode(text, disallowed_special=()))
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """Return the longest prefix of `text` that fits in `max_tokens`."""
+        if self.encoding is None:
+            return text[: max_tokens * CHARS_PER_TOKEN]
+        tokens = self.encoding.encode(text, disallowed_special=())
+        return self.encoding.decode(tokens[:max_tokens])
+
+
+@dataclass
+class PackedContext:
+    """Result of packing: the kept documents and what was left out."""
+
+    documents: list[Document] = field(default_factory=list)
+    texts: list[str] = field(default_factory=list)
+    tokens: int = 0
+    dropped_overlap: int = 0
+    dropped_budget: int = 0
+    truncated: bool = False
+
+    @property
+    def text(self) -> str:
+        """Prompt-ready context: the formatted chunks joined by separators."""
+        return SEPARATOR.join(self.texts)
+
+
+def shingles(text: str, size: int = CONTEXT_SHINGLE_SIZE) -> frozenset:
+    """Lower-cased word n-grams of `text` (the words themselves for short texts)."""
+    words = _WORD.findall(text.lower())
+    if len(words) < size:
+        return frozenset(words)
+    return frozenset(tuple(words[i:i + size]) for i in range(len(words) - size + 1))
+
+
+def overlap(a: frozenset, b: frozenset) -> float:
+    """Share of the smaller shingle set contained in the other one."""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / min(len(a), len(b))
+
+
+class ContextPacker:
+    """Deduplicates and trims ranked documents to a token budget."""
+
+    def __init__(
+        self,
+        counter: TokenCounter | None = None,
+        overlap_threshold: float = CONTEXT_OVERLAP_THRESHOLD,
+        shingle_size: int = CONTEXT_SHINGLE_SIZE,
+        min_truncated_tokens: int = CONTEXT_MIN_TRUNCATED_TOKENS,
+    ):
+        """
+        Args:
+            counter: Token counter; a tiktoken-backed one by default.
+            overlap_threshold: Drop a chunk when more than this share of its
+                shingles (or of the kept chunk's) is already in context.
+            shingle_size: Words per shingle for the overlap check.
+            min_truncated_tokens: Only truncate the chunk that crosses the
+                budget when at least this many tokens are left for it.
+        """
+        self.counter = counter or TokenCounter()
+        self.overlap_threshold = overlap_threshold
+        self.shingle_size = shingle_size
+        self.min_truncated_tokens = min_truncated_tokens
+
+    def pack(
+        self,
+        documents: Sequence[Document],
+        max_tokens: int | None,
+        format_document: Callable[[Document], str] = lambda doc: doc.page_content,
+    ) -> PackedContext:
+        """
+        Pack documents, best first, into at most `max_tokens` tokens.
+
+        Args:
+            documents: Documents in rank order (reranker output).
+            max_tokens: Token budget for the joined context; None = no limit
+                (only overlap is removed).
+            format_document: Renders a document as it appears in the prompt;
+                tokens are counted on this text.
+
+        Returns:
+            PackedContext with the kept documents (a truncated chunk is
+            returned as a copy) and their prompt texts.
+        """
+        packed = PackedContext()
+        kept_shingles: list[frozenset] = []
+        separator_tokens = self.counter.count(SEPARATOR)
+
+        for position, doc in enumerate(documents):
+            doc_shingles = shingles(doc.page_content, self.shingle_size)
+            if any(overlap(doc_shingles, seen) > self.overlap_threshold for seen in kept_shingles):
+                packed.dropped_overlap += 1
+                continue
+
+            text = format_document(doc)
+            separator = separator_tokens if packed.texts else 0
+            tokens = separator + self.counter.count(text)
+
+            if max_tokens is not None and packed.tokens + tokens > max_tokens:
+                remaining = max_tokens - packed.tokens - separator
+                # Keep the start of the chunk that crosses the budget when enough
+                # room is left, and always keep something of the best chunk
+                if remaining >= self.min_truncated_tokens or (not packed.texts and remaining > 0):
+                    doc = self._truncate(doc, text, remaining)
+                    text = format_document(doc)
+                    packed.documents.append(doc)
+                    packed.texts.append(text)
+                    packed.tokens += separator + self.counter.count(text)
+                    packed.truncated = True
+                    position += 1
+                packed.dropped_budget = len(documents) - position
+                break
+
+            packed.documents.append(doc)
+            packed.texts.append(text)
+            packed.tokens += tokens
+            kept_shingles.append(doc_shingles)
+
+        return packed
+
+    def _truncate(self, doc: Document, text: str, max_tokens: int) -> Document:
+        """Copy of `doc` whose formatted text fits in `max_tokens` tokens."""
+        # Formatting adds the header path; leave room for it
+        overhead = self.counter.count(text) - self.counter.count(doc.page_content)
+        content = self.counter.truncate(doc.page_content, max(1, max_tokens - overhead))
+        return Document(page_content=content, metadata={**doc.metadata, "truncated": True})
+
+
+# Shared packer; the tiktoken encoding is loaded on the first pack
+default_packer = ContextPacker()
@@ -1,5 +1,5 @@
 from langchain_core.tools import tool
-from src.retrieval.retriever import retriever  # Import your instance
+from src.retrieval.retriever import get_retriever
 
 @tool
 def retrieve_insurance_docs(query: str, company: str) -> str:
@@ -8,6 +8,7 @@ def retrieve_insurance_docs(query: str, company: str) -> str:
     Useful when you need to find policy details, coverage, or exclusions.
     """
     # 1. Call your custom class
+    retriever = get_retriever()
     results = retriever.search_company(query, company)
     
     # 2. Format the raw output into a string for the LLM
@@ -0,0 +1,183 @@
+"""Two-tier cache for dense and sparse query embeddings.
+
+The self-reflective retriever loop and the ReAct tool embed the same queries
+over and over. `CachedEmbeddings` and `CachedSparseEmbeddings` wrap the real
+models and serve repeat queries from an in-process LRU, falling back to an
+on-disk SQLite store before paying for an embedding call. The async methods
+read and write the SQLite tier in a worker thread, off the event loop.
+"""
+
+import asyncio
+import hashlib
+from pathlib import Path
+from typing import List, Optional
+
+from langchain_core.embeddings import Embeddings
+from langchain_qdrant.sparse_embeddings import SparseEmbeddings, SparseVector
+
+from src.cache import LRUCache, SQLiteStore, normalize_query
+
+
+class QueryEmbeddingCache:
+    """In-process LRU in front of an optional on-disk store, keyed by model + query."""
+
+    def __init__(
+        self,
+        memory_entries: int = 2048,
+        disk_path: Optional[Path] = None,
+        disk_entries: int = 50_000,
+    ):
+        """
+        Initialize the cache tiers.
+
+        Args:
+            memory_entries: Maximum number of vectors kept in memory.
+            disk_path: SQLite file for the second tier (None disables it).
+            disk_entries: Maximum number of vectors kept on disk.
+        """
+        self.memory = LRUCache(max_entries=memory_entries)
+        self.disk = (
+            SQLiteStore(disk_path, max_entries=disk_entries, table="query_embeddings")
+            if disk_path
+            else None
+        )
+        self.disk_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(model: str, text: str) -> str:
+        """Build the cache key from the model name and normalized query text."""
+        digest = hashlib.sha256(normalize_query(text).encode("utf-8")).hexdigest()
+        return f"{model}:{digest}"
+
+    def get(self, model: str, text: str):
+        """Return the cached vector for (model, text), or None on a miss."""
+        key = self.make_key(model, text)
+        value = self.memory.get(key)
+        if value is not None:
+            return value
+
+        if self.disk is not None:
+            value = self.disk.get(key)
+            if value is not None:
+                self.disk_hits += 1
+                self.memory.set(key, value)
+                return value
+
+        self.misses += 1
+        return None
+
+    async def aget(self, model: str, text: str):
+        """Async `get`: the disk lookup runs in a worker thread."""
+        key = self.make_key(model, text)
+        value = self.memory.get(key)
+        if value is not None:
+            return value
+
+        if self.disk is not None:
+            value = await asyncio.to_thread(self.disk.get, key)
+            if value is not None:
+                self.disk_hits += 1
+                self.memory.set(key, value)
+                return value
+
+        self.misses += 1
+        return None
+
+    def set(self, model: str, text: str, value) -> None:
+        """Store a JSON-serializable vector in both tiers."""
+        key = self.make_key(model, text)
+        self.memory.set(key, value)
+        if self.disk is not None:
+            self.disk.set(key, value)
+
+    async def aset(self, model: str, text: str, value) -> None:
+        """Async `set`: the disk write runs in a worker thread."""
+        key = self.make_key(model, text)
+        self.memory.set(key, value)
+        if self.disk is not None:
+            await asyncio.to_thread(self.disk.set, key, value)
+
+    def stats(self) -> dict:
+        """Return hit/miss counters for both tiers."""
+        memory_hits = self.memory.hits
+        lookups = memory_hits + self.disk_hits + self.misses
+        return {
+            "memory_entries": len(self.memory),
+            "disk_entries": len(self.disk) if self.disk is not None else 0,
+            "memory_hits": memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": (memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+        }
+
+
+class CachedEmbeddings(Embeddings):
+    """Dense embeddings wrapper that caches `embed_query` results."""
+
+    def __init__(self, embeddings: Embeddings, cache: QueryEmbeddingCache, model_key: str):
+        """
+        Args:
+            embeddings: The underlying dense embeddings model.
+            cache: Shared query embedding cache.
+            model_key: Model identifier used in cache keys.
+        """
+        self.embeddings = embeddings
+        self.cache = cache
+        self.model_key = model_key
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.embeddings.embed_documents(texts)
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        return await self.embeddings.aembed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        cached = self.cache.get(self.model_key, text)
+        if cached is not None:
+            return cached
+        vector = self.embeddings.embed_query(text)
+        self.cache.set(self.model_key, text, vector)
+        return vector
+
+    async def aembed_query(self, text: str) -> List[float]:
+        cached = await self.cache.aget(self.model_key, text)
+        if cached is not None:
+            return cached
+        vector = await self.embeddings.aembed_query(text)
+        await self.cache.aset(self.model_key, text, vector)
+        return vector
+
+
+class CachedSparseEmbeddings(SparseEmbeddings):
+    """Sparse embeddings wrapper that caches `embed_query` results."""
+
+    def __init__(self, sparse_embeddings: SparseEmbeddings, cache: QueryEmbeddingCache, model_key: str):
+        """
+        Args:
+            sparse_embeddings: The underlying sparse embeddings model.
+            cache: Shared query embedding cache.
+            model_key: Model identifier used in cache keys.
+        """
+        self.sparse_embeddings = sparse_embeddings
+        self.cache = cache
+        self.model_key = model_key
+
+    def embed_documents(self, texts: List[str]) -> List[SparseVector]:
+        return self.sparse_embeddings.embed_documents(texts)
+
+    def embed_query(self, text: str) -> SparseVector:
+        cached = self.cache.get(self.model_key, text)
+        if cached is not None:
+            return SparseVector(**cached)
+        vector = self.sparse_embeddings.embed_query(text)
+        self.cache.set(self.model_key, text, vector.model_dump())
+        return vector
+
+    async def aembed_query(self, text: str) -> SparseVector:
+        cached = await self.cache.aget(self.model_key, text)
+        if cached is not None:
+            return SparseVector(**cached)
+        vector = await self.sparse_embeddings.aembed_query(text)
+        await self.cache.aset(self.model_key, text, vector.model_dump())
+        return vector
@@ -0,0 +1,25 @@
+"""Rank fusion helpers shared by the local engine and multi-query retrieval."""
+
+from typing import Hashable, Iterable
+
+# Qdrant's RRF scores a hit at 0-based rank r as 1 / (r + 2); keep the same
+# constant so locally fused scores are comparable with server-side ones.
+RRF_K = 2
+
+
+def reciprocal_rank_fusion(rankings: Iterable[list[Hashable]], rrf_k: int = RRF_K) -> list[tuple[Hashable, float]]:
+    """
+    Fuse several ranked id lists with reciprocal rank fusion.
+
+    Args:
+        rankings: Ranked lists of ids, best first.
+        rrf_k: Rank offset added before taking the reciprocal.
+
+    Returns:
+        List of (id, fused score), best first.
+    """
+    scores: dict[Hashable, float] = {}
+    for ranking in rankings:
+        for rank, item in enumerate(ranking):
+            scores[item] = scores.get(item, 0.0) + 1.0 / (rank + rrf_k)
+    return sorted(scores.items(), key=lambda pair: pair[1], reverse=True)
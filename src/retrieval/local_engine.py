@@ -0,0 +1,269 @@
+"""In-process hybrid search engine for the (small) insurance corpus.
+
+The whole corpus fits comfortably in memory, so instead of a network hop to
+Qdrant per query, `LocalVectorEngine` keeps all dense vectors in one
+normalized NumPy matrix plus a BM25 inverted index over the sparse vectors,
+and fuses both rankings with RRF like the Qdrant hybrid query does.
+
+The engine is loaded from a snapshot file (see `save_snapshot` and the
+`export-snapshot` ingestion command) or exported straight from Qdrant.
+"""
+
+import json
+import math
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+from langchain_core.documents import Document
+from qdrant_client import QdrantClient
+
+from .fusion import reciprocal_rank_fusion
+
+SNAPSHOT_FORMAT_VERSION = 1
+
+
+class LocalVectorEngine:
+    """Dense matrix + BM25 sparse index with fused hybrid search."""
+
+    def __init__(
+        self,
+        ids: list,
+        payloads: list[dict],
+        dense: np.ndarray,
+        sparse: list[tuple[list[int], list[float]]],
+        use_idf: bool = False,
+        collection_name: str = "",
+        content_payload_key: str = "page_content",
+        metadata_payload_key: str = "metadata",
+    ):
+        """
+        Build the in-memory indexes.
+
+        Args:
+            ids: Point ids, one per chunk.
+            payloads: Qdrant payloads (page_content + metadata), one per chunk.
+            dense: Dense vectors, shape (n_chunks, dim).
+            sparse: Sparse vectors as (indices, values), one per chunk.
+            use_idf: Weight sparse matches by corpus IDF (full BM25). The
+                FastEmbed BM25 document vectors only carry the TF part, and
+                the Qdrant collection applies no IDF modifier either, so
+                leave this off to rank like the server.
+            collection_name: Source collection, recorded in document metadata.
+            content_payload_key: Payload key holding the chunk text.
+            metadata_payload_key: Payload key holding the chunk metadata.
+        """
+        self.ids = list(ids)
+        self.payloads = payloads
+        self.collection_name = collection_name
+        self.content_payload_key = content_payload_key
+        self.metadata_payload_key = metadata_payload_key
+        self.use_idf = use_idf
+
+        dense = np.asarray(dense, dtype=np.float32)
+        norms = np.linalg.norm(dense, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        self.dense = dense / norms
+
+        self.providers = np.array([
+            (payload.get(metadata_payload_key) or {}).get("insurance_provider", "")
+            for payload in payloads
+        ])
+
+        self.sparse = sparse
+        self._build_sparse_index(sparse)
+
+    def _build_sparse_index(self, sparse: list[tuple[list[int], list[float]]]) -> None:
+        """Build a term -> (doc positions, weights) inverted index with IDF weights."""
+        postings: dict[int, tuple[list[int], list[float]]] = {}
+        for position, (indices, values) in enumerate(sparse):
+            for term, value in zip(indices, values):
+                docs, weights = postings.setdefault(term, ([], []))
+                docs.append(position)
+                weights.append(value)
+
+        n_docs = len(sparse)
+        self.inverted_index: dict[int, tuple[np.ndarray, np.ndarray]] = {}
+        for term, (docs, weights) in postings.items():
+            weights = np.asarray(weights, dtype=np.float32)
+            if self.use_idf:
+                df = len(docs)
+                weights = weights * math.log((n_docs - df + 0.5) / (df + 0.5) + 1.0)
+            self.inverted_index[term] = (np.asarray(docs, dtype=np.int64), weights)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    # --- Search ---
+
+    def search(
+        self,
+        dense_vector: Optional[list[float]],
+        sparse_vector,
+        k: int = 5,
+        insurance_providers: Optional[list[str]] = None,
+    ) -> list[tuple[Document, float]]:
+        """
+        Hybrid search: top-k dense and top-k sparse candidates fused with RRF.
+
+        Args:
+            dense_vector: Query dense vector (None to skip the dense ranking).
+            sparse_vector: Query sparse vector with `indices`/`values` (None to skip).
+            k: Number of results (and per-ranking candidates).
+            insurance_providers: Restrict results to these providers.
+
+        Returns:
+            List of (Document, score) tuples, best first.
+        """
+        mask = None
+        if insurance_providers:
+            mask = np.isin(self.providers, insurance_providers)
+
+        rankings = []
+        if dense_vector is not None:
+            rankings.append(self._top_k(self.dense_scores(dense_vector), k, mask))
+        if sparse_vector is not None:
+            rankings.append(self._top_k(self.sparse_scores(sparse_vector), k, mask, positive_only=True))
+
+        fused = reciprocal_rank_fusion(rankings)[:k]
+        return [(self._document(position), score) for position, score in fused]
+
+    def dense_scores(self, dense_vector: list[float]) -> np.ndarray:
+        """Cosine similarity of the query against every chunk."""
+        query = np.asarray(dense_vector, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm:
+            query = query / norm
+        return self.dense @ query
+
+    def sparse_scores(self, sparse_vector) -> np.ndarray:
+        """BM25 score of the query against every chunk."""
+        scores = np.zeros(len(self.ids), dtype=np.float32)
+        for term, value in zip(sparse_vector.indices, sparse_vector.values):
+            posting = self.inverted_index.get(term)
+            if posting is not None:
+                docs, weights = posting
+                scores[docs] += weights * value
+        return scores
+
+    @staticmethod
+    def _top_k(scores: np.ndarray, k: int, mask: Optional[np.ndarray], positive_only: bool = False) -> list[int]:
+        """Positions of the k best scores, honouring the provider mask."""
+        scores = scores.copy()
+        if mask is not None:
+            scores[~mask] = -np.inf
+        if positive_only:
+            scores[scores <= 0] = -np.inf
+
+        k = min(k, len(scores))
+        if k == 0:
+            return []
+        candidates = np.argpartition(-scores, k - 1)[:k]
+        candidates = candidates[np.argsort(-scores[candidates])]
+        return [int(position) for position in candidates if np.isfinite(scores[position])]
+
+    def _document(self, position: int) -> Document:
+        payload = self.payloads[position]
+        metadata = dict(payload.get(self.metadata_payload_key) or {})
+        metadata["_id"] = self.ids[position]
+        metadata["_collection_name"] = self.collection_name
+        return Document(
+            page_content=payload.get(self.content_payload_key, ""),
+            metadata=metadata,
+        )
+
+    # --- Loading / saving ---
+
+    @classmethod
+    def from_qdrant(
+        cls,
+        client: QdrantClient,
+        collection_name: str,
+        dense_vector_name: str = "dense",
+        sparse_vector_name: str = "sparse",
+        use_idf: bool = False,
+        batch_size: int = 256,
+    ) -> "LocalVectorEngine":
+        """Export every point (payload + vectors) of a Qdrant collection."""
+        ids, payloads, dense, sparse = [], [], [], []
+
+        offset = None
+        while True:
+            points, offset = client.scroll(
+                collection_name=collection_name,
+                limit=batch_size,
+                offset=offset,
+                with_payload=True,
+                with_vectors=True,
+            )
+            for point in points:
+                vectors = point.vector or {}
+                sparse_vector = vectors.get(sparse_vector_name)
+                ids.append(point.id)
+                payloads.append(point.payload or {})
+                dense.append(vectors[dense_vector_name])
+                sparse.append(
+                    (list(sparse_vector.indices), list(sparse_vector.values))
+                    if sparse_vector is not None
+                    else ([], [])
+                )
+            if offset is None:
+                break
+
+        return cls(
+            ids,
+            payloads,
+            np.asarray(dense, dtype=np.float32),
+            sparse,
+            use_idf=use_idf,
+            collection_name=collection_name,
+        )
+
+    @classmethod
+    def from_snapshot(cls, path: Path | str, use_idf: bool = False) -> "LocalVectorEngine":
+        """Load an engine from a file written by `save_snapshot`."""
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data["meta"]))
+            if meta.get("format_version") != SNAPSHOT_FORMAT_VERSION:
+                raise ValueError(f"Unsupported snapshot format in {path}: {meta.get('format_version')}")
+
+            indptr = data["sparse_indptr"]
+            indices = data["sparse_indices"]
+            values = data["sparse_values"]
+            sparse = [
+                (indices[start:end].tolist(), values[start:end].tolist())
+                for start, end in zip(indptr[:-1], indptr[1:])
+            ]
+            return cls(
+                meta["ids"],
+                meta["payloads"],
+                data["dense"],
+                sparse,
+                use_idf=use_idf,
+                collection_name=meta.get("collection_name", ""),
+            )
+
+    def save_snapshot(self, path: Path | str) -> Path:
+        """Write vectors and payloads to a compressed `.npz` snapshot."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        indptr = np.cumsum([0] + [len(indices) for indices, _ in self.sparse])
+        indices = np.asarray([i for indices, _ in self.sparse for i in indices], dtype=np.int64)
+        values = np.asarray([v for _, values in self.sparse for v in values], dtype=np.float32)
+        meta = {
+            "format_version": SNAPSHOT_FORMAT_VERSION,
+            "collection_name": self.collection_name,
+            "ids": self.ids,
+            "payloads": self.payloads,
+        }
+
+        np.savez_compressed(
+            path,
+            dense=self.dense,
+            sparse_indptr=indptr,
+            sparse_indices=indices,
+            sparse_values=values,
+            meta=np.array(json.dumps(meta)),
+        )
+        return path
@@ -0,0 +1,89 @@
+"""Adaptive reranking: decide from the retrieval scores how much to rerank.
+
+The hybrid search already ranks the candidates. When its fused score for
+rank 1 is far above the score at rank `top_n + 1`, the head of the list is
+clear and the rerank round trip is skipped. Otherwise only the band of
+candidates that could still make the cut is reranked: candidates scoring
+clearly below the cut-off are dropped without being sent.
+
+Margins are relative to the rank-1 score, so the same thresholds work for
+RRF (rank-based) and DBSF (normalized) fusion scores. Skipped documents get
+that relative score as `rerank_score` (rank 1 = 1.0), so consumers of rerank
+scores, such as the local grader, still see a score in [0, 1].
+"""
+
+import threading
+from typing import List, Literal
+
+from langchain_core.documents import Document
+
+RETRIEVAL_SCORE_KEY = "retrieval_score"
+RERANK_SCORE_KEY = "rerank_score"
+
+Action = Literal["full", "skip", "partial"]
+
+
+class AdaptiveRerankPolicy:
+    """Chooses between a full, partial or skipped rerank and counts the outcomes."""
+
+    def __init__(self, skip_margin: float = 0.5, band_margin: float = 0.25):
+        """
+        Args:
+            skip_margin: Skip reranking when (s[1] - s[top_n + 1]) / s[1] is at
+                least this much.
+            band_margin: Otherwise rerank only candidates scoring within
+                band_margin * s[1] below s[top_n + 1], or above it.
+        """
+        self.skip_margin = skip_margin
+        self.band_margin = band_margin
+        self._lock = threading.Lock()
+        self.counts = {"full": 0, "skip": 0, "partial": 0}
+        self.documents_saved = 0
+
+    def plan(self, documents: List[Document], top_n: int) -> tuple[Action, List[Document]]:
+        """
+        Decide how to rerank `documents`.
+
+        Returns:
+            ("skip", top_n documents in retrieval order, scored relative to rank 1),
+            ("partial", the band to rerank) or ("full", all documents).
+        """
+        scores = [doc.metadata.get(RETRIEVAL_SCORE_KEY) for doc in documents]
+        if len(documents) <= top_n or any(score is None for score in scores):
+            return self._record("full", documents, len(documents))
+
+        ranked = sorted(zip(scores, range(len(documents))), key=lambda pair: pair[0], reverse=True)
+        best, cutoff = ranked[0][0], ranked[top_n][0]
+        if best <= 0:
+            return self._record("full", documents, len(documents))
+
+        if (best - cutoff) / best >= self.skip_margin:
+            kept = [documents[i] for _, i in ranked[:top_n]]
+            for score, i in ranked[:top_n]:
+                documents[i].metadata[RERANK_SCORE_KEY] = score / best
+            return self._record("skip", kept, len(documents))
+
+        floor = cutoff - self.band_margin * best
+        band = [documents[i] for score, i in ranked if score >= floor]
+        action = "partial" if len(band) < len(documents) else "full"
+        return self._record(action, band, len(documents))
+
+    def _record(self, action: Action, documents: List[Document], total: int) -> tuple[Action, List[Document]]:
+        with self._lock:
+            self.counts[action] += 1
+            self.documents_saved += total - len(documents) if action != "skip" else total
+        return action, documents
+
+    def stats(self) -> dict:
+        """Counts of full/skipped/partial reranks and candidates not sent to the backend."""
+        with self._lock:
+            total = sum(self.counts.values())
+            return {
+                "skip_margin": self.skip_margin,
+                "band_margin": self.band_margin,
+                "full": self.counts["full"],
+                "skipped": self.counts["skip"],
+                "partial": self.counts["partial"],
+                "skip_rate": self.counts["skip"] / total if total else 0.0,
+                "documents_saved": self.documents_saved,
+            }
@@ -0,0 +1,310 @@
+"""Scoring backends for `Reranker`.
+
+A backend scores (query, text) pairs; `Reranker` attaches the scores to the
+documents and sorts them. Select one with RERANKER_PROVIDER in config.py:
+
+- "siliconflow": the remote Qwen reranker behind SiliconFlow's rerank API,
+  over pooled keep-alive connections with timeouts and jittered retries.
+- "local": an ONNX cross-encoder run on CPU by fastembed. No network call on
+  the hot path; the model is downloaded once into the fastembed cache.
+
+Both return relevance scores in [0, 1], so thresholds on `rerank_score` work
+with either backend.
+"""
+
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+import math
+import random
+import threading
+import time
+from typing import List, Optional
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+from .config import (
+    RERANKER_API_URL,
+    RERANKER_API_KEY,
+    RERANKER_MODEL,
+    RERANKER_CONNECT_TIMEOUT,
+    RERANKER_READ_TIMEOUT,
+    RERANKER_MAX_RETRIES,
+    RERANKER_BACKOFF_SECONDS,
+    RERANKER_POOL_SIZE,
+    LOCAL_RERANKER_MODEL,
+    LOCAL_RERANKER_THREADS,
+    LOCAL_RERANKER_BATCH_SIZE,
+    LOCAL_RERANKER_CACHE_DIR,
+)
+from src.instrumentation import record_retry
+
+logger = logging.getLogger(__name__)
+
+# Rate limiting and transient server errors; anything else fails immediately
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+RERANKER_PROVIDERS = ("siliconflow", "local")
+
+
+class RerankerBackend(ABC):
+    """Scores texts against a query; higher is more relevant."""
+
+    # Identifies the scores (e.g. for caching), so include anything that changes them
+    model: str = ""
+
+    @abstractmethod
+    def score(self, query: str, texts: List[str]) -> List[float]:
+        """Relevance score in [0, 1] per text, in input order."""
+
+    async def ascore(self, query: str, texts: List[str]) -> List[float]:
+        """Async variant of `score`; runs the sync call in a worker thread by default."""
+        return await asyncio.to_thread(self.score, query, texts)
+
+    def close(self) -> None:
+        pass
+
+    async def aclose(self) -> None:
+        pass
+
+
+class SiliconFlowBackend(RerankerBackend):
+    """SiliconFlow rerank API.
+
+    Sync calls share one pooled `requests.Session` and async calls one
+    `httpx.AsyncClient` (per event loop), so concurrent sessions reuse
+    keep-alive connections instead of opening a TLS connection per rerank.
+    """
+
+    def __init__(
+        self,
+        api_url: str = RERANKER_API_URL,
+        api_key: str = RERANKER_API_KEY,
+        model: str = RERANKER_MODEL,
+        connect_timeout: float = RERANKER_CONNECT_TIMEOUT,
+        read_timeout: float = RERANKER_READ_TIMEOUT,
+        max_retries: int = RERANKER_MAX_RETRIES,
+        backoff_seconds: float = RERANKER_BACKOFF_SECONDS,
+        pool_size: int = RERANKER_POOL_SIZE,
+    ):
+        self.api_url = api_url
+        self.model = model
+        self.headers = {
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json"
+        }
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.pool_size = pool_size
+
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        self.session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=pool_size))
+        self.session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=pool_size))
+
+        # httpx clients are bound to the event loop they were first used on
+        self._async_client: httpx.AsyncClient | None = None
+        self._async_loop: asyncio.AbstractEventLoop | None = None
+
+    def _payload(self, query: str, texts: List[str]) -> dict:
+        return {
+            "model": self.model,
+            "query": query,
+            "documents": texts,
+            "return_documents": False,
+            "top_n": len(texts)  # Score all documents provided
+        }
+
+    def score(self, query: str, texts: List[str]) -> List[float]:
+        """Calls SiliconFlow Rerank API, retrying transient failures."""
+        payload = self._payload(query, texts)
+
+        for attempt in range(self.max_retries + 1):
+            last_attempt = attempt == self.max_retries
+            try:
+                response = self.session.post(
+                    self.api_url, json=payload, timeout=(self.connect_timeout, self.read_timeout)
+                )
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if last_attempt:
+                    raise
+                reason = repr(e)
+            else:
+                if response.status_code not in RETRY_STATUS_CODES or last_attempt:
+                    response.raise_for_status()
+                    return self._parse_scores(response.json(), len(texts))
+                reason = f"HTTP {response.status_code}"
+            time.sleep(self._retry_delay(attempt, reason))
+
+    async def ascore(self, query: str, texts: List[str]) -> List[float]:
+        """Async variant of `score`."""
+        payload = self._payload(query, texts)
+        client = await self._get_async_client()
+
+        for attempt in range(self.max_retries + 1):
+            last_attempt = attempt == self.max_retries
+            try:
+                response = await client.post(self.api_url, json=payload)
+            except httpx.TransportError as e:
+                if last_attempt:
+                    raise
+                reason = repr(e)
+            else:
+                if response.status_code not in RETRY_STATUS_CODES or last_attempt:
+                    response.raise_for_status()
+                    return self._parse_scores(response.json(), len(texts))
+                reason = f"HTTP {response.status_code}"
+            await asyncio.sleep(self._retry_delay(attempt, reason))
+
+    def _retry_delay(self, attempt: int, reason: str) -> float:
+        """Full-jitter exponential backoff, so concurrent sessions don't retry in lockstep."""
+        delay = random.uniform(0, self.backoff_seconds * 2 ** attempt)
+        record_retry("rerank")
+        logger.warning(
+            "Rerank request failed (%s), retry %d/%d in %.2fs",
+            reason, attempt + 1, self.max_retries, delay,
+        )
+        return delay
+
+    async def _get_async_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_loop is not loop:
+            stale, stale_loop = self._async_client, self._async_loop
+            self._async_client = httpx.AsyncClient(
+                headers=self.headers,
+                timeout=httpx.Timeout(self.read_timeout, connect=self.connect_timeout),
+                limits=httpx.Limits(
+                    max_connections=self.pool_size,
+                    max_keepalive_connections=self.pool_size,
+                ),
+            )
+            self._async_loop = loop
+            if stale is not None:
+                await self._close_stale_client(stale, stale_loop)
+        return self._async_client
+
+    @staticmethod
+    async def _close_stale_client(client: httpx.AsyncClient, loop: asyncio.AbstractEventLoop) -> None:
+        """Close the client of an event loop that is no longer ours."""
+        try:
+            if loop.is_running():
+                # Its connections belong to that loop (another thread): close them there
+                asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+            else:
+                await client.aclose()
+        except Exception as e:
+            logger.debug("Closing the previous rerank client failed: %r", e)
+
+    @staticmethod
+    def _parse_scores(data: dict, n: int) -> List[float]:
+        # The API returns a list of results with indices:
+        # { "results": [ {"index": 0, "relevance_score": 0.9}, {"index": 2, ...} ] }
+        # We need to map these back to the original list order [doc0, doc1, doc2]
+
+        scores = [0.0] * n
+        if "results" in data:
+            for item in data["results"]:
+                idx = item.get("index")
+                score = item.get("relevance_score")
+                if idx is not None and 0 <= idx < len(scores):
+                    scores[idx] = score
+
+        return scores
+
+    def close(self) -> None:
+        """Close the pooled sync connections."""
+        self.session.close()
+
+    async def aclose(self) -> None:
+        """Close the async client of the current event loop."""
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+            self._async_loop = None
+
+
+class CrossEncoderBackend(RerankerBackend):
+    """ONNX cross-encoder on CPU via fastembed's `TextCrossEncoder`.
+
+    The model is loaded on the first call. ONNX Runtime runs one batch at a
+    time on `threads` intra-op threads, so concurrent calls are serialized
+    instead of oversubscribing the CPU. If the model cannot be loaded, the
+    error is logged once and re-raised on every call without retrying.
+    """
+
+    def __init__(
+        self,
+        model: str = LOCAL_RERANKER_MODEL,
+        threads: Optional[int] = LOCAL_RERANKER_THREADS,
+        batch_size: int = LOCAL_RERANKER_BATCH_SIZE,
+        cache_dir: Optional[str] = LOCAL_RERANKER_CACHE_DIR,
+    ):
+        """
+        Args:
+            model: fastembed cross-encoder model name.
+            threads: ONNX Runtime intra-op threads (None = all cores).
+            batch_size: Query/document pairs per ONNX run.
+            cache_dir: Model download directory (None = fastembed default).
+        """
+        self.model = f"local:{model}"
+        self.model_name = model
+        self.threads = threads
+        self.batch_size = batch_size
+        self.cache_dir = cache_dir
+        self._encoder = None
+        self._load_error: Exception | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def encoder(self):
+        if self._encoder is None:
+            with self._lock:
+                if self._load_error is not None:
+                    raise self._load_error
+                if self._encoder is None:
+                    from fastembed.rerank.cross_encoder import TextCrossEncoder
+
+                    start = time.perf_counter()
+                    try:
+                        self._encoder = TextCrossEncoder(
+                            model_name=self.model_name,
+                            cache_dir=self.cache_dir,
+                            threads=self.threads,
+                        )
+                    except Exception as e:
+                        self._load_error = e
+                        logger.error(
+                            "Could not load cross-encoder '%s': %r. Local reranking is disabled; "
+                            "documents keep their retrieval order.",
+                            self.model_name, e,
+                        )
+                        raise
+                    logger.info(
+                        "Loaded cross-encoder '%s' (%s threads) in %.2fs",
+                        self.model_name, self.threads or "all", time.perf_counter() - start,
+                    )
+        return self._encoder
+
+    def score(self, query: str, texts: List[str]) -> List[float]:
+        encoder = self.encoder
+        with self._lock:
+            logits = list(encoder.rerank(query, texts, batch_size=self.batch_size))
+        # Cross-encoders return logits; map them to [0, 1] like the remote API
+        return [_sigmoid(logit) for logit in logits]
+
+
+def _sigmoid(x: float) -> float:
+    return 1.0 / (1.0 + math.exp(-x)) if x >= 0 else math.exp(x) / (1.0 + math.exp(x))
+
+
+def make_backend(provider: str) -> RerankerBackend:
+    """Build the backend for a RERANKER_PROVIDER value with its config defaults."""
+    if provider == "siliconflow":
+        return SiliconFlowBackend()
+    if provider == "local":
+        return CrossEncoderBackend()
+    raise ValueError(f"Unknown reranker provider: {provider} (expected one of {RERANKER_PROVIDERS})")
@@ -15,9 +15,41 @@ from src.config import SILICONFLOW_API_KEY
 
 # --- Reranker Settings ---
 
-RERANKER_PROVIDER = "siliconflow"
+# Scoring backend: "siliconflow" (remote API) or "local" (ONNX cross-encoder on CPU)
+RERANKER_PROVIDER = os.getenv("RERANKER_PROVIDER", "siliconflow")
 RERANKER_MODEL = "Qwen/Qwen3-Reranker-8B"
 
 # SiliconFlow Rerank Endpoint
 RERANKER_API_URL = "https://api.siliconflow.com/v1/rerank" 
-RERANKER_API_KEY = SILICONFLOW_API_KEY
\ No newline at end of file
+RERANKER_API_KEY = SILICONFLOW_API_KEY
+
+# --- HTTP client ---
+# One keep-alive connection pool per process; a stalled call fails after the
+# read timeout instead of hanging the graph node.
+RERANKER_CONNECT_TIMEOUT = 3.0  # seconds
+RERANKER_READ_TIMEOUT = 20.0  # seconds; 8B reranker on ~25 long chunks
+RERANKER_MAX_RETRIES = 2  # retries after the first attempt
+RERANKER_BACKOFF_SECONDS = 0.5  # base of the jittered exponential backoff
+RERANKER_POOL_SIZE = 16  # keep-alive connections (concurrent comparer/Chainlit sessions)
+
+# --- Local cross-encoder (RERANKER_PROVIDER = "local") ---
+# Multilingual (Dutch and English policies), ONNX on CPU; must be listed by
+# TextCrossEncoder.list_supported_models() in the locked fastembed version
+LOCAL_RERANKER_MODEL = "jinaai/jina-reranker-v2-base-multilingual"
+LOCAL_RERANKER_THREADS = int(os.getenv("LOCAL_RERANKER_THREADS", 4)) or None  # 0 = all cores
+LOCAL_RERANKER_BATCH_SIZE = 16
+LOCAL_RERANKER_CACHE_DIR = os.getenv("LOCAL_RERANKER_CACHE_DIR")  # None = fastembed default
+
+# --- Score cache ---
+# Scores per (model, query, chunk content); only uncached chunks are sent to the backend
+RERANK_CACHE_ENABLED = True
+RERANK_CACHE_MAX_ENTRIES = 20_000
+
+# --- Adaptive reranking (see adaptive.py) ---
+# Off until the margins are validated on the golden set:
+#   uv run python scripts/benchmark_reranker.py --skip-margins 0.3,0.5,0.7
+# Skipped turns are scored relative to rank 1; re-run scripts/calibrate_grader.py
+# after switching this on so the local grader's thresholds cover them.
+RERANK_ADAPTIVE = os.getenv("RERANK_ADAPTIVE", "false").lower() == "true"
+RERANK_SKIP_MARGIN = 0.5  # skip when (s[1] - s[top_n+1]) / s[1] >= this
+RERANK_BAND_MARGIN = 0.25  # else rerank only candidates above s[top_n+1] - this * s[1]
@@ -1,32 +1,52 @@
-"""Reranker module for re-ordering retrieved documents via SiliconFlow."""
+"""Reranker module for re-ordering retrieved documents."""
+
+import logging
+from typing import List, Optional
 
-import requests
-import json
-from typing import List
 from langchain_core.documents import Document
 
+from .backends import RerankerBackend, make_backend
+from .adaptive import AdaptiveRerankPolicy
 from .config import (
-    RERANKER_API_URL,
-    RERANKER_API_KEY,
     RERANKER_PROVIDER,
-    RERANKER_MODEL
+    RERANK_CACHE_ENABLED,
+    RERANK_CACHE_MAX_ENTRIES,
+    RERANK_ADAPTIVE,
+    RERANK_SKIP_MARGIN,
+    RERANK_BAND_MARGIN,
 )
+from .score_cache import RerankScoreCache
+from src.instrumentation import timed
+from src.registry import registry
+
+logger = logging.getLogger(__name__)
+
 
 class Reranker:
-    """Independent reranker using SiliconFlow's Qwen Reranker."""
+    """Independent reranker; scoring is delegated to a backend (see backends.py).
+
+    The default backend follows RERANKER_PROVIDER in config.py: SiliconFlow's
+    Qwen reranker, or a local ONNX cross-encoder. Scores are cached per
+    (model, query, document content), and only uncached documents are sent
+    to the backend. With the adaptive policy (see adaptive.py), documents
+    carrying a `retrieval_score` are only reranked when the retrieval order
+    is ambiguous.
+    """
 
     def __init__(
-        self, 
-        api_url: str = RERANKER_API_URL, 
-        api_key: str = RERANKER_API_KEY,
-        model: str = RERANKER_MODEL
+        self,
+        provider: str = RERANKER_PROVIDER,
+        backend: Optional[RerankerBackend] = None,
+        use_score_cache: bool = RERANK_CACHE_ENABLED,
+        adaptive: bool = RERANK_ADAPTIVE,
     ):
-        self.api_url = api_url
-        self.model = model
-        self.headers = {
-            "Authorization": f"Bearer {api_key}",
-            "Content-Type": "application/json"
-        }
+        self.provider = provider
+        self.backend = backend or make_backend(provider)
+        self.model = self.backend.model
+        self.score_cache = RerankScoreCache(RERANK_CACHE_MAX_ENTRIES) if use_score_cache else None
+        self.adaptive_policy = (
+            AdaptiveRerankPolicy(RERANK_SKIP_MARGIN, RERANK_BAND_MARGIN) if adaptive else None
+        )
 
     def rerank(self, query: str, documents: List[Document], top_n: int = 5) -> List[Document]:
         """
@@ -34,19 +54,86 @@ class Reranker:
         """
         if not documents:
             return []
+        if self.adaptive_policy is not None:
+            action, documents = self.adaptive_policy.plan(documents, top_n)
+            if action == "skip":
+                return documents
 
         # 1. Prepare Text List
         doc_texts = [doc.page_content for doc in documents]
         
-        # 2. Call SiliconFlow API
+        # 2. Score with the backend, skipping documents scored for this query before
         try:
-            scores = self._call_siliconflow(query, doc_texts)
+            if self.score_cache is None:
+                with timed("rerank"):
+                    scores = self.backend.score(query, doc_texts)
+            else:
+                keys, scores, missing = self._cached_scores(query, doc_texts)
+                if missing:
+                    with timed("rerank"):
+                        fresh = self.backend.score(query, [doc_texts[i] for i in missing])
+                    self._merge_scores(keys, scores, missing, fresh)
         except Exception as e:
-            print(f"Reranking failed: {e}. Returning original order.")
+            logger.warning("Reranking failed: %r. Returning original order.", e)
             return documents[:top_n]
 
+        return self._apply_scores(documents, scores, top_n)
+
+    async def arerank(self, query: str, documents: List[Document], top_n: int = 5) -> List[Document]:
+        """Async variant of `rerank`."""
+        if not documents:
+            return []
+        if self.adaptive_policy is not None:
+            action, documents = self.adaptive_policy.plan(documents, top_n)
+            if action == "skip":
+                return documents
+
+        doc_texts = [doc.page_content for doc in documents]
+        try:
+            if self.score_cache is None:
+                with timed("rerank"):
+                    scores = await self.backend.ascore(query, doc_texts)
+            else:
+                keys, scores, missing = self._cached_scores(query, doc_texts)
+                if missing:
+                    with timed("rerank"):
+                        fresh = await self.backend.ascore(query, [doc_texts[i] for i in missing])
+                    self._merge_scores(keys, scores, missing, fresh)
+        except Exception as e:
+            logger.warning("Reranking failed: %r. Returning original order.", e)
+            return documents[:top_n]
+
+        return self._apply_scores(documents, scores, top_n)
+
+    def _cached_scores(self, query: str, texts: List[str]) -> tuple:
+        """(cache keys, scores with None where missing, indices of the missing texts)."""
+        keys = self.score_cache.make_keys(self.model, query, texts)
+        scores = self.score_cache.get_many(keys)
+        missing = [i for i, score in enumerate(scores) if score is None]
+        self.score_cache.record_call(len(missing))
+        return keys, scores, missing
+
+    def _merge_scores(self, keys: list, scores: list, missing: List[int], fresh: List[float]) -> None:
+        for i, score in zip(missing, fresh):
+            scores[i] = score
+        self.score_cache.set_many([keys[i] for i in missing], fresh)
+
+    def score_cache_stats(self) -> dict:
+        """Return hit/miss counters of the rerank score cache."""
+        if self.score_cache is None:
+            return {}
+        return self.score_cache.stats()
+
+    def adaptive_stats(self) -> dict:
+        """Return counts of full, skipped and partial reranks."""
+        if self.adaptive_policy is None:
+            return {}
+        return self.adaptive_policy.stats()
+
+    @staticmethod
+    def _apply_scores(documents: List[Document], scores: List[float], top_n: int) -> List[Document]:
         # 3. Attach scores and Sort
-        # SiliconFlow returns scores in a specific order, we map them back
+        # Backends return scores in document order, so we map them back
         for doc, score in zip(documents, scores):
             doc.metadata["rerank_score"] = score
 
@@ -59,33 +146,25 @@ class Reranker:
 
         return ranked_docs[:top_n]
 
-    def _call_siliconflow(self, query: str, texts: List[str]) -> List[float]:
-        """Calls SiliconFlow Rerank API."""
-        payload = {
-            "model": self.model,
-            "query": query,
-            "documents": texts,
-            "return_documents": False,
-            "top_n": len(texts)  # Score all documents provided
-        }
-        
-        response = requests.post(self.api_url, headers=self.headers, json=payload)
-        response.raise_for_status()
-        
-        data = response.json()
-        
-        # The API returns a list of results with indices:
-        # { "results": [ {"index": 0, "relevance_score": 0.9}, {"index": 2, ...} ] }
-        # We need to map these back to the original list order [doc0, doc1, doc2]
-        
-        scores = [0.0] * len(texts)
-        if "results" in data:
-            for item in data["results"]:
-                idx = item.get("index")
-                score = item.get("relevance_score")
-                if idx is not None and 0 <= idx < len(scores):
-                    scores[idx] = score
-                    
-        return scores
-    
-reranker = Reranker()
\ No newline at end of file
+    def close(self) -> None:
+        self.backend.close()
+
+    async def aclose(self) -> None:
+        """Close the backend's async connections (e.g. at app shutdown)."""
+        await self.backend.aclose()
+
+
+# Default reranker instance, built on first use and shared process-wide
+registry.register("reranker", Reranker)
+
+
+def get_reranker() -> Reranker:
+    """Return the shared default reranker."""
+    return registry.get("reranker")
+
+
+def __getattr__(name: str):
+    # Keeps `from src.retrieval.reranker.reranker import reranker` working
+    if name == "reranker":
+        return get_reranker()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,64 @@
+"""In-process cache of reranker scores.
+
+The rewrite loop, repeat questions and the comparer's per-provider subgraphs
+send the same (query, document) pairs to the reranker again and again. Scores
+are cached per (model, query hash, content hash), so `Reranker` only sends
+the documents it has not scored for this query before.
+"""
+
+import hashlib
+import threading
+from typing import List, Optional
+
+from src.cache import LRUCache, normalize_query
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:32]
+
+
+class RerankScoreCache:
+    """LRU cache of relevance scores keyed on (model, query hash, content hash)."""
+
+    def __init__(self, max_entries: int = 20_000):
+        """
+        Args:
+            max_entries: Maximum number of cached (query, document) scores.
+        """
+        self.cache = LRUCache(max_entries=max_entries)
+        self._lock = threading.Lock()
+        self.backend_calls = 0
+        self.skipped_calls = 0
+        self.documents_scored = 0
+
+    @staticmethod
+    def make_keys(model: str, query: str, texts: List[str]) -> List[tuple]:
+        query_hash = _digest(normalize_query(query))
+        return [(model, query_hash, _digest(text)) for text in texts]
+
+    def get_many(self, keys: List[tuple]) -> List[Optional[float]]:
+        """Cached score per key, None where missing."""
+        return [self.cache.get(key) for key in keys]
+
+    def set_many(self, keys: List[tuple], scores: List[float]) -> None:
+        for key, score in zip(keys, scores):
+            self.cache.set(key, score)
+
+    def record_call(self, documents_sent: int) -> None:
+        """Count one rerank: a backend call for `documents_sent` documents, or none."""
+        with self._lock:
+            if documents_sent:
+                self.backend_calls += 1
+                self.documents_scored += documents_sent
+            else:
+                self.skipped_calls += 1
+
+    def stats(self) -> dict:
+        """Per-document hit/miss counters plus backend calls saved."""
+        with self._lock:
+            return {
+                **self.cache.stats(),
+                "backend_calls": self.backend_calls,
+                "skipped_calls": self.skipped_calls,
+                "documents_scored": self.documents_scored,
+            }
@@ -0,0 +1,63 @@
+"""Versioned cache for provider-filtered retrieval results.
+
+Entries are keyed on (collection, collection version, normalized query,
+provider, k). Because the version is part of the key, a re-ingest makes all
+earlier entries unreachable; TTL and LRU eviction clean them up.
+"""
+
+from langchain_core.documents import Document
+
+from src.cache import TTLCache, normalize_query
+
+
+class RetrievalResultCache:
+    """TTL + LRU cache of `retrieve_company_docs` results with per-entry stats."""
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 6 * 3600):
+        """
+        Args:
+            max_entries: Maximum number of cached result lists.
+            ttl_seconds: Maximum age of a cached result list.
+        """
+        self.cache = TTLCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+
+    @staticmethod
+    def make_key(collection_name: str, version: int, query: str, insurance_provider: str, k: int) -> tuple:
+        return (collection_name, version, normalize_query(query), insurance_provider, k)
+
+    def get(self, key: tuple) -> list | None:
+        """Return a copy of the cached (Document, score) list, or None."""
+        results = self.cache.get(key)
+        if results is None:
+            return None
+        return _copy_results(results)
+
+    def set(self, key: tuple, results: list) -> None:
+        """Store a copy of a (Document, score) list."""
+        self.cache.set(key, _copy_results(results))
+
+    def stats(self) -> dict:
+        """Return global counters plus usage statistics for every live entry."""
+        entries = [
+            {
+                "collection": key[0],
+                "version": key[1],
+                "query": key[2],
+                "insurance_provider": key[3],
+                "k": key[4],
+                "hits": entry.hits,
+                "created_at": entry.created_at,
+                "last_access": entry.last_access,
+            }
+            for key, entry in self.cache.items()
+        ]
+        return {**self.cache.stats(), "entries_detail": entries}
+
+
+def _copy_results(results: list) -> list:
+    # Downstream nodes write rerank scores into doc.metadata, so callers must
+    # never share Document objects with the cache.
+    return [
+        (Document(page_content=doc.page_content, metadata=dict(doc.metadata)), score)
+        for doc, score in results
+    ]
@@ -1,19 +1,68 @@
 """Retriever module for hybrid search over insurance documents."""
 
+import asyncio
+import logging
+from pathlib import Path
+
+from langchain_core.documents import Document
 from langchain_openai import OpenAIEmbeddings
 from langchain_qdrant import QdrantVectorStore, RetrievalMode, FastEmbedSparse
-from qdrant_client import QdrantClient
-from qdrant_client.models import Filter, FieldCondition, MatchValue
+from qdrant_client import AsyncQdrantClient, QdrantClient
+from qdrant_client.models import (
+    Filter,
+    FieldCondition,
+    MatchValue,
+    Prefetch,
+    FusionQuery,
+    Fusion,
+    SparseVector,
+    QueryRequest,
+    SearchParams,
+    QuantizationSearchParams,
+    PayloadSelectorInclude,
+)
 
+from .embedding_cache import QueryEmbeddingCache, CachedEmbeddings, CachedSparseEmbeddings
+from .result_cache import RetrievalResultCache
+from .collection_version import CollectionVersionStore
+from .local_engine import LocalVectorEngine
+from .fusion import reciprocal_rank_fusion
+from src.instrumentation import timed
 from .config import (
     EMBEDDING_MODEL,
+    EMBEDDING_DIMENSION,
+    EMBEDDING_NATIVE_DIMENSION,
     SPARSE_EMBEDDING_MODEL,
     COLLECTION_NAME,
     DENSE_VECTOR_NAME,
     SPARSE_VECTOR_NAME,
     QDRANT_URL,
     OPENAI_KEY,
+    EMBEDDING_CACHE_ENABLED,
+    EMBEDDING_CACHE_MEMORY_ENTRIES,
+    EMBEDDING_CACHE_DISK_ENTRIES,
+    EMBEDDING_CACHE_PATH,
+    RESULT_CACHE_ENABLED,
+    RESULT_CACHE_MAX_ENTRIES,
+    RESULT_CACHE_TTL_SECONDS,
+    COLLECTION_VERSION_REFRESH_SECONDS,
+    RETRIEVAL_BACKEND,
+    LOCAL_SNAPSHOT_PATH,
+    LOCAL_ENGINE_BM25_IDF,
+    QUANTIZATION_RESCORE,
+    QUANTIZATION_OVERSAMPLING,
+    HYBRID_SEARCH_NATIVE,
+    DENSE_PREFETCH_LIMIT,
+    SPARSE_PREFETCH_LIMIT,
+    HYBRID_FUSION,
+    HNSW_EF,
+    PAYLOAD_FIELDS,
 )
+from src.registry import registry
+
+logger = logging.getLogger(__name__)
+
+SEARCH_MODES = ("hybrid", "dense", "sparse")
 
 
 class InsuranceRetriever:
@@ -24,8 +73,15 @@ class InsuranceRetriever:
         qdrant_url: str = QDRANT_URL,
         collection_name: str = COLLECTION_NAME,
         embedding_model: str = EMBEDDING_MODEL,
+        embedding_dimension: int = EMBEDDING_DIMENSION,
         sparse_model: str = SPARSE_EMBEDDING_MODEL,
         openai_api_key: str = OPENAI_KEY,
+        use_embedding_cache: bool = EMBEDDING_CACHE_ENABLED,
+        use_result_cache: bool = RESULT_CACHE_ENABLED,
+        backend: str = RETRIEVAL_BACKEND,
+        local_snapshot_path: Path = LOCAL_SNAPSHOT_PATH,
+        native_hybrid: bool = HYBRID_SEARCH_NATIVE,
+        fusion: str = HYBRID_FUSION,
     ):
         """Initialize the retriever with embeddings and vector store.
 
@@ -33,28 +89,174 @@ class InsuranceRetriever:
             qdrant_url: URL of the Qdrant instance.
             collection_name: Name of the Qdrant collection.
             embedding_model: OpenAI embedding model name.
+            embedding_dimension: Dense query dimension. Overridden by the
+                collection's dense vector size when the two disagree.
             sparse_model: Sparse embedding model name.
             openai_api_key: OpenAI API key.
+            use_embedding_cache: Cache query embeddings in memory and on disk.
+            use_result_cache: Cache provider-filtered results per collection version.
+            backend: "qdrant" to query the Qdrant server, "local" to search an
+                in-process copy of the collection.
+            local_snapshot_path: Snapshot file for the local backend; when it
+                does not exist the collection is exported from Qdrant.
+            native_hybrid: Run sync hybrid search through `query_points`
+                directly instead of QdrantVectorStore. Ignored (always
+                native) unless `fusion` is "rrf", the only fusion
+                QdrantVectorStore applies.
+            fusion: Hybrid fusion method, "rrf" or "dbsf".
         """
+        if backend not in ("qdrant", "local"):
+            raise ValueError(f"Unknown retrieval backend: {backend}")
+        if fusion not in ("rrf", "dbsf"):
+            raise ValueError(f"Unknown fusion method: {fusion}")
+
+        # Query API tuning (attributes so benchmarks can sweep them per instance)
+        self.native_hybrid = native_hybrid
+        self.fusion = Fusion.RRF if fusion == "rrf" else Fusion.DBSF
+        self.dense_prefetch_limit = DENSE_PREFETCH_LIMIT
+        self.sparse_prefetch_limit = SPARSE_PREFETCH_LIMIT
+        self.payload_selector = PayloadSelectorInclude(include=PAYLOAD_FIELDS) if PAYLOAD_FIELDS else True
+
+        self.collection_name = collection_name
+        self.client = QdrantClient(url=qdrant_url)
+        self.async_client = AsyncQdrantClient(url=qdrant_url)
+
+        self.local_engine = None
+        collection_config = None
+        if backend == "local":
+            self.local_engine = self._load_local_engine(local_snapshot_path)
+        else:
+            collection_config = self._get_collection_config()
+
+        # Reduced-dimension (Matryoshka) collections need queries of the same size
+        self.embedding_dimension = self._resolve_embedding_dimension(
+            embedding_dimension, collection_config
+        )
         self.embeddings = OpenAIEmbeddings(
             model=embedding_model,
             api_key=openai_api_key,
+            dimensions=(
+                self.embedding_dimension
+                if self.embedding_dimension != EMBEDDING_NATIVE_DIMENSION
+                else None
+            ),
         )
         self.sparse_embeddings = FastEmbedSparse(model_name=sparse_model)
-        self.client = QdrantClient(url=qdrant_url)
 
-        self.vector_store = QdrantVectorStore(
-            client=self.client,
-            collection_name=collection_name,
-            embedding=self.embeddings,
-            sparse_embedding=self.sparse_embeddings,
-            retrieval_mode=RetrievalMode.HYBRID,
-            vector_name=DENSE_VECTOR_NAME,
+        self.embedding_cache = None
+        if use_embedding_cache:
+            self.embedding_cache = QueryEmbeddingCache(
+                memory_entries=EMBEDDING_CACHE_MEMORY_ENTRIES,
+                disk_path=EMBEDDING_CACHE_PATH,
+                disk_entries=EMBEDDING_CACHE_DISK_ENTRIES,
+            )
+            # Vectors of different sizes must never be served for each other
+            self.embeddings = CachedEmbeddings(
+                self.embeddings,
+                self.embedding_cache,
+                model_key=f"{embedding_model}@{self.embedding_dimension}",
+            )
+            self.sparse_embeddings = CachedSparseEmbeddings(
+                self.sparse_embeddings, self.embedding_cache, model_key=sparse_model
+            )
+
+        self.result_cache = None
+        self.version_store = None
+        if self.local_engine is None:
+            # Also read by the agents' answer cache, so it exists without the result cache
+            self.version_store = CollectionVersionStore(
+                self.client,
+                self.async_client,
+                refresh_interval=COLLECTION_VERSION_REFRESH_SECONDS,
+            )
+        # The local engine answers in well under a millisecond; nothing to cache
+        if use_result_cache and self.local_engine is None:
+            self.result_cache = RetrievalResultCache(
+                max_entries=RESULT_CACHE_MAX_ENTRIES,
+                ttl_seconds=RESULT_CACHE_TTL_SECONDS,
+            )
+
+        self.vector_store = None
+        self.search_params = None
+        if self.local_engine is None:
+            self.search_params = self._search_params(collection_config)
+            self.vector_store = QdrantVectorStore(
+                client=self.client,
+                collection_name=collection_name,
+                embedding=self.embeddings,
+                sparse_embedding=self.sparse_embeddings,
+                retrieval_mode=RetrievalMode.HYBRID,
+                vector_name=DENSE_VECTOR_NAME,
+                sparse_vector_name=SPARSE_VECTOR_NAME,
+            )
+
+    def _get_collection_config(self):
+        """Read the collection config from Qdrant, or None if unavailable."""
+        try:
+            return self.client.get_collection(self.collection_name).config
+        except Exception as e:
+            logger.warning("Could not read collection config for '%s': %s", self.collection_name, e)
+            return None
+
+    @staticmethod
+    def _dense_vector_params(config):
+        """Dense VectorParams from a collection config (named or unnamed vectors)."""
+        vectors = config.params.vectors
+        return vectors.get(DENSE_VECTOR_NAME) if isinstance(vectors, dict) else vectors
+
+    def _resolve_embedding_dimension(self, requested: int, config) -> int:
+        """Use the size of the collection's dense vectors when it is known."""
+        actual = None
+        if self.local_engine is not None:
+            actual = self.local_engine.dense.shape[1]
+        elif config is not None:
+            dense_params = self._dense_vector_params(config)
+            actual = getattr(dense_params, "size", None)
+
+        if actual is None or actual == requested:
+            return requested
+
+        logger.warning(
+            "Collection '%s' stores %d-dim vectors, using that instead of %d",
+            self.collection_name, actual, requested,
+        )
+        return actual
+
+    def _search_params(self, config) -> SearchParams | None:
+        """Dense search params: HNSW_EF plus quantization rescoring if the collection is quantized."""
+        quantization = None
+        if config is not None:
+            dense_params = self._dense_vector_params(config)
+            quantization = getattr(dense_params, "quantization_config", None) or config.quantization_config
+
+        if quantization is None and HNSW_EF is None:
+            return None
+
+        return SearchParams(
+            hnsw_ef=HNSW_EF,
+            quantization=QuantizationSearchParams(
+                rescore=QUANTIZATION_RESCORE,
+                oversampling=QUANTIZATION_OVERSAMPLING,
+            ) if quantization is not None else None,
+        )
+
+    def _load_local_engine(self, snapshot_path: Path) -> LocalVectorEngine:
+        """Load the in-process engine from a snapshot, or export it from Qdrant."""
+        if Path(snapshot_path).exists():
+            logger.info("Loading local retrieval snapshot from %s", snapshot_path)
+            return LocalVectorEngine.from_snapshot(snapshot_path, use_idf=LOCAL_ENGINE_BM25_IDF)
+
+        logger.info("No snapshot at %s, exporting '%s' from Qdrant", snapshot_path, self.collection_name)
+        return LocalVectorEngine.from_qdrant(
+            self.client,
+            self.collection_name,
+            dense_vector_name=DENSE_VECTOR_NAME,
             sparse_vector_name=SPARSE_VECTOR_NAME,
+            use_idf=LOCAL_ENGINE_BM25_IDF,
         )
 
     def retrieve_company_docs(
-        self, query: str, insurance_provider: str, k: int = 5
+        self, query: str, insurance_provider: str, k: int = 5, mode: str = "hybrid"
     ) -> list:
         """Search for documents matching a query filtered by insurance company.
 
@@ -62,40 +264,478 @@ class InsuranceRetriever:
             query: The search query.
             insurance_provider: The insurance provider name to filter by.
             k: Number of results to return.
+            mode: "hybrid", or "dense"/"sparse" to use a single vector.
 
         Returns:
             List of (Document, score) tuples.
         """
-        qdrant_filter = Filter(
-            must=[
-                FieldCondition(
-                    key="metadata.insurance_provider",
-                    match=MatchValue(value=insurance_provider),
+        self._check_mode(mode)
+        if self.local_engine is not None:
+            return self._local_search(query, k, [insurance_provider], mode)
+
+        # Only the hybrid path the agents use is cached
+        cache_key = None
+        if self.result_cache is not None and mode == "hybrid":
+            version = self.version_store.get(self.collection_name)
+            cache_key = self.result_cache.make_key(
+                self.collection_name, version, query, insurance_provider, k
+            )
+            cached = self.result_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        qdrant_filter = self._provider_filter(insurance_provider)
+        if self._native_search(mode):
+            results = self._search(query, k=k, qdrant_filter=qdrant_filter, mode=mode)
+        else:
+            with timed("search"):
+                results = self.vector_store.similarity_search_with_score(
+                    query,
+                    k=k,
+                    filter=qdrant_filter,
+                    search_params=self.search_params,
                 )
-            ]
-        )
 
-        results = self.vector_store.similarity_search_with_score(
-            query,
-            k=k,
-            filter=qdrant_filter,
+        if cache_key is not None:
+            self.result_cache.set(cache_key, results)
+        return results
+
+    def _native_search(self, mode: str) -> bool:
+        """Whether a sync search goes through `query_points` rather than QdrantVectorStore."""
+        # QdrantVectorStore always fuses hybrid results with RRF; any other
+        # fusion must go through query_points to match the async path
+        return self.native_hybrid or mode != "hybrid" or self.fusion != Fusion.RRF
+
+    def retrieve_docs(self, query: str, k: int = 5, mode: str = "hybrid") -> list:
+        """Search for documents matching a query without filtering.
+
+        Args:
+            query: The search query.
+            k: Number of results to return.
+            mode: "hybrid", or "dense"/"sparse" to use a single vector.
+
+        Returns:
+            List of (Document, score) tuples.
+        """
+        self._check_mode(mode)
+        if self.local_engine is not None:
+            return self._local_search(query, k, mode=mode)
+        if self._native_search(mode):
+            return self._search(query, k=k, mode=mode)
+        with timed("search"):
+            return self.vector_store.similarity_search_with_score(
+                query, k=k, search_params=self.search_params
+            )
+
+    async def aretrieve_company_docs(
+        self, query: str, insurance_provider: str, k: int = 5, mode: str = "hybrid"
+    ) -> list:
+        """Async variant of `retrieve_company_docs` using AsyncQdrantClient.
+
+        Args:
+            query: The search query.
+            insurance_provider: The insurance provider name to filter by.
+            k: Number of results to return.
+            mode: "hybrid", or "dense"/"sparse" to use a single vector.
+
+        Returns:
+            List of (Document, score) tuples.
+        """
+        self._check_mode(mode)
+        if self.local_engine is not None:
+            return await self._alocal_search(query, k, [insurance_provider], mode)
+
+        cache_key = None
+        if self.result_cache is not None and mode == "hybrid":
+            version = await self.version_store.aget(self.collection_name)
+            cache_key = self.result_cache.make_key(
+                self.collection_name, version, query, insurance_provider, k
+            )
+            cached = self.result_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        results = await self._asearch(
+            query, k=k, qdrant_filter=self._provider_filter(insurance_provider), mode=mode
         )
 
+        if cache_key is not None:
+            self.result_cache.set(cache_key, results)
         return results
 
-    def retrieve_docs(self, query: str, k: int = 5) -> list:
-        """Search for documents matching a query without filtering.
+    async def aretrieve_docs(self, query: str, k: int = 5, mode: str = "hybrid") -> list:
+        """Async variant of `retrieve_docs` using AsyncQdrantClient.
 
         Args:
             query: The search query.
             k: Number of results to return.
+            mode: "hybrid", or "dense"/"sparse" to use a single vector.
 
         Returns:
             List of (Document, score) tuples.
         """
-        return self.vector_store.similarity_search_with_score(query, k=k)
-    
-    
+        self._check_mode(mode)
+        if self.local_engine is not None:
+            return await self._alocal_search(query, k, mode=mode)
+        return await self._asearch(query, k=k, mode=mode)
+
+    def retrieve_multi_company_docs(
+        self, query: str, insurance_providers: list[str], k: int = 5
+    ) -> dict[str, list]:
+        """Search several insurance providers with one embedding and one Qdrant call.
+
+        The query is embedded once and one filtered hybrid request per provider
+        is sent through `query_batch_points`, so each provider gets exactly the
+        top-k that `retrieve_company_docs` would return.
+
+        Args:
+            query: The search query.
+            insurance_providers: Insurance provider names to search.
+            k: Number of results to return per provider.
+
+        Returns:
+            Dict mapping provider name to a list of (Document, score) tuples.
+        """
+        dense_vector, sparse_vector = self._embed(query)
+
+        if self.local_engine is not None:
+            with timed("search"):
+                return {
+                    provider: self.local_engine.search(dense_vector, sparse_vector, k, [provider])
+                    for provider in insurance_providers
+                }
+
+        with timed("search"):
+            responses = self.client.query_batch_points(
+                collection_name=self.collection_name,
+                requests=self._provider_requests(dense_vector, sparse_vector, insurance_providers, k),
+            )
+        return self._group_responses(insurance_providers, responses)
+
+    async def aretrieve_multi_company_docs(
+        self, query: str, insurance_providers: list[str], k: int = 5
+    ) -> dict[str, list]:
+        """Async variant of `retrieve_multi_company_docs`."""
+        dense_vector, sparse_vector = await self._aembed(query)
+
+        if self.local_engine is not None:
+            with timed("search"):
+                return {
+                    provider: self.local_engine.search(dense_vector, sparse_vector, k, [provider])
+                    for provider in insurance_providers
+                }
+
+        with timed("search"):
+            responses = await self.async_client.query_batch_points(
+                collection_name=self.collection_name,
+                requests=self._provider_requests(dense_vector, sparse_vector, insurance_providers, k),
+            )
+        return self._group_responses(insurance_providers, responses)
+
+    def retrieve_multi_query_docs(
+        self, queries: list[str], insurance_provider: str, k: int = 5
+    ) -> list:
+        """Search one provider with several phrasings of a query and fuse the results.
+
+        The dense vectors are embedded in one batch, the searches go to Qdrant
+        in one `query_batch_points` call, and the per-query rankings are
+        merged with reciprocal rank fusion.
+
+        Args:
+            queries: Query variants, the original query first.
+            insurance_provider: The insurance provider name to filter by.
+            k: Number of fused results to return.
+
+        Returns:
+            List of (Document, fused score) tuples.
+        """
+        dense_vectors, sparse_vectors = self._embed_queries(queries)
+
+        if self.local_engine is not None:
+            with timed("search"):
+                rankings = [
+                    self.local_engine.search(dense, sparse, k, [insurance_provider])
+                    for dense, sparse in zip(dense_vectors, sparse_vectors)
+                ]
+            return self._fuse_rankings(rankings, k)
+
+        qdrant_filter = self._provider_filter(insurance_provider)
+        with timed("search"):
+            responses = self.client.query_batch_points(
+                collection_name=self.collection_name,
+                requests=[
+                    self._hybrid_request(dense, sparse, k, qdrant_filter)
+                    for dense, sparse in zip(dense_vectors, sparse_vectors)
+                ],
+            )
+        return self._fuse_rankings(
+            [[(self._point_to_document(point), point.score) for point in response.points] for response in responses],
+            k,
+        )
+
+    async def aretrieve_multi_query_docs(
+        self, queries: list[str], insurance_provider: str, k: int = 5
+    ) -> list:
+        """Async variant of `retrieve_multi_query_docs`."""
+        dense_vectors, sparse_vectors = await self._aembed_queries(queries)
+
+        if self.local_engine is not None:
+            with timed("search"):
+                rankings = [
+                    self.local_engine.search(dense, sparse, k, [insurance_provider])
+                    for dense, sparse in zip(dense_vectors, sparse_vectors)
+                ]
+            return self._fuse_rankings(rankings, k)
+
+        qdrant_filter = self._provider_filter(insurance_provider)
+        with timed("search"):
+            responses = await self.async_client.query_batch_points(
+                collection_name=self.collection_name,
+                requests=[
+                    self._hybrid_request(dense, sparse, k, qdrant_filter)
+                    for dense, sparse in zip(dense_vectors, sparse_vectors)
+                ],
+            )
+        return self._fuse_rankings(
+            [[(self._point_to_document(point), point.score) for point in response.points] for response in responses],
+            k,
+        )
+
+    @staticmethod
+    def _check_mode(mode: str) -> None:
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"Unknown search mode: {mode} (expected one of {SEARCH_MODES})")
+
+    def _embed(self, query: str, mode: str = "hybrid") -> tuple:
+        """(dense, sparse) query vectors; the one a single-vector mode doesn't use is None."""
+        with timed("embedding"):
+            dense_vector = self.embeddings.embed_query(query) if mode != "sparse" else None
+            sparse_vector = self.sparse_embeddings.embed_query(query) if mode != "dense" else None
+        return dense_vector, sparse_vector
+
+    async def _aembed(self, query: str, mode: str = "hybrid") -> tuple:
+        """Async variant of `_embed`; dense and sparse embeddings run concurrently."""
+        with timed("embedding"):
+            if mode == "dense":
+                return await self.embeddings.aembed_query(query), None
+            if mode == "sparse":
+                return None, await self.sparse_embeddings.aembed_query(query)
+            return tuple(await asyncio.gather(
+                self.embeddings.aembed_query(query),
+                self.sparse_embeddings.aembed_query(query),
+            ))
+
+    def _embed_queries(self, queries: list[str]) -> tuple[list, list]:
+        """Dense and sparse vectors for several queries.
+
+        Dense vectors come from one batch call: OpenAI embeds queries and
+        documents alike. BM25 weights queries differently from documents, so
+        sparse vectors are embedded per query (locally, and cached).
+        """
+        with timed("embedding"):
+            dense_vectors = self.embeddings.embed_documents(queries)
+            sparse_vectors = [self.sparse_embeddings.embed_query(query) for query in queries]
+        return dense_vectors, sparse_vectors
+
+    async def _aembed_queries(self, queries: list[str]) -> tuple[list, list]:
+        """Async variant of `_embed_queries`."""
+        with timed("embedding"):
+            dense_vectors, *sparse_vectors = await asyncio.gather(
+                self.embeddings.aembed_documents(queries),
+                *(self.sparse_embeddings.aembed_query(query) for query in queries),
+            )
+        return dense_vectors, sparse_vectors
+
+    @staticmethod
+    def _fuse_rankings(rankings: list[list], k: int) -> list:
+        """RRF over several (Document, score) rankings; chunks are matched on point id."""
+        documents = {}
+        for ranking in rankings:
+            for doc, _ in ranking:
+                documents.setdefault(doc.metadata["_id"], doc)
+        fused = reciprocal_rank_fusion(
+            [[doc.metadata["_id"] for doc, _ in ranking] for ranking in rankings]
+        )
+        return [(documents[point_id], score) for point_id, score in fused[:k]]
+
+    def _search(
+        self, query: str, k: int, qdrant_filter: Filter | None = None, mode: str = "hybrid"
+    ) -> list:
+        """Embed the query and run one `query_points` call.
+
+        With the default settings (prefetch limits = k, RRF) the hybrid ranking
+        matches QdrantVectorStore in HYBRID mode, minus the wrapper and with a
+        trimmed payload.
+        """
+        dense_vector, sparse_vector = self._embed(query, mode)
+
+        with timed("search"):
+            response = self.client.query_points(
+                collection_name=self.collection_name,
+                query_filter=qdrant_filter,
+                limit=k,
+                with_payload=self.payload_selector,
+                with_vectors=False,
+                **self._query_args(dense_vector, sparse_vector, k, qdrant_filter, mode),
+            )
+
+        return [(self._point_to_document(point), point.score) for point in response.points]
+
+    async def _asearch(
+        self, query: str, k: int, qdrant_filter: Filter | None = None, mode: str = "hybrid"
+    ) -> list:
+        """Async variant of `_search`."""
+        dense_vector, sparse_vector = await self._aembed(query, mode)
+
+        with timed("search"):
+            response = await self.async_client.query_points(
+                collection_name=self.collection_name,
+                query_filter=qdrant_filter,
+                limit=k,
+                with_payload=self.payload_selector,
+                with_vectors=False,
+                **self._query_args(dense_vector, sparse_vector, k, qdrant_filter, mode),
+            )
+
+        return [(self._point_to_document(point), point.score) for point in response.points]
+
+    def _local_search(
+        self,
+        query: str,
+        k: int,
+        insurance_providers: list[str] | None = None,
+        mode: str = "hybrid",
+    ) -> list:
+        """Embed the query and search the local engine."""
+        dense_vector, sparse_vector = self._embed(query, mode)
+        with timed("search"):
+            return self.local_engine.search(dense_vector, sparse_vector, k, insurance_providers)
+
+    async def _alocal_search(
+        self,
+        query: str,
+        k: int,
+        insurance_providers: list[str] | None = None,
+        mode: str = "hybrid",
+    ) -> list:
+        """Async variant of `_local_search` (only the embedding calls are awaited)."""
+        dense_vector, sparse_vector = await self._aembed(query, mode)
+        with timed("search"):
+            return self.local_engine.search(dense_vector, sparse_vector, k, insurance_providers)
+
+    def _query_args(
+        self, dense_vector, sparse_vector, k: int, qdrant_filter: Filter | None, mode: str
+    ) -> dict:
+        """`query_points` arguments for a fused hybrid or a single-vector query."""
+        if mode == "dense":
+            return {"query": dense_vector, "using": DENSE_VECTOR_NAME, "search_params": self.search_params}
+        if mode == "sparse":
+            return {
+                "query": SparseVector(indices=sparse_vector.indices, values=sparse_vector.values),
+                "using": SPARSE_VECTOR_NAME,
+            }
+        return {
+            "prefetch": self._hybrid_prefetch(dense_vector, sparse_vector, k, qdrant_filter),
+            "query": FusionQuery(fusion=self.fusion),
+        }
+
+    def _hybrid_prefetch(
+        self, dense_vector, sparse_vector, k: int, qdrant_filter: Filter | None = None
+    ) -> list[Prefetch]:
+        """Dense and sparse prefetch stages for a fused hybrid query."""
+        return [
+            Prefetch(
+                using=DENSE_VECTOR_NAME,
+                query=dense_vector,
+                filter=qdrant_filter,
+                limit=max(k, self.dense_prefetch_limit or k),
+                params=self.search_params,
+            ),
+            Prefetch(
+                using=SPARSE_VECTOR_NAME,
+                query=SparseVector(
+                    indices=sparse_vector.indices,
+                    values=sparse_vector.values,
+                ),
+                filter=qdrant_filter,
+                limit=max(k, self.sparse_prefetch_limit or k),
+            ),
+        ]
+
+    def _provider_requests(
+        self, dense_vector, sparse_vector, insurance_providers: list[str], k: int
+    ) -> list[QueryRequest]:
+        """One filtered hybrid request per provider, sharing the same query vectors."""
+        return [
+            self._hybrid_request(dense_vector, sparse_vector, k, self._provider_filter(provider))
+            for provider in insurance_providers
+        ]
+
+    def _hybrid_request(self, dense_vector, sparse_vector, k: int, qdrant_filter: Filter | None) -> QueryRequest:
+        """One fused hybrid request for `query_batch_points`."""
+        return QueryRequest(
+            prefetch=self._hybrid_prefetch(dense_vector, sparse_vector, k, qdrant_filter),
+            query=FusionQuery(fusion=self.fusion),
+            filter=qdrant_filter,
+            limit=k,
+            with_payload=self.payload_selector,
+            with_vector=False,
+        )
+
+    def _group_responses(self, insurance_providers: list[str], responses) -> dict[str, list]:
+        """Map batched query responses back to their providers."""
+        return {
+            provider: [(self._point_to_document(point), point.score) for point in response.points]
+            for provider, response in zip(insurance_providers, responses)
+        }
+
+    def _point_to_document(self, point) -> Document:
+        """Convert a Qdrant point into a Document the same way QdrantVectorStore does."""
+        payload = point.payload or {}
+        metadata = payload.get(self.vector_store.metadata_payload_key) or {}
+        metadata["_id"] = point.id
+        metadata["_collection_name"] = self.collection_name
+        return Document(
+            page_content=payload.get(self.vector_store.content_payload_key, ""),
+            metadata=metadata,
+        )
+
+    @staticmethod
+    def _provider_filter(insurance_provider: str) -> Filter:
+        """Build the Qdrant filter restricting results to one insurance provider."""
+        return Filter(
+            must=[
+                FieldCondition(
+                    key="metadata.insurance_provider",
+                    match=MatchValue(value=insurance_provider),
+                )
+            ]
+        )
+
+    def collection_version(self) -> int:
+        """Version stamp of the collection (0 for the local engine, whose snapshot is fixed)."""
+        if self.version_store is None:
+            return 0
+        return self.version_store.get(self.collection_name)
+
+    async def acollection_version(self) -> int:
+        """Async variant of `collection_version`."""
+        if self.version_store is None:
+            return 0
+        return await self.version_store.aget(self.collection_name)
+
+    def embedding_cache_stats(self) -> dict:
+        """Return hit/miss counters of the query embedding cache."""
+        if self.embedding_cache is None:
+            return {}
+        return self.embedding_cache.stats()
+
+    def result_cache_stats(self) -> dict:
+        """Return counters and per-entry stats of the retrieval result cache."""
+        if self.result_cache is None:
+            return {}
+        return self.result_cache.stats()
+
     def format_document_with_context(self, doc) -> str:
         """Restores headers from metadata into the text content."""
         
@@ -116,8 +756,21 @@ class InsuranceRetriever:
         return doc.page_content
 
 
-# Default retriever instance for convenience
-retriever = InsuranceRetriever()
+# Default retriever instance, built on first use and shared process-wide
+registry.register("retriever", InsuranceRetriever)
+
+
+def get_retriever() -> InsuranceRetriever:
+    """Return the shared default retriever."""
+    return registry.get("retriever")
+
+
+def __getattr__(name: str):
+    # Keeps `from src.retrieval.retriever import retriever` working without
+    # connecting to Qdrant at import time
+    if name == "retriever":
+        return get_retriever()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 #  Usage:                                                                                                                                        
 #   from src.retrieval.retriever import InsuranceRetriever, retriever                                                                             